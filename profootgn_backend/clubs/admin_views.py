@@ -1,14 +1,20 @@
 # clubs/admin_views.py
 
+import hashlib
+
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.db.utils import ProgrammingError, OperationalError
 from django.core.exceptions import ValidationError
+from django.views.decorators.http import condition
 
 from .models import Club, StaffMember
 from players.models import Player
+from profootgn.text import fold_name
+from search.index import get_index as search_index
+from . import picker_index as club_picker
 
 
 @staff_member_required
@@ -16,7 +22,7 @@ def quick_clubs(request):
     q = request.GET.get('q', '')
     qs = Club.objects.all()
     if q:
-        qs = qs.filter(name__icontains=q)
+        qs = qs.filter(pk__in=search_index().ids("club", q))
     qs = qs.order_by('name')
     return render(request, 'admin_quick/quick_clubs.html', {'clubs': qs, 'q': q})
 
@@ -234,21 +240,24 @@ def quick_roster(request, club_id):
     })
 
 
-@staff_member_required
-def quick_clubs_api(request):
-    """Endpoint JSON admin (pickers clubs) : [{id, name, logo}]"""
+def _quick_clubs_etag(request):
+    """ETag fort : version de la table des clubs + requête + origine (URLs de logo absolues)."""
     q = request.GET.get("q", "").strip()
-    qs = Club.objects.only("id", "name", "logo").order_by("name")
-    if q:
-        qs = qs.filter(name__icontains=q)
+    key = f"{request.scheme}://{request.get_host()}|{fold_name(q)}"
+    return f"{club_picker.current_version()}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
 
-    data = []
-    for c in qs:
-        logo = c.logo.url if c.logo else ""
-        if logo:
-            logo = request.build_absolute_uri(logo)
-        data.append({"id": c.id, "name": c.name, "logo": logo})
 
-    resp = JsonResponse(data, safe=False)
-    resp["Cache-Control"] = "private, max-age=60"
+@staff_member_required
+@condition(etag_func=_quick_clubs_etag)
+def quick_clubs_api(request):
+    """
+    Endpoint JSON admin (pickers clubs) : [{id, name, logo}], `?q=` par préfixes de mots.
+    Servi depuis l'index mémoire des clubs ; `If-None-Match` à jour -> 304 sans requête SQL.
+    """
+    q = request.GET.get("q", "").strip()
+    idx = club_picker.get_index()
+    origin = f"{request.scheme}://{request.get_host()}"
+    resp = HttpResponse(idx.body(q, origin, request.build_absolute_uri), content_type="application/json")
+    # Revalidation systématique : la liste change dès qu'un club est modifié
+    resp["Cache-Control"] = "private, no-cache"
     return resp
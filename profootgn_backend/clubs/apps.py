@@ -1,5 +1,45 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
+
 
 class ClubsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'clubs'
+
+    def ready(self):
+        from profootgn.signals import bulk_write
+        from .models import Club
+        from .picker_index import invalidate
+
+        # Index des pickers admin (et ETag de quick_clubs_api)
+        post_save.connect(invalidate, sender=Club, dispatch_uid="club_picker_save")
+        post_delete.connect(invalidate, sender=Club, dispatch_uid="club_picker_delete")
+        bulk_write.connect(invalidate, sender=Club, dispatch_uid="club_picker_bulk")
+
+        # Vue d'ensemble des clubs (clubs/overview.py)
+        from matches.models import Card, Match
+        from players.models import Player
+        from .models import StaffMember
+        from . import overview
+
+        for model in (Player, StaffMember):
+            pre_save.connect(overview.remember_club, sender=model, dispatch_uid=f"overview_pre_{model.__name__}")
+        for model in (Player, StaffMember, Card):
+            post_save.connect(overview.on_member_change, sender=model, dispatch_uid=f"overview_save_{model.__name__}")
+            post_delete.connect(overview.on_member_change, sender=model, dispatch_uid=f"overview_delete_{model.__name__}")
+        for model in (Player, StaffMember, Card, Match, Club):
+            bulk_write.connect(overview.on_match_change, sender=model, dispatch_uid=f"overview_bulk_{model.__name__}")
+        post_save.connect(overview.on_club_change, sender=Club, dispatch_uid="overview_save_Club")
+        post_delete.connect(overview.on_club_change, sender=Club, dispatch_uid="overview_delete_Club")
+        post_save.connect(overview.on_match_change, sender=Match, dispatch_uid="overview_save_Match")
+        post_delete.connect(overview.on_match_change, sender=Match, dispatch_uid="overview_delete_Match")
+
+        # Calendriers des clubs (clubs/fixtures.py)
+        from . import fixtures
+
+        pre_save.connect(fixtures.remember_clubs, sender=Match, dispatch_uid="fixtures_pre_Match")
+        post_save.connect(fixtures.on_match_change, sender=Match, dispatch_uid="fixtures_save_Match")
+        post_delete.connect(fixtures.on_match_change, sender=Match, dispatch_uid="fixtures_delete_Match")
+        bulk_write.connect(fixtures.on_global_change, sender=Match, dispatch_uid="fixtures_bulk_Match")
+        post_save.connect(fixtures.on_global_change, sender=Club, dispatch_uid="fixtures_save_Club")
+        bulk_write.connect(fixtures.on_global_change, sender=Club, dispatch_uid="fixtures_bulk_Club")
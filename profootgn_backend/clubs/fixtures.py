@@ -0,0 +1,226 @@
+# clubs/fixtures.py
+"""
+Calendrier d'un club : `/api/clubs/{id}/matches/` (liste) et `/api/clubs/{id}/calendar.ics`.
+
+Liste : UNION de deux parcours d'index, (home_club, datetime) et (away_club, datetime)
+(matches 0006), au lieu d'un OR home/away qu'aucun index unique ne couvre.
+Chaque branche porte les filtres (statut, fenêtre de dates, curseur) ; si le moteur accepte
+ORDER BY/LIMIT dans une UNION (MySQL, PostgreSQL), chaque branche est aussi bornée à limit + 1.
+Pagination par curseur (datetime, id) : pas d'OFFSET, pages stables pendant les mises à jour.
+
+ICS : généré une fois par version du calendrier du club, puis servi depuis le cache
+(ETag + 304 pour les clients qui se resynchronisent). Jetons (profootgn/versions.py) :
+  - "fixtures:<id>" : matchs du club (save/delete ; un match qui change de club invalide aussi l'ancien) ;
+  - "fixtures"      : noms des clubs (résumés des événements) et écritures groupées de matchs.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+
+GLOBAL_VERSION = "fixtures"
+ICS_TTL = 24 * 3600
+MATCH_DURATION = timedelta(hours=2)
+
+STATUS_GROUPS = {
+    "FINISHED": ("FT", "FINISHED"),
+    "FT": ("FT", "FINISHED"),
+    "LIVE": ("LIVE", "HT", "PAUSED"),
+    "CANCELLED": ("CANCELED",),
+}
+
+
+def _club_version(club_id) -> str:
+    return f"fixtures:{club_id}"
+
+
+def parse_statuses(raw) -> list[str]:
+    """'FINISHED,SCHEDULED' -> ['FT', 'FINISHED', 'SCHEDULED'] (mêmes alias que /api/matches/)."""
+    out = []
+    for part in str(raw or "").upper().split(","):
+        part = part.strip()
+        if part:
+            out.extend(s for s in STATUS_GROUPS.get(part, (part,)) if s not in out)
+    return out
+
+
+# ======================================
+# Liste (UNION + curseur)
+# ======================================
+
+def encode_cursor(dt, pk) -> str:
+    """(datetime, id) -> '<microsecondes epoch>_<id>'."""
+    return f"{int(round(dt.timestamp() * 1_000_000))}_{pk}"
+
+
+def parse_cursor(value):
+    try:
+        micros, pk = str(value).split("_", 1)
+        dt = datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+        return dt, int(pk)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def match_ids(club_id, statuses=None, date_from=None, date_to=None, cursor=None, descending=True, limit=20):
+    """
+    [(id, datetime)] des matchs du club, au plus limit + 1 (la ligne en trop signale une page suivante).
+    date_from / date_to : datetimes (bornes incluse / exclue).
+    """
+    from matches.models import Match
+
+    order = ("-datetime", "-id") if descending else ("datetime", "id")
+    after = parse_cursor(cursor) if cursor else None
+
+    def branch(field):
+        qs = Match.objects.filter(**{field: club_id})
+        if statuses:
+            qs = qs.filter(status__in=statuses)
+        if date_from:
+            qs = qs.filter(datetime__gte=date_from)
+        if date_to:
+            qs = qs.filter(datetime__lt=date_to)
+        if after:
+            dt, pk = after
+            op = "lt" if descending else "gt"
+            qs = qs.filter(Q(**{f"datetime__{op}": dt}) | Q(datetime=dt, **{f"id__{op}": pk}))
+        qs = qs.values_list("id", "datetime")
+        if connection.features.supports_slicing_ordering_in_compound:
+            qs = qs.order_by(*order)[: limit + 1]
+        else:
+            qs = qs.order_by()
+        return qs
+
+    # UNION ALL : un club ne joue pas contre lui-même (contrainte), pas de doublon possible
+    union = branch("home_club_id").union(branch("away_club_id"), all=True)
+    return list(union.order_by(*order)[: limit + 1])
+
+
+# ======================================
+# ICS
+# ======================================
+
+def _ics_escape(value) -> str:
+    return (
+        str(value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _ics_fold(line: str) -> list[str]:
+    """Lignes de 75 octets max (RFC 5545 §3.1) ; suite précédée d'un espace."""
+    out, data = [], line.encode("utf-8")
+    while len(data) > 75:
+        cut = 75
+        while cut > 0 and (data[cut] & 0xC0) == 0x80:  # ne coupe pas un caractère UTF-8
+            cut -= 1
+        out.append(data[:cut].decode("utf-8"))
+        data = b" " + data[cut:]
+    out.append(data.decode("utf-8"))
+    return out
+
+
+def _ics_dt(dt) -> str:
+    return dt.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def build_ics(club, host="profootgn") -> str:
+    """Calendrier complet du club (tous ses matchs), en une requête."""
+    from matches.models import Match
+
+    stamp = _ics_dt(timezone.now())
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//ProFootGN//Calendrier club//FR",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ics_escape(club.name)}",
+    ]
+    qs = (
+        Match.objects.filter(Q(home_club_id=club.id) | Q(away_club_id=club.id))
+        .select_related("home_club", "away_club", "round")
+        .order_by("datetime", "id")
+    )
+    for m in qs.iterator(chunk_size=2000):
+        home, away = m.home_club.name, m.away_club.name
+        if m.status in ("FT", "FINISHED", "LIVE", "HT", "PAUSED"):
+            summary = f"{home} {m.home_score}-{m.away_score} {away}"
+        else:
+            summary = f"{home} - {away}"
+        status = {"CANCELED": "CANCELLED", "POSTPONED": "TENTATIVE", "SUSPENDED": "TENTATIVE"}.get(m.status, "CONFIRMED")
+        event = [
+            "BEGIN:VEVENT",
+            f"UID:match-{m.id}@{host}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_ics_dt(m.datetime)}",
+            f"DTEND:{_ics_dt(m.datetime + MATCH_DURATION)}",
+            f"SUMMARY:{_ics_escape(summary)}",
+            f"STATUS:{status}",
+        ]
+        if m.venue:
+            event.append(f"LOCATION:{_ics_escape(m.venue)}")
+        if m.round_id and m.round:
+            event.append(f"DESCRIPTION:{_ics_escape(m.round.name)}")
+        event.append("END:VEVENT")
+        lines.extend(event)
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(part for line in lines for part in _ics_fold(line)) + "\r\n"
+
+
+def ics_etag(club_id, host) -> str:
+    key = f"{versions.current(GLOBAL_VERSION)}|{versions.current(_club_version(club_id))}|{host}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def get_ics(club, host) -> tuple[str, str]:
+    """(contenu ICS, ETag) ; régénéré seulement quand la version du calendrier du club change."""
+    etag = ics_etag(club.id, host)
+    key = f"pfoot:club_ics:{club.id}:{etag}"
+    body = cache.get(key)
+    record_cache("club_ics", body is not None)
+    if body is None:
+        body = build_ics(club, host)
+        cache.set(key, body, ICS_TTL)
+    return body, etag
+
+
+# ======================================
+# Invalidation (receveurs de signaux)
+# ======================================
+
+def _bump(names, using=None):
+    def apply():
+        for name in names:
+            versions.bump(name)
+
+    transaction.on_commit(apply, using=using)
+
+
+def remember_clubs(sender, instance, raw=False, update_fields=None, **kwargs):
+    """pre_save (match) : clubs avant modification, si les clubs peuvent changer."""
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and not {"home_club", "away_club", "home_club_id", "away_club_id"} & set(update_fields):
+        return
+    instance._fixtures_old_clubs = tuple(
+        sender._base_manager.filter(pk=instance.pk).values_list("home_club_id", "away_club_id").first() or ()
+    )
+
+
+def on_match_change(sender, instance, **kwargs):
+    clubs = {instance.home_club_id, instance.away_club_id, *getattr(instance, "_fixtures_old_clubs", ())}
+    _bump([_club_version(c) for c in clubs if c], using=kwargs.get("using"))
+
+
+def on_global_change(sender, **kwargs):
+    # Nom d'un club (résumés des autres calendriers) ou écriture groupée de matchs (clubs inconnus)
+    _bump([GLOBAL_VERSION], using=kwargs.get("using"))
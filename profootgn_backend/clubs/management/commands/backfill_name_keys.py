@@ -0,0 +1,32 @@
+# clubs/management/commands/backfill_name_keys.py
+from django.core.management.base import BaseCommand
+
+from clubs.models import Club, StaffMember
+from players.models import Player
+from profootgn.text import backfill_name_keys
+
+MODELS = {"clubs": Club, "staff": StaffMember, "players": Player}
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les colonnes de noms normalisés (casse et accents ignorés) des clubs, du staff et des joueurs. "
+        "Idempotent : seules les lignes désynchronisées sont réécrites."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", default="", help=f"Tables à traiter, séparées par des virgules ({', '.join(MODELS)}). Défaut: toutes."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        only = [s.strip() for s in opts["only"].split(",") if s.strip()] or list(MODELS)
+        for key in only:
+            model = MODELS.get(key)
+            if model is None:
+                self.stderr.write(self.style.WARNING(f"Table inconnue ignorée: {key}"))
+                continue
+            n = backfill_name_keys(model, batch_size=max(1, opts["batch_size"]))
+            self.stdout.write(f"  {key:<8} {n} ligne(s) mise(s) à jour")
+        self.stdout.write(self.style.SUCCESS("✓ Noms normalisés à jour."))
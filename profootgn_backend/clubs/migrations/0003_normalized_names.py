@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+from profootgn.text import backfill_name_keys
+
+# Figé ici : les modèles historiques n'ont pas l'attribut NAME_KEYS
+CLUB_NAME_KEYS = {"name_norm": ("name",)}
+STAFF_NAME_KEYS = {"full_name_norm": ("full_name",)}
+
+
+def forwards(apps, schema_editor):
+    backfill_name_keys(apps.get_model("clubs", "Club"), CLUB_NAME_KEYS)
+    backfill_name_keys(apps.get_model("clubs", "StaffMember"), STAFF_NAME_KEYS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_staffmember'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='name_norm',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='staffmember',
+            name='full_name_norm',
+            field=models.CharField(blank=True, default='', editable=False, max_length=120),
+        ),
+        migrations.AddIndex(
+            model_name='staffmember',
+            index=models.Index(fields=['club', 'full_name_norm'], name='staff_club_name_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='staffmember',
+            index=models.Index(fields=['full_name_norm'], name='staff_name_norm_idx'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,13 @@
 # clubs/models.py
 from django.db import models
 
-class Club(models.Model):
+from profootgn.text import NormalizedNameMixin, NormalizedNameQuerySet
+
+
+class Club(NormalizedNameMixin, models.Model):
+    # Nom normalisé (casse et accents ignorés, voir profootgn/text.py)
+    NAME_KEYS = {"name_norm": ("name",)}
+
     name = models.CharField(max_length=120, unique=True)
     short_name = models.CharField(max_length=50, blank=True)
     city = models.CharField(max_length=100, blank=True)
@@ -10,6 +16,9 @@ class Club(models.Model):
     logo = models.ImageField(upload_to='logos/', blank=True, null=True)
     president = models.CharField(max_length=120, blank=True)
     coach = models.CharField(max_length=120, blank=True)
+    name_norm = models.CharField(max_length=120, blank=True, default="", editable=False, db_index=True)
+
+    objects = NormalizedNameQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
@@ -18,7 +27,9 @@ class Club(models.Model):
         return self.name
 
 
-class StaffMember(models.Model):
+class StaffMember(NormalizedNameMixin, models.Model):
+    NAME_KEYS = {"full_name_norm": ("full_name",)}
+
     ROLES = [
         ("PRESIDENT", "Président"),
         ("COACH", "Entraîneur principal"),
@@ -37,9 +48,16 @@ class StaffMember(models.Model):
     email     = models.EmailField(blank=True)
     photo     = models.ImageField(upload_to="staff/", null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    full_name_norm = models.CharField(max_length=120, blank=True, default="", editable=False)
+
+    objects = NormalizedNameQuerySet.as_manager()
 
     class Meta:
-        indexes = [models.Index(fields=['club', 'role', 'full_name'])]
+        indexes = [
+            models.Index(fields=['club', 'role', 'full_name']),
+            models.Index(fields=['club', 'full_name_norm'], name='staff_club_name_norm_idx'),
+            models.Index(fields=['full_name_norm'], name='staff_name_norm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.get_role_display()})"
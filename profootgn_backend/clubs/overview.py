@@ -0,0 +1,232 @@
+# clubs/overview.py
+"""
+Vue d'ensemble d'un club (`/api/clubs/{id}/overview/`) : effectif, staff actif, forme
+(5 derniers résultats), prochain match, ligne du classement et totaux, en 9 requêtes fixes
+(10 en cas d'égalité de points au classement ; aucune boucle de requêtes) au lieu des appels
+players/staff/matches/standings séparés.
+
+Cache (cache Django `default`) par club et par origine (URLs absolues), clé = jetons de version :
+  - "club:<id>"       : fiche du club, joueurs, staff et cartons du club (save/delete ; un joueur
+                        ou un membre du staff qui change de club invalide aussi l'ancien club) ;
+  - "club_overview"   : matchs (un résultat déplace tout le classement, donc la ligne de chaque club)
+                        et écritures groupées (bulk_write : clubs concernés inconnus).
+Les jetons changent au commit (profootgn/versions.py). PFOOT_CLUB_OVERVIEW_TTL borne le reste
+(« prochain match » dépend de l'heure).
+
+Forme / séries de la ligne du classement : stats/form.py (jointure, sans requête de plus).
+Classement : mêmes règles que /api/stats/standings/ (matchs terminés, tri points, diff, BM, nom ;
+égalités de points départagées par les confrontations directes, stats/h2h.py).
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+
+FINISHED = ("FT", "FINISHED")
+FORM_SIZE = 5
+GLOBAL_VERSION = "club_overview"
+
+
+def _club_version(club_id) -> str:
+    return f"club:{club_id}"
+
+
+def cache_key(club_id, origin) -> str:
+    return "pfoot:club_overview:{}:{}:{}:{}".format(
+        club_id, versions.current(GLOBAL_VERSION), versions.current(_club_version(club_id)), origin,
+    )
+
+
+# ======================================
+# Construction (requêtes fixes)
+# ======================================
+
+def _table():
+    """
+    Classement complet en 3 requêtes (agrégats domicile / extérieur + noms, forme et séries des clubs),
+    plus une pour les confrontations directes en cas d'égalité de points.
+    Renvoie {club_id: ligne} avec "position", "home" et "away" (sous-totaux).
+    """
+    from clubs.models import Club
+    from matches.models import Match
+    from stats import form, h2h
+
+    def side(prefix, gf, ga):
+        return (
+            Match.objects.filter(status__in=FINISHED).values(f"{prefix}_club_id")
+            .annotate(
+                played=Count("id"),
+                wins=Count("id", filter=Q(**{f"{gf}__gt": F(ga)})),
+                draws=Count("id", filter=Q(**{gf: F(ga)})),
+                losses=Count("id", filter=Q(**{f"{gf}__lt": F(ga)})),
+                goals_for=Sum(gf),
+                goals_against=Sum(ga),
+                clean_sheets=Count("id", filter=Q(**{ga: 0})),
+            )
+            .values_list(f"{prefix}_club_id", "played", "wins", "draws", "losses",
+                         "goals_for", "goals_against", "clean_sheets")
+        )
+
+    keys = ("played", "wins", "draws", "losses", "goals_for", "goals_against", "clean_sheets")
+    rows = {}
+    for c in Club.objects.values("id", "name", *form.VALUE_FIELDS):   # forme / séries par jointure
+        summary = form.values_summary(c)
+        rows[c["id"]] = {
+            "club_id": c["id"], "club_name": c["name"], **{k: 0 for k in keys}, "home": None, "away": None,
+            "form": summary["form"], "streaks": summary["streaks"],
+        }
+    for where, qs in (("home", side("home", "home_score", "away_score")),
+                      ("away", side("away", "away_score", "home_score"))):
+        for cid, *values in qs:
+            row = rows.get(cid)
+            if row is None:
+                continue
+            split = dict(zip(keys, (int(v or 0) for v in values)))
+            row[where] = split
+            for k, v in split.items():
+                row[k] += v
+
+    out = []
+    for row in rows.values():
+        for where in ("home", "away"):
+            row[where] = row[where] or {k: 0 for k in keys}
+        row["goal_diff"] = row["goals_for"] - row["goals_against"]
+        row["points"] = 3 * row["wins"] + row["draws"]
+        out.append(row)
+    out.sort(key=lambda r: (-r["points"], -r["goal_diff"], -r["goals_for"], r["club_name"]))
+    out = h2h.sort_standings(out)
+    for i, row in enumerate(out, start=1):
+        row["position"] = i
+    return {row["club_id"]: row for row in out}
+
+
+def _fixture(m, club_id, absolute):
+    home = m.home_club_id == club_id
+    opp = m.away_club if home else m.home_club
+    out = {
+        "id": m.id,
+        "datetime": m.datetime.isoformat() if m.datetime else None,
+        "status": m.status,
+        "home": home,
+        "venue": m.venue or "",
+        "round": m.round.name if m.round_id and m.round else None,
+        "opponent": {"id": opp.id, "name": opp.name, "logo": absolute(opp.logo)},
+    }
+    if m.status in FINISHED:
+        gf, ga = (m.home_score, m.away_score) if home else (m.away_score, m.home_score)
+        out.update(goals_for=gf, goals_against=ga, result="W" if gf > ga else "L" if gf < ga else "D")
+    return out
+
+
+def build(club, absolute) -> dict:
+    """
+    Données de la vue d'ensemble. `absolute(fichier)` -> URL absolue ou None.
+    Requêtes : effectif, staff, 5 derniers, prochain, classement (3, +1 si égalités), cartons = 8 (+1 pour le club).
+    """
+    from clubs.models import StaffMember
+    from matches.models import Card, Match
+    from players.models import Player
+
+    cid = club.id
+    played_by_club = Q(home_club_id=cid) | Q(away_club_id=cid)
+    related = ("home_club", "away_club", "round")
+
+    roster = [
+        {
+            "id": p.id, "first_name": p.first_name, "last_name": p.last_name, "number": p.number or None,
+            "position": p.position or "", "photo": absolute(p.photo),
+        }
+        for p in Player.objects.filter(club_id=cid).order_by("number", "last_name", "first_name", "id")
+    ]
+    staff = [
+        {"id": s.id, "full_name": s.full_name, "role": s.role, "role_display": s.get_role_display(),
+         "photo": absolute(s.photo)}
+        for s in StaffMember.objects.filter(club_id=cid, is_active=True).order_by("role", "full_name", "id")
+    ]
+    last = [
+        _fixture(m, cid, absolute)
+        for m in Match.objects.filter(played_by_club, status__in=FINISHED)
+        .select_related(*related).order_by("-datetime", "-id")[:FORM_SIZE]
+    ]
+    upcoming = (
+        Match.objects.filter(played_by_club, status="SCHEDULED", datetime__gte=timezone.now())
+        .select_related(*related).order_by("datetime", "id").first()
+    )
+    table = _table()
+    cards = Card.objects.filter(club_id=cid, match__status__in=FINISHED).aggregate(
+        yellow=Count("id", filter=Q(type="Y")), red=Count("id", filter=Q(type="R")),
+    )
+
+    row = dict(table.get(cid) or {})
+    totals = {k: row.pop(k, 0) for k in ("home", "away", "clean_sheets")}
+    totals.update(
+        played=row.get("played", 0), goals_for=row.get("goals_for", 0), goals_against=row.get("goals_against", 0),
+        yellow_cards=cards["yellow"] or 0, red_cards=cards["red"] or 0, players=len(roster),
+    )
+    return {
+        "club": {
+            "id": cid, "name": club.name, "short_name": club.short_name, "city": club.city,
+            "stadium": club.stadium, "logo": absolute(club.logo),
+        },
+        "roster": roster,
+        "staff": staff,
+        "form": "".join(m["result"] for m in last),
+        "last_results": last,
+        "next_match": _fixture(upcoming, cid, absolute) if upcoming else None,
+        "standing": row or None,
+        "totals": totals,
+        "clubs_in_table": len(table),
+    }
+
+
+def get_overview(club, absolute, origin) -> dict:
+    key = cache_key(club.id, origin)
+    data = cache.get(key)
+    record_cache("club_overview", data is not None)
+    if data is None:
+        data = build(club, absolute)
+        cache.set(key, data, getattr(settings, "PFOOT_CLUB_OVERVIEW_TTL", 600))
+    return data
+
+
+# ======================================
+# Invalidation (receveurs de signaux)
+# ======================================
+
+def _bump(*names, using=None):
+    def apply():
+        for name in names:
+            versions.bump(name)
+
+    transaction.on_commit(apply, using=using)
+
+
+def remember_club(sender, instance, raw=False, **kwargs):
+    """pre_save (joueur, staff) : club avant modification, pour invalider aussi l'ancien club."""
+    if raw or not instance.pk:
+        return
+    instance._overview_old_club_id = (
+        sender._base_manager.filter(pk=instance.pk).values_list("club_id", flat=True).first()
+    )
+
+
+def on_member_change(sender, instance, **kwargs):
+    """Joueur, membre du staff, carton : club courant (et précédent s'il a changé)."""
+    clubs = {getattr(instance, "club_id", None), getattr(instance, "_overview_old_club_id", None)}
+    _bump(*(_club_version(c) for c in clubs if c), using=kwargs.get("using"))
+
+
+def on_club_change(sender, instance, **kwargs):
+    # Le nom / logo du club apparaît aussi chez ses adversaires (matchs) et dans le classement
+    _bump(GLOBAL_VERSION, using=kwargs.get("using"))
+
+
+def on_match_change(sender, **kwargs):
+    # Un résultat modifie le classement de tous les clubs ; bulk_write : clubs inconnus
+    _bump(GLOBAL_VERSION, using=kwargs.get("using"))
@@ -0,0 +1,123 @@
+# clubs/picker_index.py
+"""
+Index mémoire des pickers de clubs de l'admin (`/admin/clubs/quick/api/`).
+
+Construit en une requête, reconstruit paresseusement quand le jeton de version partagé
+"clubs" change (profootgn/versions.py) : signaux save/delete et bulk_write de Club.
+Le jeton sert aussi d'ETag : tant qu'aucun club ne change, le navigateur revalide en 304
+sans requête SQL ni sérialisation.
+
+Requête : chaque mot de q doit préfixer un mot du nom (« fc ka » -> « FC Kaloum »),
+insensible à la casse et aux accents. Ordre : nom, puis id.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from bisect import bisect_left
+
+from django.db import transaction
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+from profootgn.text import fold_name, query_words, tokenize_words
+
+VERSION_NAME = "clubs"
+
+
+class ClubPickerIndex:
+    """Instantané immuable des clubs ; voir `search()`."""
+
+    def __init__(self, rows, token=None):
+        self.token = token
+        # rows : (id, name, logo relatif ou ""), ordre du nom
+        self.rows = list(rows)
+        self._words = []      # [(mot, position)] trié : préfixes par bisect
+        self._bodies = {}     # origine -> JSON de la liste complète (requête sans q)
+        for pos, (_pk, name, _logo) in enumerate(self.rows):
+            for word in set(tokenize_words(name)):
+                self._words.append((word, pos))
+        self._words.sort()
+
+    @classmethod
+    def build(cls, token=None):
+        from clubs.models import Club
+
+        rows = []
+        for c in Club.objects.only("id", "name", "logo").order_by("name", "id").iterator():
+            rows.append((c.id, c.name, c.logo.url if c.logo else ""))
+        return cls(rows, token)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _word_prefix(self, prefix: str) -> set[int]:
+        out = set()
+        i = bisect_left(self._words, (prefix,))
+        while i < len(self._words) and self._words[i][0].startswith(prefix):
+            out.add(self._words[i][1])
+            i += 1
+        return out
+
+    def search(self, q) -> list[int]:
+        """Positions (ordre du nom) des clubs dont chaque mot de q préfixe un mot du nom."""
+        words = query_words(q)
+        if not words:
+            return list(range(len(self.rows)))
+        candidates = None
+        for w in words:
+            hits = self._word_prefix(w)
+            candidates = hits if candidates is None else candidates & hits
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def results(self, q, absolute=str) -> list[dict]:
+        """[{id, name, logo}] ; `absolute` rend l'URL du logo absolue (request.build_absolute_uri)."""
+        out = []
+        for pos in self.search(q):
+            pk, name, logo = self.rows[pos]
+            out.append({"id": pk, "name": name, "logo": absolute(logo) if logo else ""})
+        return out
+
+    def body(self, q, origin, absolute=str) -> bytes:
+        """Réponse JSON encodée ; la liste complète est mémorisée par origine (schéma + hôte)."""
+        if fold_name(q):
+            return json.dumps(self.results(q, absolute)).encode()
+        data = self._bodies.get(origin)
+        if data is None:
+            data = self._bodies[origin] = json.dumps(self.results("", absolute)).encode()
+        return data
+
+
+# ======================================
+# Index du process (reconstruction paresseuse)
+# ======================================
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index() -> ClubPickerIndex:
+    """Index à jour : 1 lecture de cache par appel, 1 requête SQL après une modification."""
+    global _index
+    token = versions.current(VERSION_NAME)
+    idx = _index
+    hit = idx is not None and idx.token == token
+    record_cache("club_picker_index", hit)
+    if hit:
+        return idx
+    with _lock:
+        if _index is None or _index.token != token:
+            _index = ClubPickerIndex.build(token)
+        return _index
+
+
+def current_version() -> str:
+    """Jeton de la table des clubs (ETag des réponses du picker)."""
+    return versions.current(VERSION_NAME)
+
+
+def invalidate(**kwargs):
+    """Receveur de signaux : le jeton change au commit (voir players/search_index.py)."""
+    transaction.on_commit(lambda: versions.bump(VERSION_NAME), using=kwargs.get("using"))
@@ -1,8 +1,30 @@
 # clubs/views.py
-from rest_framework import viewsets, permissions
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import viewsets, permissions, renderers, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from .models import Club
 from .serializers import ClubSerializer
+from matches.models import Match
+from matches.serializers import MatchCalendarSerializer
+from . import fixtures as club_fixtures
+from . import overview as club_overview
+from stats import h2h as stats_h2h
+from search.index import get_index as search_index
+
+class ICalendarRenderer(renderers.BaseRenderer):
+    """text/calendar : le contenu est déjà sérialisé (clubs/fixtures.py)."""
+    media_type = "text/calendar"
+    format = "ics"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data if isinstance(data, (str, bytes)) else ""
+
 
 class ClubViewSet(viewsets.ModelViewSet):
     """
@@ -12,17 +34,107 @@ class ClubViewSet(viewsets.ModelViewSet):
     - GET /api/clubs/{id}/ → détail
     - PUT/PATCH /api/clubs/{id}/ → mise à jour
     - DELETE /api/clubs/{id}/ → suppression
+    - GET /api/clubs/{id}/overview/ → page club en un appel (public, en cache)
+    - GET /api/clubs/{id}/matches/ → calendrier / résultats du club (public, curseur)
+    - GET /api/clubs/{id}/calendar.ics → calendrier iCalendar (public, en cache)
+    - GET /api/clubs/{id}/h2h/{autre}/ → confrontations directes (public)
     """
     queryset = Club.objects.all().order_by("name")
     serializer_class = ClubSerializer
     permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    # IDs numériques seulement (comme PlayerViewSet) : /api/clubs/abc/h2h/2/ -> 404, pas int() en erreur
+    lookup_value_regex = r"\d+"
 
     def get_queryset(self):
         qs = super().get_queryset()
         q = self.request.query_params.get("q")       # recherche texte
         city = self.request.query_params.get("city") # filtre ville
         if q:
-            qs = qs.filter(name__icontains=q)
+            qs = qs.filter(pk__in=search_index().ids("club", q))
         if city:
             qs = qs.filter(city__icontains=city)
         return qs
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def overview(self, request, pk=None):
+        """Effectif, staff actif, forme, prochain match, ligne du classement, totaux (clubs/overview.py)."""
+        club = self.get_object()
+
+        def absolute(f):
+            return request.build_absolute_uri(f.url) if f else None
+
+        origin = f"{request.scheme}://{request.get_host()}"
+        return Response(club_overview.get_overview(club, absolute, origin))
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def matches(self, request, pk=None):
+        """
+        Matchs du club (domicile + extérieur) : {"next": "...&cursor=...", "results": [...]}
+        Params: status=FINISHED,SCHEDULED • date_from / date_to (YYYY-MM-DD, inclus)
+                order=desc (défaut, plus récents d'abord) | asc • page_size (def=20, max 100) • cursor
+        """
+        club = self.get_object()
+        qp = request.query_params
+        tz = timezone.get_current_timezone()
+
+        def day_start(name, shift=0):
+            """Début du jour (aware) ; lève ValueError si le paramètre n'est pas une date valide."""
+            raw = qp.get(name)
+            if not raw:
+                return None
+            try:
+                d = parse_date(str(raw))   # None si mal formé, ValueError si impossible (2020-13-45)
+                if d:
+                    return timezone.make_aware(datetime.combine(d + timedelta(days=shift), time.min), tz)
+            except (ValueError, OverflowError):
+                pass
+            raise ValueError(f"Paramètre '{name}' invalide (YYYY-MM-DD).")
+
+        try:
+            limit = max(1, min(int(qp.get("page_size") or 20), 100))
+        except ValueError:
+            limit = 20
+        try:
+            date_from, date_to = day_start("date_from"), day_start("date_to", shift=1)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = club_fixtures.match_ids(
+            club.id,
+            statuses=club_fixtures.parse_statuses(qp.get("status")),
+            date_from=date_from,
+            date_to=date_to,
+            cursor=qp.get("cursor"),
+            descending=(qp.get("order") or "desc").lower() != "asc",
+            limit=limit,
+        )
+        nxt = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            nxt = replace_query_param(request.build_absolute_uri(), "cursor", club_fixtures.encode_cursor(rows[-1][1], rows[-1][0]))
+
+        found = Match.objects.select_related("home_club", "away_club", "round").in_bulk([mid for mid, _ in rows])
+        ordered = [found[mid] for mid, _ in rows if mid in found]
+        data = MatchCalendarSerializer(ordered, many=True, context={"request": request}).data
+        return Response({"next": nxt, "results": data})
+
+    @action(detail=True, methods=["get"], renderer_classes=[ICalendarRenderer],
+            permission_classes=[permissions.AllowAny])
+    def calendar(self, request, pk=None, format=None):
+        """Calendrier iCalendar du club (abonnement agenda), /calendar.ics ; ETag + 304."""
+        club = self.get_object()
+        host = request.get_host().split(":")[0] or "profootgn"
+        etag = f'"{club_fixtures.ics_etag(club.id, host)}"'
+        headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        body, _ = club_fixtures.get_ics(club, host)
+        headers["Content-Disposition"] = f'inline; filename="club-{club.id}.ics"'
+        return Response(body, headers=headers)
+
+    @action(detail=True, methods=["get"], url_path=r"h2h/(?P<other>\d+)",
+            permission_classes=[permissions.AllowAny])
+    def h2h(self, request, pk=None, other=None):
+        """Confrontations directes, vues du club {id} (stats/h2h.py) ; 404 si un des clubs n'existe pas."""
+        if int(pk) == int(other):
+            return Response({"detail": "Deux clubs différents sont requis."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(stats_h2h.record(int(pk), int(other)))
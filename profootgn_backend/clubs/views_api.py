@@ -6,6 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Club, StaffMember
 from .serializers import ClubMinimalSerializer, StaffSerializer
+from search.index import get_index as search_index
 
 class ClubMinimalViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Club.objects.all().order_by('name')
@@ -41,7 +42,7 @@ class StaffViewSet(viewsets.ModelViewSet):
         q = self.request.query_params.get('q')
         if club_id: qs = qs.filter(club_id=club_id)
         if role: qs = qs.filter(role=role)
-        if q: qs = qs.filter(full_name__icontains=q)
+        if q: qs = qs.filter(pk__in=search_index().ids('staff', q))
         return qs.order_by('role','full_name')
 
     @action(detail=False, methods=['post'])
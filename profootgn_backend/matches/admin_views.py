@@ -2,7 +2,6 @@
 from django.contrib import admin, messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, redirect
-from django.db.models import Q
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.db import transaction
@@ -11,11 +10,12 @@ from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse, HttpResponseBadRequest
 
 import json
-import re  # ⬅️ NEW
 
 from clubs.models import Club
 from players.models import Player
 from .models import Match, Round, Goal, Card
+from .utils.round_import import FORMATS, guess_format, import_round
+from .utils.round_seed import ensure_rounds_seeded
 
 
 # ======================================
@@ -188,61 +188,6 @@ def _ensure_csc_fallback_kwargs(goal_kwargs: dict, is_own_goal: bool) -> dict:
     return goal_kwargs
 
 
-# ============ NEW: Rounds helpers (J1→J26, ordre stable) ============
-def _infer_round_number_from_name(name: str):
-    """Essaie d'inférer un numéro depuis 'J1', 'Journée 1', 'Journee 1'…"""
-    if not name:
-        return None
-    s = str(name).lower()
-    m = re.search(r"j(?:ourn[ée]e)?\s*(\d{1,3})", s)
-    if m:
-        try:
-            return int(m.group(1))
-        except Exception:
-            return None
-    m2 = re.search(r"\b(\d{1,3})\b", s)
-    if m2:
-        try:
-            return int(m2.group(1))
-        except Exception:
-            return None
-    return None
-
-def _ensure_rounds_seeded(total=26):
-    """
-    Idempotent:
-      - complète r.number si manquant (depuis le name si possible)
-      - crée J1..J<total> manquants
-    """
-    # 1) Tenter de compléter number depuis name
-    for r in Round.objects.all():
-        if getattr(r, "number", None) in (None, 0):
-            n = _infer_round_number_from_name(getattr(r, "name", "") or "")
-            if n:
-                try:
-                    # si name vide, le poser en "J<n>"
-                    if not (r.name or "").strip():
-                        r.name = f"J{n}"
-                        r.save(update_fields=["number", "name"])
-                    else:
-                        r.number = n
-                        r.save(update_fields=["number"])
-                except Exception:
-                    # en cas de contrainte unique ou conflit, on ignore
-                    pass
-
-    # 2) Créer les manquants 1..total
-    existing = set(Round.objects.filter(number__isnull=False).values_list("number", flat=True))
-    for n in range(1, total + 1):
-        if n in existing:
-            continue
-        try:
-            Round.objects.create(number=n, name=f"J{n}")
-        except Exception:
-            # si une contrainte empêche, on ignore
-            pass
-
-
 # ======================================
 # Joueurs: parsing & résolution
 # ======================================
@@ -305,13 +250,8 @@ def _resolve_player_from_kind(kind: str, value, club=None):
 
     if kind == "name":
         parts = str(value).split()
-        if len(parts) >= 2:
-            first = parts[0]
-            last = " ".join(parts[1:])
-            pl = qs.filter(Q(first_name__iexact=first) & Q(last_name__iexact=last)).first()
-            if pl:
-                return pl
-        pl = qs.filter(Q(first_name__iexact=str(value)) | Q(last_name__iexact=str(value))).first()
+        # nom complet puis prénom/nom seul, casse et accents ignorés (colonnes normalisées indexées)
+        pl = qs.find_name(value)
         if pl:
             return pl
         if AUTO_CREATE_PLAYERS and club:
@@ -460,8 +400,8 @@ def _parse_card_line(line: str):
 @staff_member_required
 def quick_add_match_view(request):
     """Vue HTML d’ajout/édition rapide de match."""
-    # ⬇️ NEW: garantir une base propre des journées (J1..J26 + number renseigné)
-    _ensure_rounds_seeded(total=26)
+    # Journées J1..J26 : amorcées une fois (marqueur en cache, 0 requête ensuite)
+    ensure_rounds_seeded(total=26)
 
     if request.method == "POST":
         home_val = request.POST.get("home_id") or request.POST.get("home") or ""
@@ -643,6 +583,48 @@ def quick_events(request):
     return render(request, "admin/events/quick_events.html", ctx)
 
 
+@staff_member_required
+def round_import_view(request):
+    """
+    Import d'une journée complète (CSV / JSONL / JSON) : scores, statuts, minutes, buts, cartons.
+    'Simulation' cochée par défaut -> affiche le diff sans écrire ; décochée -> applique en une transaction.
+    """
+    report = None
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        if not upload:
+            messages.error(request, "Choisis un fichier à importer.")
+            return redirect("admin_round_import")
+
+        fmt = request.POST.get("format") or guess_format(upload.name)
+        if fmt not in FORMATS:
+            fmt = guess_format(upload.name)
+        report = import_round(
+            upload,
+            fmt=fmt,
+            round_ref=request.POST.get("round") or None,
+            dry_run=_is_truthy(request.POST.get("dry_run")),
+        )
+        if report["errors"]:
+            messages.error(request, f"{len(report['errors'])} erreur(s) : rien n'a été importé.")
+        elif report["applied"]:
+            s = report["summary"]
+            messages.success(
+                request,
+                f"Journée {report['round']} importée : {s['matches_updated']} match(s), "
+                f"{s['goals']} but(s), {s['cards']} carton(s), {s['players_created']} joueur(s) créé(s).",
+            )
+            return redirect("admin_round_import")
+
+    ctx = {
+        "rounds": Round.objects.filter(number__isnull=False).order_by("number", "id"),
+        "formats": FORMATS,
+        "report": report,
+    }
+    ctx.update(admin.site.each_context(request))
+    return render(request, "admin/matches/round_import.html", ctx)
+
+
 # ======================================
 # API JSON admin (édition inline)
 # ======================================
@@ -3,14 +3,20 @@ from __future__ import annotations
 
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from django.db import transaction, IntegrityError
-from django.db.models import F, Q
+from django.db import transaction
+from django.db.models import Max
 
-from datetime import date as date_cls, time as time_cls, datetime, timedelta
+from datetime import date as date_cls, time as time_cls, datetime
 import re
+import time
 
 from clubs.models import Club
 from matches.models import Round, Match
+from matches.utils.round_seed import forget_rounds_seeded
+from matches.utils.scheduler import evaluate, parse_blackouts, parse_slots, schedule_season
+
+# Taille des lots pour les INSERT groupés (reste sous max_allowed_packet MySQL)
+BATCH_SIZE = 1000
 
 
 def parse_iso_date(s: str) -> date_cls:
@@ -35,64 +41,42 @@ def make_aware(dt: datetime) -> datetime:
     return dt
 
 
-def round_robin_pairs(teams):
-    """
-    Algorithme "circle method".
-    Retourne une liste de journées ; chaque journée = liste de paires (home, away).
-    Si nombre d'équipes impair, on ajoute un BYE (None) qui sera ignoré.
-    """
-    teams = list(teams)
-    if len(teams) % 2 == 1:
-        teams.append(None)
-
-    n = len(teams)
-    half = n // 2
-    rounds = []
-
-    cur = teams[:]  # on travaille sur une copie
-
-    for r in range(n - 1):
-        pairs = []
-        for i in range(half):
-            t1 = cur[i]
-            t2 = cur[n - 1 - i]
-            if t1 is None or t2 is None:
-                # journée de repos (BYE)
-                continue
-
-            # Petite alternance home/away pour équilibrer
-            if i == 0 and (r % 2 == 1):
-                pairs.append((t2, t1))
-            else:
-                pairs.append((t1, t2))
-
-        rounds.append(pairs)
-
-        # rotation (en conservant le premier fixe)
-        cur = [cur[0]] + [cur[-1]] + cur[1:-1]
-
-    return rounds
-
-
-def mirror_rounds(rounds):
-    """Crée le retour (inversion domicile/extérieur) à partir de l'aller."""
-    return [[(b, a) for (a, b) in day] for day in rounds]
-
-
 def max_existing_round_number() -> int:
     """
-    Détecte le plus grand numéro de journée existante de type "J<number>".
+    Plus grand numéro de journée existant : Round.number (agrégat indexé),
+    complété par le suffixe numérique des noms ("J<number>") des seules journées sans number.
     Renvoie 0 s'il n'y en a pas.
     """
-    nums = []
-    for n in Round.objects.values_list("name", flat=True):
+    best = Round.objects.aggregate(m=Max("number"))["m"] or 0
+    for n in Round.objects.filter(number__isnull=True).values_list("name", flat=True):
         m = re.search(r"(\d+)$", str(n))
         if m:
-            try:
-                nums.append(int(m.group(1)))
-            except Exception:
-                pass
-    return max(nums) if nums else 0
+            best = max(best, int(m.group(1)))
+    return best
+
+
+def build_schedule(clubs, start_date, slots, spacing, make_double, start_number, blackouts=()):
+    """
+    Calcule tout le calendrier en mémoire (aucune requête) via matches.utils.scheduler.
+    Retourne (days, season) :
+      days   = [(round_number, round_name, day_date, [(home_id, away_id, kickoff_dt, venue), ...]), ...]
+      season = sortie brute de schedule_season (pour evaluate()).
+    """
+    season = schedule_season(
+        [(c.id, c.stadium) for c in clubs],
+        start_date=start_date,
+        slots=slots,
+        spacing=spacing,
+        double=make_double,
+        blackouts=blackouts,
+        make_datetime=make_aware,
+    )
+    days = []
+    for day in season:
+        round_number = start_number + day["index"]
+        matches = [(m["home"], m["away"], m["datetime"], m["venue"]) for m in day["matches"]]
+        days.append((round_number, f"J{round_number}", day["date"], matches))
+    return days, season
 
 
 class Command(BaseCommand):
@@ -112,7 +96,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--kickoff",
             default="16:00",
-            help="Heure de coup d'envoi pour tous les matches (HH:MM). Défaut: 16:00",
+            help="Heure de coup d'envoi (HH:MM) quand --slots n'est pas fourni. Défaut: 16:00",
         )
         parser.add_argument(
             "--spacing-days",
@@ -125,92 +109,142 @@ class Command(BaseCommand):
             action="store_true",
             help="Génère aller + retour (double round-robin).",
         )
+        parser.add_argument(
+            "--slots",
+            default=None,
+            help=(
+                "Créneaux de coup d'envoi d'une journée, séparés par des virgules : HH:MM ou +N HH:MM "
+                "(N jours après la date de la journée). Ex: \"16:00,18:30,+1 16:00\". Défaut: --kickoff."
+            ),
+        )
+        parser.add_argument(
+            "--blackout",
+            default="",
+            help="Dates interdites (YYYY-MM-DD ou YYYY-MM-DD..YYYY-MM-DD, séparées par des virgules).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Calcule le calendrier et affiche ses indicateurs de qualité sans rien écrire.",
+        )
 
     @transaction.atomic
     def handle(self, *args, **opts):
         # Récupérer et parser les options
         start_date = parse_iso_date(opts["start_date"])
-        kickoff = parse_hhmm(opts["kickoff"])
+        parse_hhmm(opts["kickoff"])  # validation du format
         spacing = int(opts["spacing_days"])
         make_double = bool(opts["double"])
         do_reset = bool(opts["reset"])
+        dry_run = bool(opts["dry_run"])
+        try:
+            slots = parse_slots(opts["slots"] or opts["kickoff"])
+            blackouts = parse_blackouts(opts["blackout"])
+        except ValueError as e:
+            raise CommandError(str(e))
 
         # Sécurité : y a-t-il des clubs ?
-        clubs = list(Club.objects.order_by("id"))
+        clubs = list(Club.objects.only("id", "stadium").order_by("id"))
         if len(clubs) < 2:
             raise CommandError("Il faut au moins 2 clubs pour générer un calendrier.")
 
+        if dry_run:
+            t0 = time.perf_counter()
+            _, season = build_schedule(clubs, start_date, slots, spacing, make_double, 1, blackouts)
+            self._report(season, slots, time.perf_counter() - t0)
+            return
+
         # Reset si demandé
         if do_reset:
             self.stdout.write(self.style.WARNING("→ Réinitialisation demandée : suppression rounds + matches…"))
             # Matches en premier (supprime aussi Goals/Cards via CASCADE), puis Rounds
             Match.objects.all().delete()
             Round.objects.all().delete()
+            forget_rounds_seeded()
             self.stdout.write(self.style.SUCCESS("✓ Base vidée (rounds & matches)."))
 
         # Calcule l'indice de départ des journées (si on ne reset pas, on continue)
         start_number = 1 if do_reset else (max_existing_round_number() + 1)
 
-        # Construire l'aller
-        fixtures = round_robin_pairs(clubs)
-        if make_double:
-            fixtures = fixtures + mirror_rounds(fixtures)
-
-        total_days = len(fixtures)
-        self.stdout.write(f"→ Génération de {total_days} journée(s)…")
-
-        created_rounds = 0
-        created_matches = 0
-        skipped_matches = 0
-
-        for day_index, pairs in enumerate(fixtures, start=0):
-            round_number = start_number + day_index
-            round_name = f"J{round_number}"
-
-            # Date de la journée
-            day_date = start_date + timedelta(days=spacing * day_index)
-            round_obj, r_created = Round.objects.get_or_create(
-                name=round_name,
-                defaults={"date": day_date},
-            )
-            if not r_created:
+        t0 = time.perf_counter()
+        days, season = build_schedule(clubs, start_date, slots, spacing, make_double, start_number, blackouts)
+        self.stdout.write(f"→ Génération de {len(days)} journée(s)…")
+
+        # ---- Journées : 1 lecture, 1 INSERT groupé, 1 relecture (PK non renvoyées par MySQL)
+        names = [name for _, name, _, _ in days]
+        existing_rounds = {r.name: r for r in Round.objects.filter(name__in=names)}
+        used_numbers = set(Round.objects.filter(number__isnull=False).values_list("number", flat=True))
+
+        new_rounds, to_date = [], []
+        for number, name, day_date, _ in days:
+            r = existing_rounds.get(name)
+            if r is None:
+                new_rounds.append(Round(
+                    name=name,
+                    date=day_date,
+                    number=number if number not in used_numbers else None,
+                ))
+            elif not r.date:
                 # Met à jour la date si non renseignée
-                if not round_obj.date:
-                    round_obj.date = day_date
-                    round_obj.save(update_fields=["date"])
-            created_rounds += int(r_created)
-
-            # Datetime du coup d'envoi (même heure pour tous)
-            dt = make_aware(datetime.combine(day_date, kickoff))
+                r.date = day_date
+                to_date.append(r)
+
+        Round.objects.bulk_create(new_rounds, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        if to_date:
+            Round.objects.bulk_update(to_date, ["date"], batch_size=BATCH_SIZE)
+        round_ids = dict(Round.objects.filter(name__in=names).values_list("name", "id"))
+
+        # ---- Matchs : clés existantes préchargées, puis INSERT groupé sans doublon
+        existing_keys = set(
+            Match.objects
+            .filter(round_id__in=round_ids.values())
+            .values_list("round_id", "home_club_id", "away_club_id")
+        )
 
-            for home, away in pairs:
+        to_create = []
+        total_pairs = 0
+        for _, name, _, matches in days:
+            rid = round_ids.get(name)
+            for home_id, away_id, dt, venue in matches:
+                total_pairs += 1
                 # Unicité garantie par ta contrainte (round, home_club, away_club)
-                try:
-                    match, m_created = Match.objects.get_or_create(
-                        round=round_obj,
-                        home_club=home,
-                        away_club=away,
-                        defaults={
-                            "datetime": dt,
-                            "home_score": 0,
-                            "away_score": 0,
-                            "status": "SCHEDULED",
-                            "minute": 0,
-                            "venue": "",
-                            "buteur": "",
-                        },
-                    )
-                except IntegrityError:
-                    # Si contrainte d'unicité déclenchée : match déjà présent → on ignore
-                    m_created = False
-                    match = None
-
-                if m_created:
-                    created_matches += 1
-                else:
-                    skipped_matches += 1
+                if rid is None or (rid, home_id, away_id) in existing_keys:
+                    continue
+                to_create.append(Match(
+                    round_id=rid,
+                    home_club_id=home_id,
+                    away_club_id=away_id,
+                    datetime=dt,
+                    home_score=0,
+                    away_score=0,
+                    status="SCHEDULED",
+                    minute=0,
+                    venue=venue[:120],
+                    buteur="",
+                ))
+
+        Match.objects.bulk_create(to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+        created_rounds = len(new_rounds)
+        created_matches = len(to_create)
+        skipped_matches = total_pairs - created_matches
+        elapsed = time.perf_counter() - t0
 
         self.stdout.write(self.style.SUCCESS(
-            f"✓ Terminé. Journées créées: {created_rounds} • "
+            f"✓ Terminé en {elapsed:.2f}s. Journées créées: {created_rounds} • "
             f"Matches créés: {created_matches} • Ignorés (déjà existants): {skipped_matches}"
         ))
+        self._report(season, slots, elapsed)
+
+    def _report(self, season, slots, elapsed):
+        q = evaluate(season, len(slots))
+        self.stdout.write(
+            f"  Qualité : {q['rounds']} journées • {q['matches']} matchs • breaks {q['breaks']} • "
+            f"série max {q['max_run']} • écart dom./ext. max {q['max_home_gap']} • "
+            f"écart créneaux max {q['slot_spread']} • conflits de stade {q['stadium_clashes']} • "
+            f"calcul {elapsed:.2f}s"
+        )
+        if q["stadium_clashes"]:
+            self.stdout.write(self.style.WARNING(
+                "  ! Certains clubs partageant un stade jouent au même créneau : ajoute des créneaux (--slots)."
+            ))
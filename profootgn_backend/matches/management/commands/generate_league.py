@@ -0,0 +1,318 @@
+# matches/management/commands/generate_league.py
+from __future__ import annotations
+
+import math
+import random
+import re
+import time
+from datetime import datetime, time as time_cls, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from clubs.models import Club
+from news import fulltext
+from news.models import NewsItem
+from profootgn.signals import bulk_write
+from stats import aggregates, discipline, form, h2h
+from players.models import Player
+from matches.models import Round, Match, Goal, Card
+from matches.utils.scheduler import balanced_round_robin
+
+BATCH_SIZE = 5000
+
+FIRST_NAMES = [
+    "Mamadou", "Ibrahima", "Alpha", "Ousmane", "Sekou", "Mohamed", "Abdoulaye", "Amadou",
+    "Facinet", "Lansana", "Moussa", "Thierno", "Saliou", "Naby", "Kemoko", "Fode", "Aboubacar",
+    "Issiaga", "Morlaye", "Seydouba", "Karamoko", "Souleymane", "Mory", "Boubacar",
+]
+LAST_NAMES = [
+    "Diallo", "Camara", "Bah", "Barry", "Sylla", "Soumah", "Conte", "Keita", "Toure", "Cisse",
+    "Kouyate", "Sow", "Bangoura", "Kante", "Traore", "Conde", "Fofana", "Doumbouya", "Keira",
+    "Kaba", "Sakho", "Oulare", "Youla", "Guilavogui", "Kourouma", "Sano", "Tounkara",
+]
+POSITIONS = ["GK", "DF", "DF", "DF", "DF", "MF", "MF", "MF", "FW", "FW", "FW"]
+NEWS_TITLES = [
+    "{club} s'impose face à {other}", "{player} prolonge avec {club}", "Mercato : {player} vers {other}",
+    "{club} : blessure de {player}", "Derby tendu entre {club} et {other}", "{player} élu joueur du mois",
+    "{club} tenu en échec par {other}", "Conférence de presse de l'entraîneur de {club}",
+]
+NEWS_WORDS = (
+    "match victoire défaite nul but penalty carton arbitre entraîneur supporters stade tribune "
+    "championnat ligue coupe classement journée saison effectif transfert contrat blessure retour "
+    "attaquant milieu défenseur gardien capitaine titulaire remplaçant tactique pressing contre-attaque "
+    "corner coup-franc hors-jeu prolongation mi-temps domicile extérieur série invaincu relégation "
+    "promotion formation académie jeunes sélection nationale syli Conakry Kamsar Kankan Labé Nzérékoré"
+).split()
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    """Tirage de Poisson (Knuth) : suffisant pour des moyennes de quelques unités."""
+    if lam <= 0:
+        return 0
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+class _RowWriter:
+    """
+    INSERT groupés bruts (executemany) pour les gros volumes (matchs, buts, cartons) :
+    mêmes lignes qu'un bulk_create, sans instancier un objet modèle par ligne.
+    Les colonnes non fournies prennent la valeur par défaut du champ.
+    """
+
+    def __init__(self, model):
+        fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+        qn = connection.ops.quote_name
+        self.attnames = [f.attname for f in fields]
+        self.defaults = [f.get_default() for f in fields]
+        self.datetimes = [i for i, f in enumerate(fields) if f.get_internal_type() == "DateTimeField"]
+        self.sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            qn(model._meta.db_table),
+            ", ".join(qn(f.column) for f in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+        self.rows = []
+        self.count = 0
+
+    def add(self, **values):
+        row = [values.get(a, d) for a, d in zip(self.attnames, self.defaults)]
+        for i in self.datetimes:
+            row[i] = connection.ops.adapt_datetimefield_value(row[i])
+        self.rows.append(row)
+        if len(self.rows) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            with connection.cursor() as cur:
+                cur.executemany(self.sql, self.rows)
+            self.count += len(self.rows)
+            self.rows = []
+        return self.count
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère une ligue synthétique (clubs, effectifs, saisons, matchs, buts, cartons, matchs en direct) "
+        "en INSERT groupés, pour mesurer les performances sur de gros volumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clubs", type=int, default=20, help="Nombre de clubs (défaut: 20).")
+        parser.add_argument("--players", type=int, default=25, help="Joueurs par club (défaut: 25).")
+        parser.add_argument("--seasons", type=int, default=1, help="Saisons aller-retour (défaut: 1).")
+        parser.add_argument("--goals", type=float, default=2.6, help="Buts moyens par match (défaut: 2.6).")
+        parser.add_argument("--cards", type=float, default=3.5, help="Cartons moyens par match (défaut: 3.5).")
+        parser.add_argument("--live", type=int, default=3, help="Matchs en direct dans la journée courante (défaut: 3).")
+        parser.add_argument("--spacing-days", type=int, default=7, help="Jours entre deux journées (défaut: 7).")
+        parser.add_argument("--prefix", default="Synth", help="Préfixe des noms générés (défaut: Synth).")
+        parser.add_argument("--news", type=int, default=0, help="Actualités à générer (défaut: 0).")
+        parser.add_argument("--seed", type=int, default=42, help="Graine aléatoire (résultats reproductibles).")
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Supprime d'abord la ligue synthétique de même préfixe (clubs, journées, et en cascade le reste).",
+        )
+
+    def handle(self, *args, **opts):
+        n_clubs, per_club = opts["clubs"], opts["players"]
+        if n_clubs < 2:
+            raise CommandError("--clubs doit être >= 2.")
+        if per_club < 1 or opts["seasons"] < 1:
+            raise CommandError("--players et --seasons doivent être >= 1.")
+
+        prefix = opts["prefix"].strip() or "Synth"
+        rng = random.Random(opts["seed"])
+        t0 = time.perf_counter()
+
+        if opts["reset"]:
+            NewsItem.objects.filter(slug__startswith=f"{slugify(prefix)}-actu-").delete()
+            Club.objects.filter(name__startswith=f"{prefix} FC ").delete()
+            Round.objects.filter(name__regex=rf"^{re.escape(prefix)} S[0-9]+ J[0-9]+$").delete()
+        elif Club.objects.filter(name__startswith=f"{prefix} FC ").exists():
+            raise CommandError(f"Une ligue « {prefix} » existe déjà : utilise --reset ou un autre --prefix.")
+
+        with transaction.atomic():
+            clubs = self._create_clubs(prefix, n_clubs)
+            roster = self._create_players(rng, clubs, per_club)
+            rounds, schedule = self._create_rounds(prefix, clubs, opts)
+            plans = self._create_matches(rng, clubs, rounds, schedule, opts)
+            n_goals, n_cards = self._create_events(rng, plans, roster, opts)
+            # INSERT bruts (sans signaux) : agrégats joueur × match des profils, discipline, confrontations, forme
+            aggregates.refresh_matches([p["id"] for p in plans])
+            discipline.refresh_players([pid for pids in roster.values() for pid in pids])
+            h2h.rebuild_all()
+            form.rebuild_all()
+            n_news = self._create_news(rng, prefix, clubs, roster, opts["news"])
+
+        elapsed = time.perf_counter() - t0
+        rows = len(clubs) + len(clubs) * per_club + len(rounds) + len(plans) + n_goals + n_cards + n_news
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Ligue « {prefix} » générée en {elapsed:.2f}s • clubs {len(clubs)} • joueurs {len(clubs) * per_club} • "
+            f"journées {len(rounds)} • matchs {len(plans)} • buts {n_goals} • cartons {n_cards} • actualités {n_news} "
+            f"• {rows} lignes ({rows / max(elapsed, 1e-9):,.0f} lignes/s)"
+        ))
+
+    # ---------------------------------------------------------------
+
+    def _create_clubs(self, prefix, n):
+        width = max(3, len(str(n)))
+        Club.objects.bulk_create(
+            [
+                Club(
+                    name=f"{prefix} FC {i:0{width}d}",
+                    short_name=f"{prefix[:3].upper()}{i}",
+                    city="Conakry",
+                    stadium=f"Stade {prefix} {i:0{width}d}",
+                )
+                for i in range(1, n + 1)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # PK non renvoyées par MySQL : relecture
+        return list(Club.objects.filter(name__startswith=f"{prefix} FC ").order_by("name").values_list("id", "stadium"))
+
+    def _create_players(self, rng, clubs, per_club):
+        objs = []
+        for cid, _ in clubs:
+            for k in range(per_club):
+                objs.append(Player(
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    club_id=cid,
+                    number=k + 1,
+                    position=POSITIONS[k % len(POSITIONS)],
+                    nationality="Guinée",
+                ))
+        Player.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+        roster = {cid: [] for cid, _ in clubs}
+        for pid, cid in Player.objects.filter(club_id__in=roster).values_list("id", "club_id"):
+            roster[cid].append(pid)
+        return roster
+
+    def _create_rounds(self, prefix, clubs, opts):
+        legs = balanced_round_robin([cid for cid, _ in clubs], dict(clubs))
+        legs = legs + [[(a, h) for h, a in day] for day in [legs[-1]] + legs[:-1]]
+        schedule = [(s, r, pairs) for s in range(1, opts["seasons"] + 1) for r, pairs in enumerate(legs, start=1)]
+
+        # Journée "courante" = milieu de la dernière saison : passé terminé, futur programmé
+        current = len(schedule) - len(legs) // 2 - 1
+        today = timezone.localdate()
+        start_number = (Round.objects.aggregate(m=Max("number"))["m"] or 0) + 1
+
+        Round.objects.bulk_create(
+            [
+                Round(
+                    name=f"{prefix} S{s} J{r}",
+                    number=start_number + i,
+                    date=today + timedelta(days=(i - current) * opts["spacing_days"]),
+                )
+                for i, (s, r, _) in enumerate(schedule)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        by_number = dict(
+            Round.objects.filter(number__gte=start_number, number__lt=start_number + len(schedule))
+            .values_list("number", "id")
+        )
+        rounds = [(by_number[start_number + i], i - current) for i in range(len(schedule))]
+        return rounds, schedule
+
+    def _create_matches(self, rng, clubs, rounds, schedule, opts):
+        """Crée les matchs ; renvoie un plan par match (état + buts/cartons à générer)."""
+        tz = timezone.get_current_timezone()
+        stadiums = dict(clubs)
+        writer, plans = _RowWriter(Match), []
+        live_left = opts["live"]
+        now = timezone.now()
+
+        for (round_id, offset), (_, _, pairs) in zip(rounds, schedule):
+            day = timezone.localdate() + timedelta(days=offset * opts["spacing_days"])
+            for h, a in pairs:
+                if offset < 0:
+                    status, minute, dt = "FT", 90, timezone.make_aware(datetime.combine(day, time_cls(16, 0)), tz)
+                elif offset == 0 and live_left > 0:
+                    live_left -= 1
+                    minute = rng.randint(1, 89)
+                    status, dt = "LIVE", now - timedelta(minutes=minute)
+                else:
+                    status, minute = "SCHEDULED", 0
+                    dt = timezone.make_aware(datetime.combine(day, time_cls(16, 0)), tz)
+                    if dt <= now:
+                        dt = now + timedelta(hours=2)
+
+                goals, cards = [], []
+                if status != "SCHEDULED":
+                    share = minute / 90
+                    for club_id, lam in ((h, 0.55), (a, 0.45)):
+                        for _ in range(_poisson(rng, opts["goals"] * lam * share)):
+                            goals.append((club_id, rng.randint(1, minute)))
+                        for _ in range(_poisson(rng, opts["cards"] / 2 * share)):
+                            cards.append((club_id, rng.randint(1, minute), "R" if rng.random() < 0.06 else "Y"))
+
+                home_score = sum(1 for c, _ in goals if c == h)
+                writer.add(
+                    round_id=round_id, datetime=dt, home_club_id=h, away_club_id=a,
+                    home_score=home_score, away_score=len(goals) - home_score,
+                    status=status, minute=minute, venue=stadiums.get(h) or "",
+                )
+                plans.append({"key": (round_id, h, a), "goals": goals, "cards": cards})
+
+        writer.flush()
+        ids = {
+            (r, h, a): mid
+            for mid, r, h, a in Match.objects.filter(round_id__in=[r for r, _ in rounds])
+            .values_list("id", "round_id", "home_club_id", "away_club_id")
+        }
+        for p in plans:
+            p["id"] = ids[p["key"]]
+        return plans
+
+    def _create_events(self, rng, plans, roster, opts):
+        goals, cards = _RowWriter(Goal), _RowWriter(Card)
+        for p in plans:
+            for club_id, minute in sorted(p["goals"], key=lambda g: g[1]):
+                squad = roster[club_id]
+                scorer = rng.choice(squad)
+                assist = rng.choice(squad) if rng.random() < 0.6 and len(squad) > 1 else None
+                goals.add(
+                    match_id=p["id"], club_id=club_id, minute=minute, player_id=scorer,
+                    assist_player_id=assist if assist != scorer else None,
+                )
+            for club_id, minute, kind in sorted(p["cards"], key=lambda c: c[1]):
+                cards.add(match_id=p["id"], club_id=club_id, minute=minute,
+                          player_id=rng.choice(roster[club_id]), type=kind)
+        return goals.flush(), cards.flush()
+
+    def _create_news(self, rng, prefix, clubs, roster, n):
+        """Actualités (INSERT groupés) puis leur index plein texte (news/fulltext.py)."""
+        if n <= 0:
+            return 0
+        names = dict(Club.objects.filter(id__in=[cid for cid, _ in clubs]).values_list("id", "name"))
+        players = dict(Player.objects.filter(club_id__in=names).values_list("id", "last_name"))
+        base, now = slugify(prefix), timezone.now()
+        writer, texts = _RowWriter(NewsItem), {}
+        for i in range(1, n + 1):
+            cid, other = rng.sample(list(names), 2)
+            title = rng.choice(NEWS_TITLES).format(
+                club=names[cid], other=names[other], player=players[rng.choice(roster[cid])],
+            )
+            content = " ".join(rng.choice(NEWS_WORDS) for _ in range(rng.randint(40, 120)))
+            slug = f"{base}-actu-{i}"
+            texts[slug] = (title, content)
+            writer.add(title=title, slug=slug, content=content, club_id=cid,
+                       published_at=now - timedelta(minutes=(n - i) * 30))
+        writer.flush()
+
+        rows = NewsItem.objects.filter(slug__startswith=f"{base}-actu-").values_list("id", "slug")
+        fulltext.index_items((pk, *texts[slug]) for pk, slug in rows.iterator())
+        bulk_write.send(sender=NewsItem, using=connection.alias)
+        return writer.count
@@ -0,0 +1,70 @@
+# matches/management/commands/import_round_results.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matches.utils.round_import import FORMATS, guess_format, import_round
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe les résultats d'une journée complète (scores, statuts, minutes, buts, cartons) "
+        "depuis un CSV / JSONL / JSON, en une seule transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Fichier à importer (.csv, .jsonl, .json).")
+        parser.add_argument(
+            "--round",
+            dest="round_ref",
+            default=None,
+            help="Journée ciblée (J5, 5, 'Journée 5' ou id:12). Sinon colonne 'round' du fichier.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=None,
+            help="Format du fichier (défaut: déduit de l'extension).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Valide et affiche le diff sans rien écrire.",
+        )
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"] or guess_format(opts["path"])
+        try:
+            with open(opts["path"], "rb") as fh:
+                report = import_round(fh, fmt=fmt, round_ref=opts["round_ref"], dry_run=opts["dry_run"])
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"→ Journée {report['round'] or '?'} • {report['summary']['lines']} ligne(s)")
+
+        for err in report["errors"]:
+            where = f"ligne {err['line']}" if err["line"] else "fichier"
+            self.stderr.write(self.style.ERROR(f"  ✗ {where} : {err['error']}"))
+        if report["errors"]:
+            raise CommandError(f"{len(report['errors'])} erreur(s) : rien n'a été importé.")
+
+        for ch in report["changes"]:
+            parts = [f"{f} {old}→{new}" for f, (old, new) in ch["fields"].items()]
+            if ch["goals"] is not None:
+                parts.append(f"buts {ch['goals'][0]}→{ch['goals'][1]}")
+                parts.append(f"cartons {ch['cards'][0]}→{ch['cards'][1]}")
+            self.stdout.write(f"  • #{ch['match_id']} {ch['label']} : {', '.join(parts)}")
+        for p in report["new_players"]:
+            self.stdout.write(f"  + joueur à créer (club {p['club']}) : {p['name']}")
+        for w in report["warnings"]:
+            self.stdout.write(self.style.WARNING(f"  ! {w}"))
+
+        if report["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"Dry-run : {len(report['changes'])} match(s) seraient modifiés."))
+            return
+
+        s = report["summary"]
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Import terminé. Matchs mis à jour: {s['matches_updated']} • Buts: {s['goals']} • "
+            f"Cartons: {s['cards']} • Joueurs créés: {s['players_created']}"
+        ))
@@ -0,0 +1,318 @@
+# matches/management/commands/load_test.py
+from __future__ import annotations
+
+import heapq
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+
+from matches.models import Match
+
+# ======================================
+# Scénarios = polling réel du frontend
+# ======================================
+# Chaque vague = requêtes lancées ensemble (Promise.all côté React).
+
+LISTS = [
+    ("upcoming", "/api/matches/upcoming/"),
+    ("recent", "/api/matches/recent/"),
+    ("suspended", "/api/matches/?status=SUSPENDED&ordering=-datetime&page_size=200"),
+    ("postponed", "/api/matches/?status=POSTPONED&ordering=-datetime&page_size=200"),
+    ("canceled", "/api/matches/?status=CANCELED&ordering=-datetime&page_size=200"),
+]
+LIVE = ("live", "/api/matches/live/")
+STANDINGS = ("standings", "/api/stats/standings/?include_live=1")
+
+
+def _home():
+    """Home.jsx : 6 requêtes au chargement, live toutes les 15 s, 5 listes toutes les 30 s."""
+    return {
+        "initial": [LIVE] + LISTS,
+        "timers": [(15, [LIVE]), (30, LISTS)],
+    }
+
+
+def _match_detail(match_id):
+    """MatchDetail.jsx : détail au chargement, puis toutes les 7 s (match en direct)."""
+    detail = ("match_detail", f"/api/matches/{match_id}/")
+    return {"initial": [detail], "timers": [(7, [detail])]}
+
+
+def _standings():
+    """Standings.jsx : logos une fois, puis classement + live toutes les 15 s."""
+    return {
+        "initial": [("clubs", "/api/clubs/?page_size=500"), STANDINGS, LIVE],
+        "timers": [(15, [STANDINGS, LIVE])],
+    }
+
+
+_RE_SERVER_TIMING_DB = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, round(p / 100 * (len(s) - 1))))
+    return round(s[k], 2)
+
+
+class _Stats:
+    """Mesures partagées entre threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}      # label -> [ms]
+        self.errors = {}         # label -> nb
+        self.statuses = {}       # code -> nb
+        self.queries = 0
+        self.queries_known = False
+        self.lag = []            # retard de démarrage vs horaire prévu (saturation)
+
+    def record(self, label, ms, status, lag, queries):
+        with self.lock:
+            self.latencies.setdefault(label, []).append(ms)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status >= 400 or status == 0:
+                self.errors[label] = self.errors.get(label, 0) + 1
+            self.lag.append(lag)
+            if queries is not None:
+                self.queries += queries
+                self.queries_known = True
+
+
+class _QueryCounter:
+    """execute_wrapper : compte les requêtes SQL du thread courant (mode in-process)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Test de charge reproduisant le polling du frontend (Home, MatchDetail, Standings) pour N supporters "
+        "simultanés ; rapporte p50/p95/p99, débit et requêtes SQL/s."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fans", type=int, default=100, help="Supporters simultanés (défaut: 100).")
+        parser.add_argument("--duration", type=float, default=60, help="Durée en secondes (défaut: 60).")
+        parser.add_argument(
+            "--mix",
+            default="home=0.6,match=0.3,standings=0.1",
+            help="Répartition des pages ouvertes (défaut: home=0.6,match=0.3,standings=0.1).",
+        )
+        parser.add_argument("--threads", type=int, default=16, help="Requêtes HTTP en parallèle (défaut: 16).")
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=1.0,
+            help="Accélère les intervalles (ex. 5 : 100 supporters ≈ charge de 500).",
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Serveur cible (ex. http://127.0.0.1:8000). Sans --url : client de test Django en processus.",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Graine aléatoire (défaut: 1).")
+        parser.add_argument("--output", default=None, help="Écrit le rapport JSON dans ce fichier.")
+
+    # ---------------------------------------------------------------
+
+    def handle(self, *args, **opts):
+        if opts["fans"] < 1 or opts["duration"] <= 0 or opts["threads"] < 1 or opts["speed"] <= 0:
+            raise CommandError("--fans, --duration, --threads et --speed doivent être positifs.")
+        mix = self._parse_mix(opts["mix"])
+        rng = random.Random(opts["seed"])
+
+        live_ids = list(Match.objects.filter(status__in=["LIVE", "HT", "PAUSED"]).values_list("id", flat=True)[:50])
+        if not live_ids:
+            live_ids = list(Match.objects.order_by("-datetime").values_list("id", flat=True)[:50])
+        if mix.get("match") and not live_ids:
+            raise CommandError("Aucun match en base pour le scénario MatchDetail (voir generate_league).")
+
+        fans = []
+        for _ in range(opts["fans"]):
+            page = rng.choices(list(mix), weights=list(mix.values()))[0]
+            fans.append(_home() if page == "home" else _standings() if page == "standings"
+                        else _match_detail(rng.choice(live_ids)))
+
+        stats = _Stats()
+        fetch = self._http_fetch(opts["url"]) if opts["url"] else self._local_fetch()
+        self.stdout.write(
+            f"→ {opts['fans']} supporters ({', '.join(f'{k} {v:.0%}' for k, v in mix.items())}) • "
+            f"{opts['duration']:.0f}s • x{opts['speed']:g} • {'HTTP ' + opts['url'] if opts['url'] else 'en processus'}"
+        )
+
+        elapsed = self._run(fans, fetch, stats, rng, opts)
+        report = self._report(stats, elapsed, opts, mix)
+        self._print(report)
+        if opts["output"]:
+            Path(opts["output"]).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"✓ Rapport écrit dans {opts['output']}"))
+
+    def _parse_mix(self, spec):
+        mix = {}
+        for part in str(spec).split(","):
+            if not part.strip():
+                continue
+            key, _, val = part.partition("=")
+            key = key.strip()
+            if key not in {"home", "match", "standings"}:
+                raise CommandError(f"Page inconnue dans --mix: {key!r} (home, match, standings).")
+            try:
+                mix[key] = float(val)
+            except ValueError:
+                raise CommandError(f"Poids invalide dans --mix: {part!r}.")
+        if not mix or sum(mix.values()) <= 0:
+            raise CommandError("--mix vide.")
+        total = sum(mix.values())
+        return {k: v / total for k, v in mix.items() if v > 0}
+
+    # ---------------------------------------------------------------
+    # Transport : client de test (in-process) ou HTTP réel
+    # ---------------------------------------------------------------
+
+    def _local_fetch(self):
+        local = threading.local()
+
+        def fetch(path):
+            if not hasattr(local, "client"):
+                local.client = Client()
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                resp = local.client.get(path)
+            return resp.status_code, counter.count
+
+        return fetch
+
+    def _http_fetch(self, base):
+        base = base.rstrip("/")
+
+        def fetch(path):
+            try:
+                with urllib.request.urlopen(base + path, timeout=30) as resp:
+                    resp.read()
+                    timing = resp.headers.get("Server-Timing") or ""
+                    status = resp.status
+            except urllib.error.HTTPError as e:
+                return e.code, None
+            except (urllib.error.URLError, OSError):
+                return 0, None
+            # Nombre de requêtes SQL si le serveur a PFOOT_PERF_INSTRUMENTATION=True
+            m = _RE_SERVER_TIMING_DB.search(timing)
+            return status, int(m.group(1)) if m else None
+
+        return fetch
+
+    # ---------------------------------------------------------------
+    # Ordonnanceur : une file (heap) d'échéances, un pool de threads
+    # ---------------------------------------------------------------
+
+    def _run(self, fans, fetch, stats, rng, opts):
+        speed, duration = opts["speed"], opts["duration"]
+
+        def work(label, path, due):
+            start = time.perf_counter()
+            try:
+                status, queries = fetch(path)
+            except Exception:
+                status, queries = 0, None
+            finally:
+                close_old_connections()
+            end = time.perf_counter()
+            stats.record(label, (end - start) * 1000, status, (start - due) * 1000, queries)
+
+        t0 = time.perf_counter()
+        heap = []
+        for i, fan in enumerate(fans):
+            # Arrivées étalées sur le plus court intervalle (pas de pic artificiel au démarrage)
+            heapq.heappush(heap, (t0 + rng.uniform(0, 7 / speed), i, -1))
+
+        with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+            while heap:
+                due, i, timer = heapq.heappop(heap)
+                if due - t0 > duration:
+                    # Fenêtre complète : le débit se calcule sur la durée demandée
+                    time.sleep(max(0.0, t0 + duration - time.perf_counter()))
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                fan = fans[i]
+                if timer == -1:
+                    wave = fan["initial"]
+                    for k, (every, _) in enumerate(fan["timers"]):
+                        heapq.heappush(heap, (due + every / speed, i, k))
+                else:
+                    every, wave = fan["timers"][timer]
+                    heapq.heappush(heap, (due + every / speed, i, timer))
+                for label, path in wave:
+                    pool.submit(work, label, path, due)
+        return time.perf_counter() - t0
+
+    # ---------------------------------------------------------------
+
+    def _report(self, stats, elapsed, opts, mix):
+        all_ms = [ms for v in stats.latencies.values() for ms in v]
+        n = len(all_ms)
+        return {
+            "fans": opts["fans"],
+            "speed": opts["speed"],
+            "equivalent_fans": round(opts["fans"] * opts["speed"]),
+            "mix": mix,
+            "target": opts["url"] or "in-process",
+            "duration_s": round(elapsed, 2),
+            "requests": n,
+            "throughput_rps": round(n / elapsed, 2) if elapsed else None,
+            "errors": sum(stats.errors.values()),
+            "statuses": {str(k): v for k, v in sorted(stats.statuses.items())},
+            "db_queries_per_s": round(stats.queries / elapsed, 2) if stats.queries_known and elapsed else None,
+            "db_queries_per_request": round(stats.queries / n, 2) if stats.queries_known and n else None,
+            "latency_ms": {"p50": _percentile(all_ms, 50), "p95": _percentile(all_ms, 95), "p99": _percentile(all_ms, 99)},
+            "start_lag_ms_p95": _percentile(stats.lag, 95),
+            "endpoints": {
+                label: {
+                    "requests": len(v),
+                    "errors": stats.errors.get(label, 0),
+                    "p50": _percentile(v, 50),
+                    "p95": _percentile(v, 95),
+                    "p99": _percentile(v, 99),
+                }
+                for label, v in sorted(stats.latencies.items())
+            },
+        }
+
+    def _print(self, r):
+        lat = r["latency_ms"]
+        self.stdout.write(
+            f"  {r['requests']} requêtes en {r['duration_s']}s • {r['throughput_rps']} req/s • erreurs {r['errors']} • "
+            f"p50 {lat['p50']} ms • p95 {lat['p95']} ms • p99 {lat['p99']} ms"
+        )
+        if r["db_queries_per_s"] is not None:
+            self.stdout.write(f"  SQL : {r['db_queries_per_s']} requêtes/s • {r['db_queries_per_request']} par requête HTTP")
+        else:
+            self.stdout.write("  SQL : inconnu (activer PFOOT_PERF_INSTRUMENTATION sur le serveur cible)")
+        if r["start_lag_ms_p95"] and r["start_lag_ms_p95"] > 1000:
+            self.stdout.write(self.style.WARNING(
+                f"  ! Retard de démarrage p95 {r['start_lag_ms_p95']} ms : le serveur (ou --threads) sature."
+            ))
+        for label, e in r["endpoints"].items():
+            self.stdout.write(
+                f"    {label:<13} {e['requests']:>6} req • p50 {e['p50']:>8} • p95 {e['p95']:>8} • p99 {e['p99']:>8} ms"
+                + (f" • {e['errors']} erreur(s)" if e["errors"] else "")
+            )
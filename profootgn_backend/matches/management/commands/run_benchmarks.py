@@ -0,0 +1,233 @@
+# matches/management/commands/run_benchmarks.py
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from clubs.models import Club
+from players.models import Player
+from matches.models import Match, Goal, Card, Round
+from matches.utils.events import apply_events_from_text
+from matches import views as match_views
+from news.models import NewsItem
+from news.serializers import NewsItemSerializer
+
+
+class _Rollback(Exception):
+    """Annule l'écriture d'un cas d'ingestion (mesures répétables)."""
+
+
+def _percentile(values, p):
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, round(p / 100 * (len(s) - 1))))
+    return s[k]
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Chronomètre les endpoints chauds (classement, buteurs, listes de matchs, recherche joueurs, "
+        "ingestion d'événements) et écrit un JSON comparable d'un commit à l'autre."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=10, help="Mesures par cas (défaut: 10).")
+        parser.add_argument("--warmup", type=int, default=2, help="Passages d'échauffement non mesurés (défaut: 2).")
+        parser.add_argument("--only", default="", help="Cas à lancer, séparés par des virgules (défaut: tous).")
+        parser.add_argument("--output", default=None, help="Fichier JSON de résultats (défaut: var/bench/<date>-<commit>.json).")
+        parser.add_argument("--compare", default=None, help="JSON d'un run précédent : affiche l'écart par cas.")
+
+    # ---------------------------------------------------------------
+    # Cas mesurés : nom -> fonction sans argument renvoyant un code HTTP
+    # ---------------------------------------------------------------
+
+    def _cases(self):
+        client = APIClient()
+        admin = get_user_model()(username="bench", is_staff=True, is_superuser=True)
+        admin_client = APIClient()
+        admin_client.force_authenticate(admin)
+        factory = APIRequestFactory()
+
+        player = Player.objects.exclude(last_name="").order_by("id").first()
+        term = (player.last_name[:3] if player else "a")
+        match = (
+            Match.objects.filter(status__in=["FT", "FINISHED"])
+            .select_related("home_club", "away_club").order_by("-datetime", "-id").first()
+        )
+
+        club_id = match.home_club_id if match else None
+
+        def get(path):
+            return lambda: client.get(path).status_code
+
+        def search_fn():
+            return match_views.search_players(factory.get("/api/players/search/", {"q": term})).status_code
+
+        def ingest_cards():
+            body = {"match": match.id, "replace": True, "cards": [
+                {"club": match.home_club_id, "minute": 10 + i, "player_name": f"Bench Joueur{i}", "color": "Y"}
+                for i in range(4)
+            ]}
+            return self._rolled_back(lambda: admin_client.post("/api/cards/bulk/", body, format="json").status_code)
+
+        def ingest_text():
+            return self._rolled_back(lambda: apply_events_from_text(
+                match, "Bench Buteur 12; Bench Autre 44", "Bench Visiteur 70", "Bench Joueur 30 Y", "",
+                replace=True,
+            ) and 200)
+
+        cases = {
+            "standings": get("/api/stats/standings/"),
+            "top_scorers": get("/api/stats/topscorers/"),
+            "matches_list": get("/api/matches/"),
+            "matches_live": get("/api/matches/live/"),
+            "matches_recent": get("/api/matches/recent/?limit=10"),
+            "matches_upcoming": get("/api/matches/upcoming/?limit=10"),
+            "players_search": get(f"/api/players/?search={term}"),
+            "players_search_fn": search_fn,
+        }
+        if match is not None:
+            # Chemins couverts par les index composites (matches 0006, players 0003)
+            cases["match_detail"] = get(f"/api/matches/{match.id}/")
+            cases["goals_by_match"] = get(f"/api/goals/by-match/?match={match.id}")
+            cases["matches_finished"] = get("/api/matches/?status=FT&page_size=50")
+            cases["club_roster"] = get(f"/api/players/?club={club_id}&ordering=number")
+            cases["reschedule_slots"] = lambda: admin_client.get(f"/api/matches/{match.id}/reschedule-slots/").status_code
+            cases["ingest_cards_bulk"] = ingest_cards
+            cases["ingest_events_text"] = ingest_text
+        if NewsItem.objects.exists():
+            news_term = "blessure attaquant"
+
+            def news_search_like():
+                # Ancien chemin (SearchFilter) : LIKE '%mot%' sur titre, contenu et club, par mot
+                qs = NewsItem.objects.select_related("club").order_by("-published_at")
+                for word in news_term.split():
+                    qs = qs.filter(Q(title__icontains=word) | Q(content__icontains=word) | Q(club__name__icontains=word))
+                NewsItemSerializer(qs[:25], many=True).data
+                return 200
+
+            cases["news_search"] = get(f"/api/news/?search={news_term}")
+            cases["news_search_like"] = news_search_like
+        return cases
+
+    def _rolled_back(self, fn):
+        result = None
+        try:
+            with transaction.atomic():
+                result = fn()
+                raise _Rollback
+        except _Rollback:
+            pass
+        return result
+
+    # ---------------------------------------------------------------
+
+    def handle(self, *args, **opts):
+        if opts["repeat"] < 1:
+            raise CommandError("--repeat doit être >= 1.")
+        cases = self._cases()
+        only = [c.strip() for c in opts["only"].split(",") if c.strip()]
+        unknown = set(only) - set(cases)
+        if unknown:
+            raise CommandError(f"Cas inconnus: {', '.join(sorted(unknown))}. Disponibles: {', '.join(cases)}")
+
+        results = {}
+        for name, fn in cases.items():
+            if only and name not in only:
+                continue
+            for _ in range(opts["warmup"]):
+                fn()
+            timings = []
+            for _ in range(opts["repeat"]):
+                with CaptureQueriesContext(connection) as ctx:
+                    t0 = time.perf_counter()
+                    status = fn()
+                    timings.append((time.perf_counter() - t0) * 1000)
+            results[name] = {
+                "status": status,
+                "queries": len(ctx.captured_queries),
+                "min_ms": round(min(timings), 3),
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(_percentile(timings, 95), 3),
+                "mean_ms": round(statistics.fmean(timings), 3),
+            }
+            r = results[name]
+            self.stdout.write(
+                f"  {name:<20} {r['median_ms']:>9.2f} ms méd. • p95 {r['p95_ms']:>9.2f} ms • "
+                f"{r['queries']:>4} requête(s) • HTTP {status}"
+            )
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "at": timezone.now().isoformat(timespec="seconds"),
+                "db": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "repeat": opts["repeat"],
+                "dataset": {
+                    "clubs": Club.objects.count(),
+                    "players": Player.objects.count(),
+                    "rounds": Round.objects.count(),
+                    "matches": Match.objects.count(),
+                    "goals": Goal.objects.count(),
+                    "cards": Card.objects.count(),
+                },
+            },
+            "cases": results,
+        }
+
+        path = Path(opts["output"]) if opts["output"] else (
+            Path(settings.BASE_DIR) / "var" / "bench"
+            / f"{timezone.now():%Y%m%d-%H%M%S}-{report['meta']['commit'] or 'nocommit'}.json"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.stdout.write(self.style.SUCCESS(f"✓ Résultats écrits dans {path}"))
+
+        if opts["compare"]:
+            self._compare(opts["compare"], report)
+
+    def _compare(self, other_path, report):
+        try:
+            other = json.loads(Path(other_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Comparaison impossible: {e}")
+        if other.get("meta", {}).get("dataset") != report["meta"]["dataset"]:
+            self.stdout.write(self.style.WARNING("  ! Jeux de données différents : comparaison indicative."))
+        self.stdout.write(f"→ Comparaison avec {other.get('meta', {}).get('commit') or other_path}")
+        for name, cur in report["cases"].items():
+            old = other.get("cases", {}).get(name)
+            if not old:
+                continue
+            ratio = cur["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+            line = (
+                f"  {name:<20} {old['median_ms']:>9.2f} → {cur['median_ms']:>9.2f} ms (x{ratio:.2f}) • "
+                f"requêtes {old['queries']} → {cur['queries']}"
+            )
+            style = self.style.SUCCESS if ratio <= 0.95 else self.style.ERROR if ratio >= 1.05 else (lambda s: s)
+            self.stdout.write(style(line))
@@ -0,0 +1,32 @@
+# matches/management/commands/seed_rounds.py
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matches.utils.round_seed import DEFAULT_TOTAL, forget_rounds_seeded, seed_rounds
+
+
+class Command(BaseCommand):
+    help = (
+        "Amorce les journées J1..J<total> (idempotent) : numérote les journées existantes "
+        "depuis leur nom et crée les manquantes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--total",
+            type=int,
+            default=DEFAULT_TOTAL,
+            help=f"Nombre de journées attendues (défaut: {DEFAULT_TOTAL}).",
+        )
+
+    def handle(self, *args, **opts):
+        total = opts["total"]
+        if total < 1:
+            raise CommandError("--total doit être >= 1.")
+        res = seed_rounds(total)
+        # Le prochain passage sur les pages admin revérifie (1 lecture) puis remet le marqueur
+        forget_rounds_seeded(total)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Journées numérotées: {res['numbered']} • créées: {res['created']}"
+        ))
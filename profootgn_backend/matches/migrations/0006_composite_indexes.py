@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_staffmember'),
+        ('matches', '0005_alter_round_options_round_number_alter_match_status'),
+        ('players', '0002_alter_player_position'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['match', 'minute', 'id'], name='card_match_minute_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['match', 'minute', 'id'], name='goal_match_minute_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['status', 'datetime'], name='match_status_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['home_club', 'datetime'], name='match_home_dt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['away_club', 'datetime'], name='match_away_dt_idx'),
+        ),
+    ]
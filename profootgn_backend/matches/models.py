@@ -3,6 +3,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from clubs.models import Club
 from players.models import Player
+from profootgn.signals import BulkSignalQuerySet
 
 # Statuts élargis pour correspondre à l'admin / front
 MATCH_STATUS = [
@@ -64,6 +65,8 @@ class Match(models.Model):
         help_text="Nom du buteur principal",
     )
 
+    objects = BulkSignalQuerySet.as_manager()
+
     class Meta:
         ordering = ['datetime']
         constraints = [
@@ -78,6 +81,12 @@ class Match(models.Model):
                 name='uniq_round_home_away_in_round',
             ),
         ]
+        # Index composites des chemins chauds (listes par statut triées par date, calendrier d'un club)
+        indexes = [
+            models.Index(fields=['status', 'datetime'], name='match_status_dt_idx'),
+            models.Index(fields=['home_club', 'datetime'], name='match_home_dt_idx'),
+            models.Index(fields=['away_club', 'datetime'], name='match_away_dt_idx'),
+        ]
 
     def clean(self):
         """
@@ -122,6 +131,12 @@ class Goal(models.Model):
     )
     assist_name = models.CharField(max_length=120, blank=True, default="")
 
+    objects = BulkSignalQuerySet.as_manager()
+
+    class Meta:
+        # by_match / préchargement : filter(match=...).order_by("minute", "id") sans tri temporaire
+        indexes = [models.Index(fields=['match', 'minute', 'id'], name='goal_match_minute_idx')]
+
     def __str__(self):
         return f"{self.player} {self.minute}'"
 
@@ -135,5 +150,10 @@ class Card(models.Model):
     minute = models.PositiveIntegerField()
     type = models.CharField(max_length=1, choices=CARD_TYPES)
 
+    objects = BulkSignalQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=['match', 'minute', 'id'], name='card_match_minute_idx')]
+
     def __str__(self):
         return f"{self.player} {self.get_type_display()} {self.minute}'"
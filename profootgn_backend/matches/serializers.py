@@ -206,3 +206,12 @@ class MatchSerializer(serializers.ModelSerializer):
         else:
             qs = Card.objects.filter(match=obj).select_related("player", "club").order_by("minute", "id")
         return CardSerializer(qs, many=True, context=self.context).data
+
+
+class MatchCalendarSerializer(MatchSerializer):
+    """Match sans buts ni cartons (listes de calendrier : une ligne = un match, sans requête par match)."""
+    goals = None
+    cards = None
+
+    class Meta(MatchSerializer.Meta):
+        fields = [f for f in MatchSerializer.Meta.fields if f not in ("goals", "cards")]
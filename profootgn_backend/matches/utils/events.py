@@ -3,8 +3,8 @@ from __future__ import annotations
 import re
 from django.db import transaction
 from clubs.models import Club
-from players.models import Player
 from matches.models import Match, Goal, Card
+from matches.utils.rosters import RosterIndex
 
 # Exemples acceptés :
 #   "Gaoussou Cisse 12'"
@@ -67,24 +67,26 @@ def _parse_cards_text(txt: str, club: Club) -> list[dict]:
         out.append({"club": club.id, "minute": minute, "player_name": name, "type": color})
     return out
 
-def _get_or_create_player_by_name(name: str, club: Club) -> Player | None:
-    name = (name or "").strip()
-    if not name:
-        return None
-    if hasattr(Player, "club"):
-        p = Player.objects.filter(name__iexact=name, club=club).first()
-        if p:
-            return p
-        p, _ = Player.objects.get_or_create(name=name, defaults={"club": club})
-        if getattr(p, "club_id", None) is None:
-            p.club = club
-            p.save(update_fields=["club"])
-        return p
-    # Modèle sans champ club
-    p, _ = Player.objects.get_or_create(name=name)
-    return p
+def _parse_all(match: Match, goals_home_txt, goals_away_txt, cards_home_txt, cards_away_txt):
+    """Parse les 4 zones texte -> (goals, cards), sans aucune requête."""
+    goals = (
+        _parse_goals_text(goals_home_txt or "", match.home_club)
+        + _parse_goals_text(goals_away_txt or "", match.away_club)
+    )
+    cards = (
+        _parse_cards_text(cards_home_txt or "", match.home_club)
+        + _parse_cards_text(cards_away_txt or "", match.away_club)
+    )
+    return goals, cards
+
+def _resolve_plan(roster: RosterIndex, items: list[dict]) -> list[dict]:
+    """Ajoute player_id / new_player à chaque item parsé (lecture seule sur l'index)."""
+    for it in items:
+        p = roster.find_name(it["club"], it["player_name"])
+        it["player_id"] = p.id if p else None
+        it["new_player"] = p is None and bool(it["player_name"])
+    return items
 
-@transaction.atomic
 def apply_events_from_text(
     match: Match,
     goals_home_txt: str | None,
@@ -93,32 +95,51 @@ def apply_events_from_text(
     cards_away_txt: str | None,
     *,
     replace: bool = False,
-):
-    """Crée/replace les buts & cartons à partir de 4 zones texte."""
-    if replace:
-        Goal.objects.filter(match=match).delete()
-        Card.objects.filter(match=match).delete()
+    dry_run: bool = False,
+) -> dict:
+    """
+    Crée/replace les buts & cartons à partir de 4 zones texte.
+    Les noms sont résolus en mémoire contre les effectifs domicile/extérieur (1 requête),
+    les joueurs inconnus créés en un INSERT groupé, puis un bulk_create par modèle,
+    le tout dans une seule transaction.
+    dry_run=True : renvoie le plan résolu sans rien écrire.
+    Retour: {"goals": [...], "cards": [...], "new_players": [...], "replace", "dry_run"}
+    """
+    goals, cards = _parse_all(match, goals_home_txt, goals_away_txt, cards_home_txt, cards_away_txt)
+    roster = RosterIndex([match.home_club_id, match.away_club_id])
+    _resolve_plan(roster, goals)
+    _resolve_plan(roster, cards)
 
-    # Buteurs home
-    for g in _parse_goals_text(goals_home_txt or "", match.home_club):
-        player = _get_or_create_player_by_name(g["player_name"], match.home_club)
-        Goal.objects.create(match=match, club=match.home_club, player=player, minute=g["minute"])
+    new_players = sorted(
+        {(it["club"], it["player_name"]) for it in goals + cards if it["new_player"]},
+        key=lambda x: (x[0], x[1].lower()),
+    )
+    plan = {
+        "goals": goals,
+        "cards": cards,
+        "new_players": [{"club": c, "name": n} for c, n in new_players],
+        "replace": replace,
+        "dry_run": dry_run,
+    }
+    if dry_run:
+        return plan
 
-    # Buteurs away
-    for g in _parse_goals_text(goals_away_txt or "", match.away_club):
-        player = _get_or_create_player_by_name(g["player_name"], match.away_club)
-        Goal.objects.create(match=match, club=match.away_club, player=player, minute=g["minute"])
+    with transaction.atomic():
+        if new_players:
+            roster.create_missing(new_players)
+            _resolve_plan(roster, goals)
+            _resolve_plan(roster, cards)
 
-    # Cartons home
-    for c in _parse_cards_text(cards_home_txt or "", match.home_club):
-        player = _get_or_create_player_by_name(c["player_name"], match.home_club)
-        Card.objects.create(
-            match=match, club=match.home_club, player=player, minute=c["minute"], type=c["type"]
-        )
+        if replace:
+            Goal.objects.filter(match=match).delete()
+            Card.objects.filter(match=match).delete()
 
-    # Cartons away
-    for c in _parse_cards_text(cards_away_txt or "", match.away_club):
-        player = _get_or_create_player_by_name(c["player_name"], match.away_club)
-        Card.objects.create(
-            match=match, club=match.away_club, player=player, minute=c["minute"], type=c["type"]
-        )
+        Goal.objects.bulk_create([
+            Goal(match=match, club_id=g["club"], player_id=g["player_id"], minute=g["minute"])
+            for g in goals
+        ])
+        Card.objects.bulk_create([
+            Card(match=match, club_id=c["club"], player_id=c["player_id"], minute=c["minute"], type=c["type"])
+            for c in cards
+        ])
+    return plan
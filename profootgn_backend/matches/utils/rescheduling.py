@@ -0,0 +1,239 @@
+# matches/utils/rescheduling.py
+"""
+Recherche de nouvelles dates pour les matchs reportés / suspendus.
+
+Une seule requête charge les matchs des clubs (et du stade) concernés sur la fenêtre de
+recherche ; ensuite tout se fait en mémoire sur des listes triées (bisect) :
+    - repos minimal (rest_days) avant ET après chaque match des deux clubs ;
+    - stade libre (aucun autre match au même stade à moins de venue_gap_hours).
+Mode groupé : tous les matchs reportés d'une journée, chaque créneau retenu étant
+réinjecté dans l'index pour que les suivants en tiennent compte.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, time as time_cls, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from matches.models import Match
+
+RESCHEDULABLE = ("POSTPONED", "SUSPENDED")
+DEFAULT_TIMES = (time_cls(16, 0),)
+
+
+def parse_times(spec) -> tuple[time_cls, ...]:
+    """ "16:00,18:30" -> (16:00, 18:30) ; vide -> DEFAULT_TIMES. Lève ValueError si invalide."""
+    out = []
+    for raw in str(spec or "").split(","):
+        raw = raw.strip()
+        if raw:
+            h, m = raw.split(":")
+            out.append(time_cls(int(h), int(m)))
+    return tuple(sorted(set(out))) or DEFAULT_TIMES
+
+
+def _venue_key(name) -> str:
+    return " ".join(str(name or "").split()).casefold()
+
+
+def match_venue(m: Match) -> str:
+    """Stade du match : champ venue, sinon stade du club recevant."""
+    return m.venue or getattr(m.home_club, "stadium", "") or ""
+
+
+class CalendarIndex:
+    """Calendrier par club et par stade : listes triées de (datetime, match_id)."""
+
+    def __init__(self):
+        self.clubs = defaultdict(list)
+        self.venues = defaultdict(list)
+
+    @classmethod
+    def load(cls, club_ids, venues, start, end):
+        """Une requête : matchs de ces clubs OU dans ces stades entre start et end."""
+        idx = cls()
+        venues = {v for v in venues if v}
+        cond = Q(home_club_id__in=club_ids) | Q(away_club_id__in=club_ids)
+        for v in venues:
+            cond |= Q(venue__iexact=v) | Q(venue="", home_club__stadium__iexact=v)
+        rows = (
+            Match.objects
+            .filter(cond, datetime__gte=start, datetime__lte=end)
+            .exclude(status__in=("CANCELED",) + RESCHEDULABLE)
+            .values_list("id", "datetime", "home_club_id", "away_club_id", "venue", "home_club__stadium")
+        )
+        for mid, dt, h, a, venue, stadium in rows:
+            idx.add(mid, dt, h, a, venue or stadium)
+        return idx
+
+    def add(self, mid, dt, home_id, away_id, venue):
+        insort(self.clubs[home_id], (dt, mid))
+        insort(self.clubs[away_id], (dt, mid))
+        if _venue_key(venue):
+            insort(self.venues[_venue_key(venue)], (dt, mid))
+
+    @staticmethod
+    def neighbours(entries, dt, exclude_id=None):
+        """(précédent, suivant) autour de dt, en ignorant exclude_id."""
+        i = bisect_left(entries, (dt, -1))
+        prev = nxt = None
+        j = i - 1
+        while j >= 0 and entries[j][1] == exclude_id:
+            j -= 1
+        if j >= 0:
+            prev = entries[j][0]
+        j = i
+        while j < len(entries) and entries[j][1] == exclude_id:
+            j += 1
+        if j < len(entries):
+            nxt = entries[j][0]
+        return prev, nxt
+
+
+def _candidates(start, days, times):
+    tz = timezone.get_current_timezone()
+    d0 = timezone.localtime(start).date() if timezone.is_aware(start) else start.date()
+    for i in range(days + 1):
+        for t in times:
+            dt = timezone.make_aware(datetime.combine(d0 + timedelta(days=i), t), tz)
+            if dt > start:
+                yield dt
+
+
+def _evaluate(idx, m, dt, venue, rest, venue_gap):
+    """None si le créneau est interdit, sinon le détail du repos de chaque club."""
+    out = {}
+    for side, cid in (("home", m.home_club_id), ("away", m.away_club_id)):
+        prev, nxt = idx.neighbours(idx.clubs.get(cid, []), dt, exclude_id=m.id)
+        if prev and dt - prev < rest:
+            return None
+        if nxt and nxt - dt < rest:
+            return None
+        out[f"{side}_rest_before"] = round((dt - prev).total_seconds() / 86400, 1) if prev else None
+        out[f"{side}_rest_after"] = round((nxt - dt).total_seconds() / 86400, 1) if nxt else None
+    v = _venue_key(venue)
+    if v:
+        prev, nxt = idx.neighbours(idx.venues.get(v, []), dt, exclude_id=m.id)
+        if (prev and dt - prev < venue_gap) or (nxt and nxt - dt < venue_gap):
+            return None
+    return out
+
+
+def _rank(candidates, dt0, rest_days, comfort):
+    """
+    Score (plus bas = meilleur) : jours de retard + pénalité si le repos le plus court
+    est sous le "confort" (rest_days + comfort jours).
+    """
+    for c in candidates:
+        rests = [c[k] for k in ("home_rest_before", "home_rest_after", "away_rest_before", "away_rest_after")
+                 if c[k] is not None]
+        shortest = min(rests) if rests else None
+        delay = (c["datetime"] - dt0).total_seconds() / 86400
+        penalty = max(0.0, rest_days + comfort - shortest) if shortest is not None else 0.0
+        c["shortest_rest"] = shortest
+        c["score"] = round(delay + 2 * penalty, 2)
+    candidates.sort(key=lambda c: (c["score"], c["datetime"]))
+    return candidates
+
+
+def find_slots(
+    match: Match,
+    *,
+    start=None,
+    horizon_days: int = 28,
+    rest_days: int = 3,
+    venue_gap_hours: int = 3,
+    times=DEFAULT_TIMES,
+    limit: int = 10,
+    index: CalendarIndex | None = None,
+) -> list[dict]:
+    """
+    Créneaux libres classés pour `match` :
+      [{"datetime", "score", "shortest_rest", "home_rest_before", "home_rest_after",
+        "away_rest_before", "away_rest_after"}]
+    start : début de la recherche (défaut : maintenant, ou la date initiale si elle est future).
+    """
+    now = timezone.now()
+    start = start or max(now, match.datetime)
+    rest = timedelta(days=rest_days)
+    venue_gap = timedelta(hours=venue_gap_hours)
+    venue = match_venue(match)
+
+    if index is None:
+        index = CalendarIndex.load(
+            [match.home_club_id, match.away_club_id], [venue],
+            start - rest - venue_gap, start + timedelta(days=horizon_days + 1) + rest + venue_gap,
+        )
+
+    found = []
+    for dt in _candidates(start, horizon_days, times):
+        info = _evaluate(index, match, dt, venue, rest, venue_gap)
+        if info is not None:
+            info["datetime"] = dt
+            found.append(info)
+    return _rank(found, start, rest_days, comfort=2)[:limit]
+
+
+def reschedule_round(
+    round_obj,
+    *,
+    start=None,
+    horizon_days: int = 28,
+    rest_days: int = 3,
+    venue_gap_hours: int = 3,
+    times=DEFAULT_TIMES,
+    apply: bool = False,
+) -> list[dict]:
+    """
+    Propose (et applique si apply=True) une nouvelle date pour chaque match reporté/suspendu
+    de la journée. Un seul chargement du calendrier pour toute la journée.
+    Retour : [{"match_id", "label", "old", "new" (datetime|None), "score"}]
+    """
+    matches = list(
+        Match.objects
+        .filter(round=round_obj, status__in=RESCHEDULABLE)
+        .select_related("home_club", "away_club")
+        .order_by("datetime", "id")
+    )
+    if not matches:
+        return []
+
+    now = timezone.now()
+    starts = {m.id: start or max(now, m.datetime) for m in matches}
+    rest = timedelta(days=rest_days)
+    venue_gap = timedelta(hours=venue_gap_hours)
+    lo = min(starts.values()) - rest - venue_gap
+    hi = max(starts.values()) + timedelta(days=horizon_days + 1) + rest + venue_gap
+    index = CalendarIndex.load(
+        {c for m in matches for c in (m.home_club_id, m.away_club_id)},
+        {match_venue(m) for m in matches},
+        lo, hi,
+    )
+
+    plan, changed = [], []
+    for m in matches:
+        best = find_slots(
+            m, start=starts[m.id], horizon_days=horizon_days, rest_days=rest_days,
+            venue_gap_hours=venue_gap_hours, times=times, limit=1, index=index,
+        )
+        new = best[0]["datetime"] if best else None
+        plan.append({
+            "match_id": m.id,
+            "label": f"{m.home_club.name} - {m.away_club.name}",
+            "old": m.datetime,
+            "new": new,
+            "score": best[0]["score"] if best else None,
+        })
+        if new:
+            index.add(m.id, new, m.home_club_id, m.away_club_id, match_venue(m))
+            m.datetime, m.status, m.minute = new, "SCHEDULED", 0
+            changed.append(m)
+
+    if apply and changed:
+        with transaction.atomic():
+            Match.objects.bulk_update(changed, ["datetime", "status", "minute"])
+    return plan
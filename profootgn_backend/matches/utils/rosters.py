@@ -0,0 +1,100 @@
+# matches/utils/rosters.py
+from __future__ import annotations
+
+from django.db.models import Q
+
+from players.models import Player
+from profootgn.text import fold_name
+
+
+def norm_name(value) -> str:
+    """'  Gaoussou   CISSÉ ' -> 'gaoussou cisse' (même normalisation que Player.name_norm)."""
+    return fold_name(value)
+
+
+def split_name(value) -> tuple[str, str]:
+    """'Gaoussou Cisse' -> ('Gaoussou', 'Cisse') ; 'Camara' -> ('Camara', '')."""
+    parts = str(value or "").split()
+    if not parts:
+        return "", ""
+    return parts[0], " ".join(parts[1:])
+
+
+class RosterIndex:
+    """
+    Index mémoire des effectifs d'un match (une seule requête pour tous les clubs).
+    Résolution par ID, numéro de maillot ou nom (prénom+nom, nom+prénom, nom seul, prénom seul).
+    Priorité au nom complet ; pour un nom partiel, le premier joueur (ordre last_name, first_name) gagne,
+    comme le faisait `.first()` sur un queryset.
+    """
+
+    def __init__(self, club_ids):
+        self.club_ids = {int(c) for c in club_ids if c}
+        self.by_id: dict[int, Player] = {}
+        self._full: dict[tuple[int, str], Player] = {}
+        self._partial: dict[tuple[int, str], Player] = {}
+        self._number: dict[tuple[int, int], Player] = {}
+        qs = Player.objects.filter(club_id__in=self.club_ids).order_by("last_name", "first_name", "id")
+        for p in qs:
+            self.add(p)
+
+    def add(self, p: Player):
+        self.by_id[p.id] = p
+        cid = p.club_id
+        first, last = norm_name(p.first_name), norm_name(p.last_name)
+        if first and last:
+            self._full.setdefault((cid, f"{first} {last}"), p)
+            self._full.setdefault((cid, f"{last} {first}"), p)
+        for part in (last, first):
+            if part:
+                self._partial.setdefault((cid, part), p)
+        if p.number:
+            self._number.setdefault((cid, int(p.number)), p)
+
+    def find_name(self, club_id, name) -> Player | None:
+        key = (int(club_id), norm_name(name))
+        if not key[1]:
+            return None
+        return self._full.get(key) or self._partial.get(key)
+
+    def find_number(self, club_id, number) -> Player | None:
+        try:
+            return self._number.get((int(club_id), int(number)))
+        except (TypeError, ValueError):
+            return None
+
+    def fetch_ids(self, ids):
+        """Charge en une requête les IDs explicites absents de l'index (joueurs d'un autre club, sans club…)."""
+        missing = {int(i) for i in ids if i and int(i) not in self.by_id}
+        if missing:
+            for p in Player.objects.filter(pk__in=missing):
+                self.by_id[p.id] = p
+
+    def create_missing(self, wanted) -> list[Player]:
+        """
+        wanted: itérable de (club_id, name). Crée en un bulk_create les joueurs introuvables
+        et les ajoute à l'index. Renvoie les joueurs créés.
+        """
+        todo = {}
+        for club_id, name in wanted:
+            if not norm_name(name) or self.find_name(club_id, name):
+                continue
+            todo.setdefault((int(club_id), norm_name(name)), split_name(name))
+        if not todo:
+            return []
+
+        objs = [Player(club_id=cid, first_name=first, last_name=last) for (cid, _), (first, last) in todo.items()]
+        created = Player.objects.bulk_create(objs)
+
+        # MySQL ne renvoie pas les PK d'un INSERT groupé : on relit les lignes créées.
+        if any(p.pk is None for p in created):
+            cond = Q()
+            for p in objs:
+                cond |= Q(club_id=p.club_id, first_name=p.first_name, last_name=p.last_name)
+            created = list(Player.objects.filter(cond).order_by("-id"))
+
+        for p in created:
+            key = (p.club_id, norm_name(f"{p.first_name} {p.last_name}"))
+            if key in todo and not self._full.get(key) and not self._partial.get(key):
+                self.add(p)
+        return created
@@ -0,0 +1,300 @@
+# matches/utils/round_import.py
+"""
+Import des résultats d'une journée complète (CSV / JSON Lines / JSON).
+
+Une ligne = un match de la journée :
+    match        (optionnel) ID du match ; sinon home + away
+    home, away   ID ou nom du club
+    home_score, away_score, status, minute   (colonne vide = valeur inchangée)
+    goals_home, goals_away, cards_home, cards_away
+                 même syntaxe que la saisie texte ("Cisse 12; Bah 45+2", "Diallo 17 Y").
+                 Si au moins une de ces 4 colonnes est remplie, les buts ET cartons du match
+                 sont remplacés par ceux du fichier.
+
+Le fichier est lu en flux (CSV / JSONL ligne par ligne), validé contre les clubs, matchs
+et effectifs préchargés, puis appliqué en une transaction (bulk_update + bulk_create).
+Tout ou rien : une seule erreur et rien n'est écrit.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import re
+
+from django.db import transaction
+from django.db.models import Count
+
+from clubs.models import Club
+from matches.models import Match, Goal, Card, Round, MATCH_STATUS
+from matches.utils.events import _parse_goals_text, _parse_cards_text
+from matches.utils.rosters import RosterIndex, norm_name
+
+FORMATS = ("csv", "jsonl", "json")
+EVENT_COLUMNS = ("goals_home", "goals_away", "cards_home", "cards_away")
+MATCH_FIELDS = ("home_score", "away_score", "status", "minute")
+
+STATUS_CODES = {code for code, _ in MATCH_STATUS}
+STATUS_ALIASES = {
+    "POST": "POSTPONED", "POSTPONE": "POSTPONED",
+    "CAN": "CANCELED", "CANCELLED": "CANCELED",
+    "NOT_STARTED": "SCHEDULED",
+}
+
+
+def guess_format(filename: str, default: str = "csv") -> str:
+    ext = str(filename or "").rsplit(".", 1)[-1].lower()
+    if ext in {"jsonl", "ndjson"}:
+        return "jsonl"
+    if ext in FORMATS:
+        return ext
+    return default
+
+
+def iter_records(stream, fmt: str):
+    """
+    Itère (n° de ligne, dict) sans charger le fichier entier (CSV, JSONL).
+    Le JSON "classique" (liste, ou {"matches": [...]}) est chargé d'un bloc.
+    `stream` : fichier binaire (upload Django, open(..., "rb")) ou texte.
+    """
+    text = stream
+    if not isinstance(stream, io.TextIOBase):
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {(k or "").strip(): v for k, v in row.items()}
+    elif fmt == "jsonl":
+        for i, line in enumerate(text, start=1):
+            if line.strip():
+                yield i, json.loads(line)
+    elif fmt == "json":
+        data = json.load(text)
+        if isinstance(data, dict):
+            data = data.get("matches", [])
+        for i, row in enumerate(data, start=1):
+            yield i, row
+    else:
+        raise ValueError(f"Format inconnu: {fmt}")
+
+
+def resolve_round(value) -> Round | None:
+    """'J5', 'Journée 5', '5' -> Round.number=5 ; 'id:12' -> pk ; sinon nom exact (insensible à la casse)."""
+    s = str(value or "").strip()
+    if not s:
+        return None
+    if s.lower().startswith("id:"):
+        return Round.objects.filter(pk=s[3:].strip() or None).first()
+    m = re.fullmatch(r"(?:j(?:ourn[ée]e)?)?\s*(\d{1,3})", s.lower())
+    if m:
+        return Round.objects.filter(number=int(m.group(1))).first()
+    return Round.objects.filter(name__iexact=s).first()
+
+
+def _cell(row: dict, key: str) -> str:
+    v = row.get(key)
+    return "" if v is None else str(v).strip()
+
+
+def _status(raw: str) -> str | None:
+    s = raw.upper().replace(" ", "_")
+    s = STATUS_ALIASES.get(s, s)
+    return s if s in STATUS_CODES else None
+
+
+def _uint(raw: str) -> int | None:
+    return int(raw) if raw.isdigit() else None
+
+
+class _ClubLookup:
+    """Tous les clubs en une requête ; recherche par ID, nom ou nom court."""
+
+    def __init__(self):
+        self.by_id, self.by_name = {}, {}
+        for c in Club.objects.only("id", "name", "short_name"):
+            self.by_id[c.id] = c
+            self.by_name.setdefault(norm_name(c.name), c)
+            if c.short_name:
+                self.by_name.setdefault(norm_name(c.short_name), c)
+
+    def get(self, value):
+        s = str(value or "").strip()
+        if s.isdigit():
+            return self.by_id.get(int(s))
+        return self.by_name.get(norm_name(s))
+
+
+def import_round(stream, *, fmt: str = "csv", round_ref=None, dry_run: bool = False) -> dict:
+    """
+    Valide puis applique (sauf dry_run) le fichier d'une journée.
+    Retour (rapport/diff) :
+      {round, dry_run, applied, errors:[{line, error}], warnings:[...],
+       changes:[{match_id, label, fields:{f:[old,new]}, goals:[old,new]|None, cards:[old,new]|None}],
+       new_players:[{club, name}], summary:{...}}
+    """
+    report = {
+        "round": None, "dry_run": dry_run, "applied": False,
+        "errors": [], "warnings": [], "changes": [], "new_players": [],
+        "summary": {"lines": 0, "matches_updated": 0, "goals": 0, "cards": 0, "players_created": 0},
+    }
+    errors = report["errors"]
+
+    rnd = resolve_round(round_ref) if round_ref else None
+    clubs = _ClubLookup()
+
+    matches_by_id, matches_by_pair = {}, {}
+    if rnd is not None:
+        _load_round_matches(rnd, matches_by_id, matches_by_pair)
+        report["round"] = str(rnd)
+
+    touched = {}       # match_id -> {"match", "fields", "goals", "cards"}
+    try:
+        for line, row in iter_records(stream, fmt):
+            report["summary"]["lines"] += 1
+            if not isinstance(row, dict):
+                errors.append({"line": line, "error": "Ligne invalide (objet attendu)."})
+                continue
+
+            if rnd is None:
+                rnd = resolve_round(_cell(row, "round"))
+                if rnd is None:
+                    errors.append({"line": line, "error": "Journée introuvable (option round ou colonne 'round')."})
+                    break
+                _load_round_matches(rnd, matches_by_id, matches_by_pair)
+                report["round"] = str(rnd)
+
+            match, err = _find_match(row, clubs, matches_by_id, matches_by_pair)
+            if err:
+                errors.append({"line": line, "error": err})
+                continue
+            if match.id in touched:
+                errors.append({"line": line, "error": f"Match {match} présent plusieurs fois."})
+                continue
+
+            fields = {}
+            for f in MATCH_FIELDS:
+                raw = _cell(row, f)
+                if not raw:
+                    continue
+                val = _status(raw) if f == "status" else _uint(raw)
+                if val is None:
+                    errors.append({"line": line, "error": f"Valeur invalide pour {f}: {raw!r}."})
+                    continue
+                if getattr(match, f) != val:
+                    fields[f] = val
+
+            entry = {"match": match, "fields": fields, "goals": None, "cards": None}
+            if any(_cell(row, c) for c in EVENT_COLUMNS):
+                entry["goals"] = (
+                    _parse_goals_text(_cell(row, "goals_home"), match.home_club)
+                    + _parse_goals_text(_cell(row, "goals_away"), match.away_club)
+                )
+                entry["cards"] = (
+                    _parse_cards_text(_cell(row, "cards_home"), match.home_club)
+                    + _parse_cards_text(_cell(row, "cards_away"), match.away_club)
+                )
+            touched[match.id] = entry
+    except (ValueError, csv.Error, UnicodeDecodeError) as e:
+        errors.append({"line": None, "error": f"Fichier illisible: {e}"})
+
+    if errors:
+        return report
+
+    # Résolution des joueurs : un seul chargement des effectifs concernés
+    with_events = [e for e in touched.values() if e["goals"] is not None]
+    roster = RosterIndex({c for e in with_events for c in (e["match"].home_club_id, e["match"].away_club_id)})
+    wanted = set()
+    for e in with_events:
+        for it in e["goals"] + e["cards"]:
+            if it["player_name"] and not roster.find_name(it["club"], it["player_name"]):
+                wanted.add((it["club"], it["player_name"]))
+    report["new_players"] = [{"club": c, "name": n} for c, n in sorted(wanted, key=lambda x: (x[0], x[1].lower()))]
+
+    for e in touched.values():
+        m = e["match"]
+        change = {
+            "match_id": m.id,
+            "label": f"{m.home_club.name} - {m.away_club.name}",
+            "fields": {f: [getattr(m, f), v] for f, v in e["fields"].items()},
+            "goals": None, "cards": None,
+        }
+        if e["goals"] is not None:
+            change["goals"] = [m.goal_count, len(e["goals"])]
+            change["cards"] = [m.card_count, len(e["cards"])]
+            home = sum(1 for g in e["goals"] if g["club"] == m.home_club_id)
+            hs = e["fields"].get("home_score", m.home_score)
+            as_ = e["fields"].get("away_score", m.away_score)
+            if (home, len(e["goals"]) - home) != (hs, as_):
+                report["warnings"].append(
+                    f"{change['label']} : {home}-{len(e['goals']) - home} but(s) saisis pour un score {hs}-{as_}."
+                )
+        if change["fields"] or change["goals"] is not None:
+            report["changes"].append(change)
+
+    if dry_run:
+        return report
+
+    with transaction.atomic():
+        created = roster.create_missing(wanted)
+
+        to_update = []
+        for e in touched.values():
+            if e["fields"]:
+                for f, v in e["fields"].items():
+                    setattr(e["match"], f, v)
+                to_update.append(e["match"])
+        if to_update:
+            Match.objects.bulk_update(to_update, list(MATCH_FIELDS))
+
+        ids = [e["match"].id for e in with_events]
+        goals, cards = [], []
+        if ids:
+            Goal.objects.filter(match_id__in=ids).delete()
+            Card.objects.filter(match_id__in=ids).delete()
+            for e in with_events:
+                for g in e["goals"]:
+                    p = roster.find_name(g["club"], g["player_name"])
+                    goals.append(Goal(match=e["match"], club_id=g["club"], player=p, minute=g["minute"]))
+                for c in e["cards"]:
+                    p = roster.find_name(c["club"], c["player_name"])
+                    cards.append(Card(match=e["match"], club_id=c["club"], player=p, minute=c["minute"], type=c["type"]))
+            Goal.objects.bulk_create(goals)
+            Card.objects.bulk_create(cards)
+
+    report["applied"] = True
+    report["summary"].update({
+        "matches_updated": len(to_update),
+        "goals": len(goals),
+        "cards": len(cards),
+        "players_created": len(created),
+    })
+    return report
+
+
+def _load_round_matches(rnd: Round, by_id: dict, by_pair: dict):
+    qs = (
+        Match.objects
+        .filter(round=rnd)
+        .select_related("home_club", "away_club")
+        .annotate(goal_count=Count("goals", distinct=True), card_count=Count("cards", distinct=True))
+    )
+    for m in qs:
+        by_id[m.id] = m
+        by_pair[(m.home_club_id, m.away_club_id)] = m
+
+
+def _find_match(row, clubs: _ClubLookup, by_id: dict, by_pair: dict):
+    mid = _cell(row, "match") or _cell(row, "match_id") or _cell(row, "id")
+    if mid:
+        m = by_id.get(int(mid)) if mid.isdigit() else None
+        return (m, None) if m else (None, f"Match {mid} absent de la journée.")
+
+    home, away = clubs.get(_cell(row, "home")), clubs.get(_cell(row, "away"))
+    if not home or not away:
+        missing = _cell(row, "home") if not home else _cell(row, "away")
+        return None, f"Club introuvable: {missing!r}."
+    m = by_pair.get((home.id, away.id))
+    if not m:
+        return None, f"Aucun match {home.name} - {away.name} dans la journée."
+    return m, None
@@ -0,0 +1,94 @@
+# matches/utils/round_seed.py
+"""
+Amorçage des journées J1..J<total> (pages admin rapides, commande `seed_rounds`).
+
+Le travail réel (numéroter les journées existantes, créer les manquantes) se fait en
+2 lectures + 2 écritures groupées au plus. Les pages admin passent par `ensure_rounds_seeded`,
+protégé par un marqueur en cache : une fois la base amorcée, aucune requête.
+"""
+from __future__ import annotations
+
+import re
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from matches.models import Round
+from profootgn.metrics import record_cache
+
+DEFAULT_TOTAL = 26
+SEEDED_TTL = 60 * 60  # 1h : rattrape une suppression manuelle des journées
+
+
+def _marker_key(total: int) -> str:
+    return f"matches:rounds-seeded:{total}"
+
+
+def infer_round_number(name: str):
+    """'Journée 5', 'J5', 'Round 5' -> 5 ; None si aucun numéro."""
+    s = str(name or "").lower()
+    m = re.search(r"j(?:ourn[ée]e)?\s*(\d{1,3})", s) or re.search(r"\b(\d{1,3})\b", s)
+    return int(m.group(1)) if m else None
+
+
+def seed_rounds(total: int = DEFAULT_TOTAL, round_model=None) -> dict:
+    """
+    Idempotent :
+      - complète `number` des journées qui n'en ont pas (depuis le nom, sans doublon) ;
+      - crée J1..J<total> manquants.
+    `round_model` permet l'appel depuis une migration (modèle historique).
+    Retour : {"numbered": n, "created": n}
+    """
+    model = round_model or Round
+    rows = list(model.objects.only("id", "name", "number"))
+    taken = {r.number for r in rows if r.number}
+
+    numbered = []
+    for r in rows:
+        if r.number:
+            continue
+        n = infer_round_number(r.name)
+        if n and n not in taken:
+            r.number = n
+            taken.add(n)
+            numbered.append(r)
+
+    missing = [model(number=n, name=f"J{n}") for n in range(1, total + 1) if n not in taken]
+
+    with transaction.atomic():
+        if numbered:
+            model.objects.bulk_update(numbered, ["number"])
+        if missing:
+            # ignore_conflicts : une autre requête a pu créer la même journée entre-temps
+            model.objects.bulk_create(missing, ignore_conflicts=True)
+    return {"numbered": len(numbered), "created": len(missing)}
+
+
+def ensure_rounds_seeded(total: int = DEFAULT_TOTAL) -> bool:
+    """
+    Garde bon marché pour les vues : 0 requête si le marqueur est en cache, sinon
+    1 lecture (agrégat) et l'amorçage seulement si la base est incomplète.
+    Renvoie True si un amorçage a été lancé.
+    """
+    key = _marker_key(total)
+    hit = bool(cache.get(key))
+    record_cache("rounds_seeded", hit)
+    if hit:
+        return False
+
+    agg = Round.objects.aggregate(
+        in_range=Count("id", filter=Q(number__gte=1, number__lte=total)),
+        unnumbered=Count("id", filter=Q(number__isnull=True)),
+    )
+    seeded = False
+    if agg["in_range"] < total or agg["unnumbered"]:
+        seed_rounds(total)
+        seeded = True
+    cache.set(key, 1, SEEDED_TTL)
+    return seeded
+
+
+def forget_rounds_seeded(total: int = DEFAULT_TOTAL):
+    """À appeler après une suppression massive des journées."""
+    cache.delete(_marker_key(total))
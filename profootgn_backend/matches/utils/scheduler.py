@@ -0,0 +1,294 @@
+# matches/utils/scheduler.py
+"""
+Moteur de calendrier (utilisé par `generate_fixtures`).
+
+Travaille uniquement en mémoire sur des IDs de clubs et des noms de stade (aucune requête) :
+  - round-robin "canonique" (de Werra) : domicile/extérieur alternés, nombre minimal de
+    "breaks" (deux matchs de suite au même endroit) ; retour selon le schéma "anglais" ;
+  - clubs partageant un stade placés sur des positions aux profils domicile/extérieur complémentaires ;
+  - chaque journée répartie sur des créneaux configurables (jour relatif + heure), en
+    équilibrant les créneaux de chaque club et sans deux matchs dans le même stade au même créneau ;
+  - journées tombant sur une date interdite décalées d'un intervalle complet (même jour de semaine).
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import defaultdict
+from datetime import date as date_cls, datetime, time as time_cls, timedelta
+
+
+# ======================================
+# Options (créneaux, dates interdites)
+# ======================================
+
+def parse_slots(spec: str) -> list[tuple[int, time_cls]]:
+    """
+    "16:00,18:30,+1 16:00" -> [(0, 16:00), (0, 18:30), (1, 16:00)]
+    "+N HH:MM" = N jours après la date de la journée.
+    """
+    slots = []
+    for raw in str(spec or "").split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        m = re.fullmatch(r"(?:\+(\d+)\s+)?(\d{1,2}):(\d{2})", raw)
+        if not m:
+            raise ValueError(f"Créneau invalide: {raw!r} (attendu HH:MM ou +N HH:MM).")
+        slots.append((int(m.group(1) or 0), time_cls(int(m.group(2)), int(m.group(3)))))
+    if not slots:
+        raise ValueError("Au moins un créneau est requis.")
+    return sorted(set(slots))
+
+
+def parse_blackouts(spec: str) -> set[date_cls]:
+    """ "2025-12-25,2026-01-01..2026-01-07" -> ensemble de dates interdites. """
+    out = set()
+    for raw in str(spec or "").split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        if ".." in raw:
+            a, b = (date_cls.fromisoformat(x.strip()) for x in raw.split("..", 1))
+            while a <= b:
+                out.add(a)
+                a += timedelta(days=1)
+        else:
+            out.add(date_cls.fromisoformat(raw))
+    return out
+
+
+def _stadium_key(name) -> str:
+    return " ".join(str(name or "").split()).casefold()
+
+
+# ======================================
+# Round-robin équilibré
+# ======================================
+
+def canonical_rounds(n: int) -> list[list[tuple[int, int]]]:
+    """
+    Schéma canonique pour n positions (n pair) : n-1 journées de (domicile, extérieur).
+    Journée r : la position n-1 affronte r (domicile une journée sur deux) ;
+    les autres paires sont (r+k, r-k) mod n-1, le domicile alternant avec k.
+    Nombre de breaks minimal (n-2) sur la phase aller.
+    """
+    m = n - 1
+    rounds = []
+    for r in range(m):
+        pairs = [(m, r) if r % 2 == 0 else (r, m)]
+        for k in range(1, n // 2):
+            a, b = (r + k) % m, (r - k) % m
+            pairs.append((a, b) if k % 2 == 1 else (b, a))
+        rounds.append(pairs)
+    return rounds
+
+
+def _home_masks(rounds, n: int) -> list[int]:
+    """Profil domicile de chaque position sous forme de bitmask (bit r = domicile en journée r)."""
+    masks = [0] * n
+    for r, pairs in enumerate(rounds):
+        for h, _ in pairs:
+            masks[h] |= 1 << r
+    return masks
+
+
+def assign_positions(club_ids, stadiums: dict, rounds, n: int) -> list:
+    """
+    Affecte les clubs aux positions du schéma. Les clubs d'un même stade reçoivent des
+    positions dont les profils domicile se recouvrent le moins possible (idéalement jamais).
+    Renvoie la liste position -> club_id (None = exempt).
+    """
+    masks = _home_masks(rounds, n)
+    free = list(range(n))
+    slots = [None] * n
+
+    groups = defaultdict(list)
+    for cid in club_ids:
+        key = _stadium_key(stadiums.get(cid))
+        if key:
+            groups[key].append(cid)
+    shared = sorted((g for g in groups.values() if len(g) > 1), key=len, reverse=True)
+    placed = set()
+
+    for group in shared:
+        chosen = []
+        for cid in group:
+            if not chosen:
+                pos = free[0]
+            else:
+                used = 0
+                for p in chosen:
+                    used |= masks[p]
+                pos = min(free, key=lambda p: (bin(masks[p] & used).count("1"), p))
+            chosen.append(pos)
+            free.remove(pos)
+            slots[pos] = cid
+            placed.add(cid)
+
+    rest = iter(c for c in club_ids if c not in placed)
+    for pos in free:
+        slots[pos] = next(rest, None)
+    return slots
+
+
+def balanced_round_robin(club_ids, stadiums: dict | None = None) -> list[list[tuple]]:
+    """Journées de (home_id, away_id) ; les exempts (nombre impair de clubs) sont retirés."""
+    club_ids = list(club_ids)
+    n = len(club_ids) + (len(club_ids) % 2)
+    rounds = canonical_rounds(n)
+    pos = assign_positions(club_ids, stadiums or {}, rounds, n)
+    return [
+        [(pos[h], pos[a]) for h, a in pairs if pos[h] is not None and pos[a] is not None]
+        for pairs in rounds
+    ]
+
+
+# ======================================
+# Dates & créneaux
+# ======================================
+
+def _next_free_date(d: date_cls, offsets, blackouts, spacing: int) -> date_cls:
+    step = timedelta(days=max(1, spacing))
+    for _ in range(520):
+        if not any(d + timedelta(days=o) in blackouts for o in offsets):
+            return d
+        d += step
+    raise ValueError("Impossible de trouver une date hors période interdite.")
+
+
+def _assign_slots(pairs, slots, stadiums, usage):
+    """
+    Répartit les matchs d'une journée sur les créneaux :
+      - contrainte dure : un stade ne reçoit qu'un match par créneau (si possible) ;
+      - capacité : ceil(matchs / créneaux) par créneau ;
+      - préférence : le créneau que les deux clubs ont le moins eu jusqu'ici.
+    Renvoie [(home, away, slot_index, clash:bool)].
+    """
+    cap = math.ceil(len(pairs) / len(slots)) if pairs else 0
+    load = [0] * len(slots)
+    venues = [set() for _ in slots]
+
+    def venue(h):
+        return _stadium_key(stadiums.get(h))
+
+    # Les stades partagés d'abord : ce sont eux qui ont le moins de choix
+    counts = defaultdict(int)
+    for h, _ in pairs:
+        if venue(h):
+            counts[venue(h)] += 1
+    ordered = sorted(pairs, key=lambda p: -counts.get(venue(p[0]), 0))
+
+    out = []
+    for h, a in ordered:
+        v = venue(h)
+        best, best_key = None, None
+        for i in range(len(slots)):
+            clash = bool(v) and v in venues[i]
+            key = (clash, load[i] >= cap, usage[h][i] + usage[a][i], load[i], i)
+            if best_key is None or key < best_key:
+                best, best_key = i, key
+        load[best] += 1
+        if v:
+            venues[best].add(v)
+        usage[h][best] += 1
+        usage[a][best] += 1
+        out.append((h, a, best, best_key[0]))
+    return out
+
+
+def schedule_season(
+    clubs,
+    *,
+    start_date: date_cls,
+    slots,
+    spacing: int = 7,
+    double: bool = False,
+    blackouts=(),
+    make_datetime=None,
+) -> list[dict]:
+    """
+    clubs : [(club_id, stadium), ...] (ordre = ordre de placement).
+    Retourne une liste de journées :
+      {"index", "date", "matches": [{"home", "away", "datetime", "venue", "slot", "clash"}]}
+    make_datetime(datetime naïf) -> datetime (ex. rendre "aware") ; identité par défaut.
+    """
+    make_datetime = make_datetime or (lambda dt: dt)
+    stadiums = {cid: st for cid, st in clubs}
+    ids = [cid for cid, _ in clubs]
+
+    legs = balanced_round_robin(ids, stadiums)
+    if double:
+        # Schéma "anglais" : le retour commence par l'inverse de la dernière journée aller,
+        # ce qui évite le break à la jonction des deux phases (séries limitées à 2).
+        legs = legs + [[(a, h) for h, a in day] for day in [legs[-1]] + legs[:-1]]
+
+    blackouts = set(blackouts or ())
+    offsets = sorted({o for o, _ in slots})
+    usage = defaultdict(lambda: [0] * len(slots))
+
+    days = []
+    d = start_date
+    for index, pairs in enumerate(legs):
+        d = _next_free_date(d, offsets, blackouts, spacing)
+        matches = []
+        for h, a, s, clash in _assign_slots(pairs, slots, stadiums, usage):
+            off, t = slots[s]
+            matches.append({
+                "home": h,
+                "away": a,
+                "datetime": make_datetime(datetime.combine(d + timedelta(days=off), t)),
+                "venue": stadiums.get(h) or "",
+                "slot": s,
+                "clash": clash,
+            })
+        days.append({"index": index, "date": d, "matches": matches})
+        d += timedelta(days=spacing)
+    return days
+
+
+# ======================================
+# Qualité du calendrier
+# ======================================
+
+def evaluate(days, n_slots: int) -> dict:
+    """
+    Indicateurs de qualité :
+      breaks          : nb de fois où un club joue deux journées de suite au même endroit
+      max_run         : plus longue série domicile ou extérieur
+      max_home_gap    : plus grand écart |domicile - extérieur| d'un club
+      slot_spread     : pire écart (max - min) de créneaux reçus par un même club
+      stadium_clashes : matchs dans un stade déjà occupé au même créneau
+    """
+    seq = defaultdict(list)
+    slot_counts = defaultdict(lambda: [0] * n_slots)
+    clashes = 0
+    for day in days:
+        for m in day["matches"]:
+            seq[m["home"]].append("H")
+            seq[m["away"]].append("A")
+            slot_counts[m["home"]][m["slot"]] += 1
+            slot_counts[m["away"]][m["slot"]] += 1
+            clashes += int(m["clash"])
+
+    breaks, max_run, gap = 0, 0, 0
+    for s in seq.values():
+        run = 1
+        for prev, cur in zip(s, s[1:]):
+            if cur == prev:
+                breaks += 1
+                run += 1
+            else:
+                run = 1
+            max_run = max(max_run, run)
+        gap = max(gap, abs(s.count("H") - s.count("A")))
+
+    return {
+        "rounds": len(days),
+        "matches": sum(len(d["matches"]) for d in days),
+        "breaks": breaks,
+        "max_run": max_run,
+        "max_home_gap": gap,
+        "slot_spread": max((max(c) - min(c) for c in slot_counts.values()), default=0),
+        "stadium_clashes": clashes,
+    }
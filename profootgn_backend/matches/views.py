@@ -1,4 +1,6 @@
 # matches/views.py
+from datetime import datetime, time
+
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
 from django.db import transaction
@@ -25,8 +27,14 @@ from .serializers import (
     RoundSerializer,
 )
 
+from .utils.rosters import RosterIndex, split_name
+from .utils.rescheduling import RESCHEDULABLE, find_slots, parse_times, reschedule_round
+
 from players.models import Player
+from players.search_index import get_index as get_player_index
 from clubs.models import Club
+from profootgn.text import fold_name
+from stats import discipline, form as stats_form, h2h as stats_h2h
 
 
 # -------------------------------------------------------
@@ -61,6 +69,7 @@ class MatchViewSet(viewsets.ModelViewSet):
       - /api/matches/recent/     (terminés récents)
       - /api/matches/upcoming/   (programmés à venir)
       - /api/matches/live/       (LIVE + HT + PAUSED)
+      - /api/matches/{id}/reschedule-slots/  (admin : créneaux libres pour un match reporté)
     """
     permission_classes = [ReadOnlyOrAdmin]
     serializer_class = MatchSerializer
@@ -84,6 +93,7 @@ class MatchViewSet(viewsets.ModelViewSet):
           - status: FINISHED ⇔ FT, LIVE inclut aussi HT & PAUSED
           - date_from/date_to (YYYY-MM-DD) sur la date de 'datetime'
           - round_number / round_id / round (nom) "friendly"
+          - club (domicile ou extérieur)
         """
         qs_goals = Goal.objects.select_related("player", "club").order_by("minute", "id")
         qs_cards = Card.objects.select_related("player", "club").order_by("minute", "id")
@@ -119,6 +129,11 @@ class MatchViewSet(viewsets.ModelViewSet):
         if rname:
             qs = qs.filter(round__name__iexact=str(rname).strip())
 
+        # club : matchs à domicile ou à l'extérieur (ex: ?club=3)
+        cid = str(qp.get("club") or "").strip()
+        if cid.isdigit():
+            qs = qs.filter(Q(home_club_id=int(cid)) | Q(away_club_id=int(cid)))
+
         # --------- Status + dates ---------
         status = qp.get("status")
         date_from = qp.get("date_from")  # YYYY-MM-DD
@@ -178,6 +193,38 @@ class MatchViewSet(viewsets.ModelViewSet):
         )
         return Response(self.get_serializer(qs, many=True).data)
 
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def unavailable(self, request, pk=None):
+        """Joueurs suspendus pour ce match, par équipe (stats/discipline.py)."""
+        match = get_object_or_404(Match.objects.only("id", "home_club_id", "away_club_id"), pk=pk)
+        return Response(discipline.unavailable(match))
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def h2h(self, request, pk=None):
+        """Confrontations directes des deux clubs, vues du club à domicile (stats/h2h.py)."""
+        match = get_object_or_404(Match.objects.only("id", "home_club_id", "away_club_id"), pk=pk)
+        return Response({"match": match.pk, **stats_h2h.record(match.home_club_id, match.away_club_id)})
+
+    @action(detail=True, methods=["get"], url_path="reschedule-slots", permission_classes=[IsAdminUser])
+    def reschedule_slots(self, request, pk=None):
+        """
+        Créneaux libres classés pour un match reporté/suspendu.
+        Params: rest_days (def=3), horizon (jours, def=28), venue_gap (heures, def=3),
+                times=16:00,18:30 (heures candidates), limit (def=10), from=YYYY-MM-DD
+        """
+        match = get_object_or_404(Match.objects.select_related("home_club", "away_club"), pk=pk)
+        try:
+            opts = _reschedule_options(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+        slots = find_slots(match, limit=_to_int(request.query_params.get("limit"), 10), **opts)
+        return Response({
+            "match": match.id,
+            "status": match.status,
+            "reschedulable": match.status in RESCHEDULABLE,
+            "slots": slots,
+        })
+
 
 class GoalViewSet(viewsets.ModelViewSet):
     """
@@ -256,17 +303,7 @@ class GoalViewSet(viewsets.ModelViewSet):
                 if player_id:
                     player = get_object_or_404(Player, pk=player_id)
                 elif player_name:
-                    if hasattr(Player, "club"):
-                        player = Player.objects.filter(name__iexact=player_name, club=club).first()
-                        if not player:
-                            player, _ = Player.objects.get_or_create(
-                                name=player_name, defaults={"club": club}
-                            )
-                        elif getattr(player, "club_id", None) is None:
-                            player.club = club
-                            player.save(update_fields=["club"])
-                    else:
-                        player, _ = Player.objects.get_or_create(name=player_name)
+                    player = _player_by_name(club, player_name, create=True)
 
                 # PASSEUR (optionnel)
                 assist_player = None
@@ -275,17 +312,7 @@ class GoalViewSet(viewsets.ModelViewSet):
                 if assist_id:
                     assist_player = get_object_or_404(Player, pk=assist_id)
                 elif assist_name:
-                    if hasattr(Player, "club"):
-                        assist_player = Player.objects.filter(name__iexact=assist_name, club=club).first()
-                        if not assist_player:
-                            assist_player, _ = Player.objects.get_or_create(
-                                name=assist_name, defaults={"club": club}
-                            )
-                        elif getattr(assist_player, "club_id", None) is None:
-                            assist_player.club = club
-                            assist_player.save(update_fields=["club"])
-                    else:
-                        assist_player = None
+                    assist_player = _player_by_name(club, assist_name, create=True)
 
                 to_create.append(Goal(
                     match=match,
@@ -305,18 +332,124 @@ class GoalViewSet(viewsets.ModelViewSet):
 
 
 class CardViewSet(viewsets.ModelViewSet):
-    """Lecture publique, modifications réservées à l’admin."""
+    """
+    Lecture publique, modifications réservées à l’admin.
+    + POST /api/cards/bulk/ pour créer/remplacer les cartons d'un match.
+    """
+    authentication_classes = [SessionAuthentication, JWTAuthentication]
     permission_classes = [ReadOnlyOrAdmin]
     queryset = Card.objects.select_related("match", "player", "club")
     serializer_class = CardSerializer
 
+    @action(detail=False, methods=["post"], url_path="bulk", permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """
+        Body JSON:
+        {
+          "match": 123,
+          "replace": true,
+          "cards": [
+            {
+              "club": 1,
+              "minute": 17,
+              "player": 45,                # ou "player_name": "Camara"
+              "color": "Y"                 # ou "type" : Y/R (jaune/rouge acceptés)
+            }
+          ]
+        }
+        Les joueurs sont résolus en une passe (effectifs des deux clubs + IDs explicites),
+        les joueurs inconnus créés en un seul INSERT, les cartons écrits en un bulk_create.
+        """
+        match_id = request.data.get("match")
+        cards_in = request.data.get("cards", [])
+        replace  = bool(request.data.get("replace"))
+
+        if not match_id or not isinstance(cards_in, list):
+            return Response({"ok": False, "detail": "Paramètres invalides."}, status=400)
+
+        match = get_object_or_404(Match, pk=match_id)
+        allowed_clubs = {match.home_club_id, match.away_club_id}
+
+        # 1) Normalisation des lignes (aucune requête)
+        rows = []
+        for c in cards_in:
+            if not isinstance(c, dict):
+                continue
+            club_id = _to_int(c.get("club"), None)
+            if club_id not in allowed_clubs:
+                continue
+            rows.append({
+                "club_id": club_id,
+                "minute": max(0, _to_int(c.get("minute"), 0)),
+                "player_id": _to_int(c.get("player"), None),
+                "player_name": (c.get("player_name") or "").strip(),
+                "type": _card_type(c.get("color") or c.get("type")),
+            })
+
+        with transaction.atomic():
+            # 2) Résolution groupée des joueurs
+            roster = RosterIndex(allowed_clubs)
+            roster.fetch_ids(r["player_id"] for r in rows)
+            missing = [r for r in rows if r["player_id"] and r["player_id"] not in roster.by_id]
+            if missing:
+                return Response(
+                    {"ok": False, "detail": f"Joueur introuvable: {missing[0]['player_id']}."},
+                    status=404,
+                )
+            roster.create_missing(
+                (r["club_id"], r["player_name"]) for r in rows if not r["player_id"] and r["player_name"]
+            )
+
+            # 3) Écriture
+            if replace:
+                Card.objects.filter(match=match).delete()
+
+            to_create = []
+            for r in rows:
+                if r["player_id"]:
+                    player = roster.by_id[r["player_id"]]
+                else:
+                    player = roster.find_name(r["club_id"], r["player_name"])
+                to_create.append(Card(
+                    match=match,
+                    club_id=r["club_id"],
+                    player=player,
+                    minute=r["minute"],
+                    type=r["type"],
+                ))
+
+            if to_create:
+                Card.objects.bulk_create(to_create)
+
+        qs   = Card.objects.filter(match=match).select_related("player", "club").order_by("minute", "id")
+        data = CardSerializer(qs, many=True, context={"request": request}).data
+        return Response({"ok": True, "created": data})
+
 
 class RoundViewSet(viewsets.ModelViewSet):
-    """Lecture publique, modifications réservées à l’admin."""
+    """
+    Lecture publique, modifications réservées à l’admin.
+    + POST /api/rounds/{id}/reschedule/ pour reprogrammer d'un coup les matchs reportés de la journée.
+    """
     permission_classes = [ReadOnlyOrAdmin]
     queryset = Round.objects.all().order_by("id")
     serializer_class = RoundSerializer
 
+    @action(detail=True, methods=["post"], url_path="reschedule", permission_classes=[IsAdminUser])
+    def reschedule(self, request, pk=None):
+        """
+        Body JSON: {"apply": false, "rest_days": 3, "horizon": 28, "venue_gap": 3, "times": "16:00,18:30"}
+        apply=false -> propositions seulement ; apply=true -> enregistre (statut repassé à SCHEDULED).
+        """
+        rnd = get_object_or_404(Round, pk=pk)
+        try:
+            opts = _reschedule_options(request.data)
+        except ValueError as e:
+            return Response({"ok": False, "detail": str(e)}, status=400)
+        apply = str(request.data.get("apply", "")).lower() in {"1", "true", "yes", "on"}
+        plan = reschedule_round(rnd, apply=apply, **opts)
+        return Response({"ok": True, "applied": apply, "matches": plan})
+
 
 # -------------------------------------------------------
 # Endpoints "simples" pour le panneau admin (boutons .py)
@@ -330,6 +463,27 @@ def _to_int(val, default=0):
     except (TypeError, ValueError):
         return default
 
+def _card_type(raw):
+    """'Y'/'J'/'jaune'/'yellow' -> 'Y' ; 'R'/'rouge'/'red' -> 'R' ; défaut jaune."""
+    s = str(raw or "").strip().upper()
+    return "R" if s in {"R", "ROUGE", "RED"} else "Y"
+
+def _reschedule_options(params):
+    """Options communes des endpoints de reprogrammation (lève ValueError si invalide)."""
+    opts = {
+        "rest_days": max(0, _to_int(params.get("rest_days"), 3)),
+        "horizon_days": min(365, max(1, _to_int(params.get("horizon"), 28))),
+        "venue_gap_hours": max(0, _to_int(params.get("venue_gap"), 3)),
+        "times": parse_times(params.get("times")),
+    }
+    raw_from = params.get("from")
+    if raw_from:
+        d = parse_date(str(raw_from))
+        if not d:
+            raise ValueError("Paramètre 'from' invalide (YYYY-MM-DD).")
+        opts["start"] = timezone.make_aware(datetime.combine(d, time.min), timezone.get_current_timezone())
+    return opts
+
 def _parse_dt(raw):
     """Parse un datetime str -> aware. Fallback: now()."""
     if not raw:
@@ -351,11 +505,19 @@ def _resolve_club(val, allow_create=False):
     s = str(val).strip()
     if s.isdigit():
         return Club.objects.filter(pk=int(s)).first()
-    qs = Club.objects.filter(name__iexact=s)
-    if qs.exists():
-        return qs.first()
+    club = Club.objects.filter(name_norm=fold_name(s)).first()
+    if club:
+        return club
     return Club.objects.create(name=s) if allow_create else None
 
+def _player_by_name(club, name, create=False):
+    """Joueur du club par nom (casse et accents ignorés) ; créé si absent et `create`."""
+    player = Player.objects.filter(club=club).find_name(name)
+    if player is None and create:
+        first, last = split_name(name)
+        player = Player.objects.create(club=club, first_name=first, last_name=last)
+    return player
+
 def _resolve_round(val):
     """Accepte un ID numérique OU un name (ex 'Journée 1')."""
     if not val:
@@ -483,15 +645,16 @@ def standings_view(request):
         url = club.logo.url
         return request.build_absolute_uri(url) if request else url
 
-    # Initialise une ligne par club
+    # Initialise une ligne par club (+ forme / séries par jointure, stats/form.py)
     rows = {}
-    for c in Club.objects.all().order_by("name"):
+    for c in Club.objects.select_related("form_guide").order_by("name"):
         rows[c.id] = {
             "club_id": c.id,
             "club_name": c.name,
             "club_logo": _abs_logo(c),
             "played": 0, "wins": 0, "draws": 0, "losses": 0,
             "goals_for": 0, "goals_against": 0, "goal_diff": 0, "points": 0,
+            **stats_form.club_summary(c),
         }
 
     # 1er passage : selon include_live
@@ -543,8 +706,9 @@ def standings_view(request):
         r["goal_diff"] = r["goals_for"] - r["goals_against"]
         out.append(r)
 
-    # Tri standard: Pts, Diff, BM, puis nom
+    # Tri standard: Pts, Diff, BM, puis nom ; égalités de points : confrontations directes
     out.sort(key=lambda x: (-x["points"], -x["goal_diff"], -x["goals_for"], x["club_name"].lower()))
+    out = stats_h2h.sort_standings(out)
 
     if debug_flag:
         return Response({
@@ -566,7 +730,9 @@ def standings_view(request):
 def search_players(request):
     """
     GET /api/players/search/?club=<id>&q=<texte>&limit=20
-    Retour: [{id, name, club_id, club_name}]
+    Retour: [{id, name, number, club_id, club_name, match}] classés
+    (numéro exact, début du nom, mots préfixés, puis approché).
+    Servi par l'index mémoire du process (players/search_index.py), sans requête SQL.
     """
     q = (request.query_params.get("q") or "").strip()
     club_id = request.query_params.get("club")
@@ -574,34 +740,7 @@ def search_players(request):
         limit = int(request.query_params.get("limit") or 20)
     except Exception:
         limit = 20
+    limit = max(1, min(limit, 100))
 
-    qs = Player.objects.all()
-
-    # Filtre par club si Player a une FK club
-    if club_id and str(club_id).isdigit() and hasattr(Player, "club"):
-        qs = qs.filter(club_id=int(club_id))
-
-    if q:
-        filt = Q()
-        if hasattr(Player, "name"):
-            filt |= Q(name__icontains=q)
-        if hasattr(Player, "first_name"):
-            filt |= Q(first_name__icontains=q)
-        if hasattr(Player, "last_name"):
-            filt |= Q(last_name__icontains=q)
-        if filt:
-            qs = qs.filter(filt)
-
-    qs = qs.select_related("club")[:limit]
-
-    out = []
-    for p in qs:
-        club = getattr(p, "club", None)
-        name = getattr(p, "name", None) or f"{getattr(p,'first_name','')} {getattr(p,'last_name','')}".strip() or f"Joueur #{p.pk}"
-        out.append({
-            "id": p.id,
-            "name": name,
-            "club_id": getattr(club, "id", None),
-            "club_name": getattr(club, "name", None),
-        })
-    return Response(out)
+    club_id = int(club_id) if club_id and str(club_id).isdigit() else None
+    return Response(get_player_index().results(q, club_id=club_id, limit=limit))
@@ -0,0 +1,35 @@
+# news/analyzer.py
+"""
+Découpage des actualités en mots indexés (news/fulltext.py) : mots normalisés (profootgn/text.py),
+mots vides retirés, poids entier par mot = 100 * (1 + ln(3 * occ. titre + occ. contenu)).
+
+Aucun import de modèle : utilisable tel quel par les migrations (news/migrations/0002).
+"""
+from __future__ import annotations
+
+import math
+
+from profootgn.text import tokenize_words
+
+TITLE_FACTOR = 3
+MAX_TERM_LENGTH = 40
+
+STOPWORDS = frozenset("""
+    au aux avec ce ces dans de des du elle en et eux il ils je la le les leur lui ma mais me meme mes moi
+    mon ne nos notre nous on ou par pas pour qu que qui sa se ses son sur ta te tes toi ton tu un une vos
+    votre vous est sont ont ete etre avoir fait cette cet plus ainsi apres avant
+""".split())
+
+
+def keep(word: str) -> bool:
+    return len(word) > 1 and word not in STOPWORDS and len(word) <= MAX_TERM_LENGTH
+
+
+def terms(title, content) -> dict[str, int]:
+    """{mot: poids} d'un article."""
+    occ = {}
+    for factor, text in ((TITLE_FACTOR, title), (1, content)):
+        for word in tokenize_words(text):
+            if keep(word):
+                occ[word] = occ.get(word, 0) + factor
+    return {w: int(round(100 * (1 + math.log(n)))) for w, n in occ.items()}
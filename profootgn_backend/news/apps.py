@@ -3,3 +3,13 @@ from django.apps import AppConfig
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .fulltext import on_news_deleted, on_news_saved
+        from .models import NewsItem
+
+        # Index plein texte mis à jour à chaque enregistrement (les suppressions cascadent ;
+        # elles changent seulement le jeton des statistiques N / df)
+        post_save.connect(on_news_saved, sender=NewsItem, dispatch_uid="news_fulltext_index")
+        post_delete.connect(on_news_deleted, sender=NewsItem, dispatch_uid="news_fulltext_stats")
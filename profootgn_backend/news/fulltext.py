@@ -0,0 +1,186 @@
+# news/fulltext.py
+"""
+Recherche plein texte des actualités (`/api/news/?search=`).
+
+Indexation (à l'enregistrement, signal post_save ; commande `reindex_news` après un import groupé) :
+titre et contenu découpés en mots pondérés (news/analyzer.py), une ligne NewsTerm par (mot, article).
+
+Requête : tous les mots doivent être présents (ET). Score entier = Σ poids * idf, avec
+idf = 1000 * ln(1 + N / df) (df = articles contenant le mot). N et les df sont mis en cache sous
+le jeton "news_terms" (profootgn/versions.py), changé au commit de toute (ré)indexation ou
+suppression d'article : hors modification, une recherche ne fait ni COUNT ni GROUP BY. Une
+requête SQL part des lignes du mot le plus rare et joint les autres mots sur l'index unique (term, news).
+Scores entiers : la pagination par curseur (score, id) est exacte, sans OFFSET ni COUNT.
+Portable (MySQL, SQLite, PostgreSQL) : pas de FULLTEXT spécifique au moteur.
+"""
+from __future__ import annotations
+
+import math
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+from profootgn.text import query_words
+
+from .analyzer import keep, terms
+from .models import NewsItem, NewsTerm
+
+BATCH_SIZE = 5000
+MAX_QUERY_WORDS = 8      # au-delà, les mots suivants sont ignorés (une jointure par mot)
+VERSION_NAME = "news_terms"
+STATS_TTL = 24 * 3600
+
+
+# ======================================
+# Indexation
+# ======================================
+
+def index_items(items) -> int:
+    """
+    (Ré)indexe des articles : items = itérable de (id, titre, contenu).
+    Supprime leurs anciennes lignes puis INSERT groupé. Renvoie le nombre de lignes écrites.
+    """
+    items = list(items)
+    if not items:
+        return 0
+    table = connection.ops.quote_name(NewsTerm._meta.db_table)
+    cols = ", ".join(connection.ops.quote_name(NewsTerm._meta.get_field(f).column) for f in ("term", "news", "weight"))
+    sql = f"INSERT INTO {table} ({cols}) VALUES (%s, %s, %s)"
+
+    written = 0
+    with transaction.atomic():
+        NewsTerm.objects.filter(news_id__in=[i for i, _t, _c in items]).delete()
+        rows = []
+        with connection.cursor() as cur:
+            for news_id, title, content in items:
+                rows.extend((w, news_id, weight) for w, weight in terms(title, content).items())
+                if len(rows) >= BATCH_SIZE:
+                    cur.executemany(sql, rows)
+                    written += len(rows)
+                    rows = []
+            if rows:
+                cur.executemany(sql, rows)
+                written += len(rows)
+    transaction.on_commit(_bump)
+    return written
+
+
+def index_news(item: NewsItem) -> int:
+    return index_items([(item.pk, item.title, item.content)])
+
+
+def reindex_all(batch: int = 1000, stdout=None) -> tuple[int, int]:
+    """Réindexe toutes les actualités par lots d'ID ; renvoie (articles, lignes)."""
+    done = written = 0
+    last = 0
+    while True:
+        chunk = list(
+            NewsItem.objects.filter(pk__gt=last).order_by("pk").values_list("pk", "title", "content")[:batch]
+        )
+        if not chunk:
+            return done, written
+        written += index_items(chunk)
+        done += len(chunk)
+        last = chunk[-1][0]
+        if stdout is not None:
+            stdout.write(f"  {done} article(s) • {written} ligne(s)")
+
+
+def _bump():
+    versions.bump(VERSION_NAME)
+
+
+def on_news_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_news(instance)
+
+
+def on_news_deleted(sender, instance, **kwargs):
+    """N et les df changent (lignes NewsTerm supprimées en cascade)."""
+    transaction.on_commit(_bump, using=kwargs.get("using"))
+
+
+# ======================================
+# Requête
+# ======================================
+
+def parse_cursor(value):
+    """'<score>_<id>' -> (score, id) ; None si absent ou invalide."""
+    try:
+        score, pk = str(value).split("_", 1)
+        return int(score), int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+def _stats(words) -> tuple[int, dict]:
+    """(N, {mot: df}) depuis le cache ; seuls les manquants sont comptés (COUNT, GROUP BY term)."""
+    prefix = f"pfoot:news_terms:{versions.current(VERSION_NAME)}:"
+    keys = {w: f"{prefix}df:{w}" for w in words}
+    found = cache.get_many([f"{prefix}total", *keys.values()])
+    total = found.get(f"{prefix}total")
+    df = {w: found[k] for w, k in keys.items() if k in found}
+    record_cache("news_terms", total is not None and len(df) == len(words))
+
+    missing = [w for w in words if w not in df]
+    fresh = {}
+    if total is None:
+        total = fresh[f"{prefix}total"] = NewsItem.objects.count()
+    if missing:
+        counts = dict(
+            NewsTerm.objects.filter(term__in=missing).values("term").annotate(n=Count("id")).values_list("term", "n")
+        )
+        for w in missing:
+            df[w] = fresh[keys[w]] = counts.get(w, 0)
+    if fresh:
+        cache.set_many(fresh, STATS_TTL)
+    return total, df
+
+
+def search(q, cursor=None, limit: int = 20):
+    """
+    Renvoie ([(news_id, score)], curseur suivant ou None), triés par score décroissant puis id.
+    """
+    words = sorted({w for w in query_words(q) if keep(w)})[:MAX_QUERY_WORDS]
+    if not words:
+        return [], None
+
+    total, df = _stats(words)
+    if not all(df.values()):
+        return [], None  # un mot absent de l'index : aucun article ne les contient tous
+    words.sort(key=lambda w: (df[w], w))  # le plus rare d'abord : il borne les lignes parcourues
+
+    # Une jointure par mot sur l'index unique (term, news) : seules les lignes du mot le plus
+    # rare sont parcourues, les autres mots sont des recherches ponctuelles (ET).
+    qn = connection.ops.quote_name
+    table = qn(NewsTerm._meta.db_table)
+    news_col, term_col, weight_col = (qn(NewsTerm._meta.get_field(f).column) for f in ("news", "term", "weight"))
+    joins, parts, params = [], [], []
+    for i, w in enumerate(words):
+        idf = int(round(1000 * math.log(1 + total / df[w])))
+        parts.append(f"t{i}.{weight_col} * {idf}")
+        if i:
+            joins.append(f"JOIN {table} t{i} ON t{i}.{news_col} = t0.{news_col} AND t{i}.{term_col} = %s")
+            params.append(w)
+    score = " + ".join(parts)
+    where, where_params = f"t0.{term_col} = %s", [words[0]]
+    after = parse_cursor(cursor) if cursor else None
+    if after:
+        where += f" AND (({score}) < %s OR (({score}) = %s AND t0.{news_col} < %s))"
+        where_params += [after[0], after[0], after[1]]
+    sql = (
+        f"SELECT t0.{news_col}, {score} AS score FROM {table} t0 {' '.join(joins)} "
+        f"WHERE {where} ORDER BY score DESC, t0.{news_col} DESC LIMIT %s"
+    )
+    with connection.cursor() as cur:
+        cur.execute(sql, params + where_params + [limit + 1])
+        rows = [(int(pk), int(sc)) for pk, sc in cur.fetchall()]
+
+    nxt = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        nxt = f"{rows[-1][1]}_{rows[-1][0]}"
+    return rows, nxt
@@ -0,0 +1,20 @@
+# news/management/commands/reindex_news.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.fulltext import reindex_all
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index plein texte des actualités (après un import groupé ou une migration)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Articles par lot (défaut: 1000).")
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        done, written = reindex_all(batch=max(1, opts["batch_size"]), stdout=self.stdout if opts["verbosity"] > 1 else None)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {done} article(s) indexé(s) • {written} ligne(s) d'index en {time.perf_counter() - t0:.1f}s"
+        ))
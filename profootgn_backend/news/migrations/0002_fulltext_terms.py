@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from news.analyzer import terms
+
+
+def index_existing(apps, schema_editor):
+    NewsItem = apps.get_model("news", "NewsItem")
+    NewsTerm = apps.get_model("news", "NewsTerm")
+    batch = []
+    for pk, title, content in NewsItem.objects.values_list("pk", "title", "content").iterator():
+        batch.extend(NewsTerm(term=w, news_id=pk, weight=weight) for w, weight in terms(title, content).items())
+        if len(batch) >= 5000:
+            NewsTerm.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        NewsTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=40)),
+                ('weight', models.PositiveIntegerField(default=0)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='news.newsitem')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('term', 'news'), name='newsterm_term_news_uniq')],
+            },
+        ),
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
@@ -15,3 +15,19 @@ class NewsItem(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class NewsTerm(models.Model):
+    """
+    Index plein texte des actualités (news/fulltext.py) : une ligne par (mot, article),
+    poids entier dérivé des occurrences dans le titre (x3) et le contenu.
+    """
+    term = models.CharField(max_length=40)
+    news = models.ForeignKey(NewsItem, on_delete=models.CASCADE, related_name='terms')
+    weight = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['term', 'news'], name='newsterm_term_news_uniq')]
+
+    def __str__(self):
+        return f"{self.term} → {self.news_id} ({self.weight})"
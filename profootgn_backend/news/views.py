@@ -1,12 +1,40 @@
 
 from rest_framework import viewsets, filters
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from .models import NewsItem
 from .serializers import NewsItemSerializer
+from . import fulltext
 
 class NewsItemViewSet(viewsets.ModelViewSet):
+    """
+    /api/news/
+      - ?search=<texte>  → plein texte (titre + contenu) classé par pertinence,
+                           pagination par curseur : {"next": "...&cursor=<score>_<id>", "results": [...]}
+      - ordering         → inchangé (liste sans recherche)
+    """
     queryset = NewsItem.objects.select_related('club').all()
     serializer_class = NewsItemSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title','content','club__name']
+    filter_backends = [filters.OrderingFilter]
     ordering_fields = ['published_at','title']
     ordering = ['-published_at']
+
+    def list(self, request, *args, **kwargs):
+        q = (request.query_params.get('search') or '').strip()
+        if not q:
+            return super().list(request, *args, **kwargs)
+        try:
+            limit = max(1, min(int(request.query_params.get('page_size') or 25), 100))
+        except ValueError:
+            limit = 25
+
+        rows, cursor = fulltext.search(q, cursor=request.query_params.get('cursor'), limit=limit)
+        items = self.get_queryset().in_bulk([news_id for news_id, _ in rows])
+        results = []
+        for news_id, score in rows:
+            if news_id in items:
+                data = self.get_serializer(items[news_id]).data
+                data['score'] = score
+                results.append(data)
+        nxt = replace_query_param(request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+        return Response({'next': nxt, 'results': results})
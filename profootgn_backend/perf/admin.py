@@ -0,0 +1,62 @@
+# perf/admin.py
+from django.contrib import admin
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from .export import to_csv, to_json
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("short_sql", "count", "avg_ms_display", "max_ms", "total_ms", "last_view", "last_seen")
+    list_filter = ("vendor",)
+    search_fields = ("normalized_sql", "last_view", "last_call_site")
+    ordering = ("-total_ms",)
+    actions = ("export_json", "export_csv")
+    readonly_fields = (
+        "fingerprint", "vendor", "count", "total_ms", "max_ms", "last_ms", "avg_ms_display",
+        "last_view", "last_call_site", "first_seen", "last_seen",
+        "normalized_sql_pre", "sample_sql_pre", "sample_params", "explain_pre",
+    )
+    exclude = ("normalized_sql", "sample_sql", "explain")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+
+    @admin.display(description="Moy. (ms)", ordering="total_ms")
+    def avg_ms_display(self, obj):
+        return obj.avg_ms
+
+    @admin.display(description="SQL normalisé")
+    def normalized_sql_pre(self, obj):
+        return format_html("<pre style='white-space:pre-wrap'>{}</pre>", obj.normalized_sql)
+
+    @admin.display(description="Dernier SQL")
+    def sample_sql_pre(self, obj):
+        return format_html("<pre style='white-space:pre-wrap'>{}</pre>", obj.sample_sql)
+
+    @admin.display(description="EXPLAIN")
+    def explain_pre(self, obj):
+        return format_html("<pre>{}</pre>", obj.explain or "—")
+
+    def _download(self, content, ext, content_type):
+        resp = HttpResponse(content, content_type=content_type)
+        resp["Content-Disposition"] = f'attachment; filename="slow-queries-{timezone.now():%Y%m%d-%H%M%S}.{ext}"'
+        return resp
+
+    @admin.action(description="Exporter (JSON)")
+    def export_json(self, request, queryset):
+        return self._download(to_json(queryset), "json", "application/json")
+
+    @admin.action(description="Exporter (CSV)")
+    def export_csv(self, request, queryset):
+        return self._download(to_csv(queryset), "csv", "text/csv; charset=utf-8")
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class PerfConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'perf'
+    verbose_name = "Performances"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .slow_queries import install_wrapper
+
+        # Chaque nouvelle connexion DB reçoit le wrapper de capture des requêtes lentes
+        connection_created.connect(install_wrapper, dispatch_uid="perf_slow_queries")
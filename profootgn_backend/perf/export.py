@@ -0,0 +1,31 @@
+# perf/export.py
+"""Export des requêtes lentes (admin et commande `export_slow_queries`)."""
+import csv
+import io
+import json
+
+FIELDS = (
+    "fingerprint", "count", "total_ms", "avg_ms", "max_ms", "last_ms", "vendor",
+    "last_view", "last_call_site", "first_seen", "last_seen",
+    "normalized_sql", "sample_sql", "sample_params", "explain",
+)
+
+
+def _row(q):
+    row = {f: getattr(q, f) for f in FIELDS}
+    row["first_seen"] = q.first_seen.isoformat() if q.first_seen else None
+    row["last_seen"] = q.last_seen.isoformat() if q.last_seen else None
+    return row
+
+
+def to_json(queryset) -> str:
+    return json.dumps([_row(q) for q in queryset], indent=2, ensure_ascii=False)
+
+
+def to_csv(queryset) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for q in queryset:
+        writer.writerow(_row(q))
+    return out.getvalue()
@@ -0,0 +1,27 @@
+# perf/management/commands/export_slow_queries.py
+from django.core.management.base import BaseCommand
+
+from perf.export import to_csv, to_json
+from perf.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = "Exporte les requêtes SQL lentes capturées (JSON ou CSV) pour analyse hors ligne."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=("json", "csv"), default="json")
+        parser.add_argument("--output", default=None, help="Fichier de sortie (défaut: sortie standard).")
+        parser.add_argument("--min-ms", type=float, default=0, help="Ignore les empreintes dont le max est inférieur.")
+        parser.add_argument("--reset", action="store_true", help="Vide la table après export.")
+
+    def handle(self, *args, **opts):
+        qs = SlowQuery.objects.filter(max_ms__gte=opts["min_ms"]).order_by("-total_ms")
+        content = to_json(qs) if opts["format"] == "json" else to_csv(qs)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8", newline="") as fh:
+                fh.write(content)
+            self.stderr.write(self.style.SUCCESS(f"✓ {qs.count()} empreinte(s) exportée(s) dans {opts['output']}"))
+        else:
+            self.stdout.write(content)
+        if opts["reset"]:
+            SlowQuery.objects.all().delete()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('normalized_sql', models.TextField()),
+                ('sample_sql', models.TextField(blank=True)),
+                ('sample_params', models.TextField(blank=True)),
+                ('explain', models.TextField(blank=True)),
+                ('vendor', models.CharField(blank=True, max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('last_ms', models.FloatField(default=0)),
+                ('last_view', models.CharField(blank=True, max_length=255)),
+                ('last_call_site', models.CharField(blank=True, max_length=255)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Requête SQL lente',
+                'verbose_name_plural': 'Requêtes SQL lentes',
+                'ordering': ['-total_ms'],
+            },
+        ),
+    ]
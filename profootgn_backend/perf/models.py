@@ -0,0 +1,34 @@
+# perf/models.py
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """Une ligne par empreinte SQL (requête normalisée) ayant dépassé le seuil de lenteur."""
+    fingerprint = models.CharField(max_length=40, unique=True)   # sha1 du SQL normalisé
+    normalized_sql = models.TextField()
+    sample_sql = models.TextField(blank=True)                    # dernier SQL brut (avec %s)
+    sample_params = models.TextField(blank=True)
+    explain = models.TextField(blank=True)                       # plan capturé une seule fois
+    vendor = models.CharField(max_length=20, blank=True)
+
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_ms = models.FloatField(default=0)
+
+    last_view = models.CharField(max_length=255, blank=True)
+    last_call_site = models.CharField(max_length=255, blank=True)
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-total_ms"]
+        verbose_name = "Requête SQL lente"
+        verbose_name_plural = "Requêtes SQL lentes"
+
+    @property
+    def avg_ms(self):
+        return round(self.total_ms / self.count, 2) if self.count else 0.0
+
+    def __str__(self):
+        return self.normalized_sql[:80]
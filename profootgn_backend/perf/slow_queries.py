@@ -0,0 +1,205 @@
+# perf/slow_queries.py
+"""
+Capture des requêtes SQL lentes.
+
+Un execute_wrapper est posé sur chaque connexion (signal connection_created) : toute instruction
+plus lente que PFOOT_SLOW_QUERY_MS est mise en tampon avec la vue en cours (SlowQueryMiddleware),
+le site d'appel dans le code du projet et son SQL normalisé.
+
+Le tampon est écrit une fois la réponse envoyée (fermeture de la réponse, ou tout de suite hors
+requête / hors transaction) : une ligne SlowQuery par empreinte, compteurs mis à jour avec F().
+Le plan EXPLAIN n'est capturé qu'à la création de l'empreinte (une fois).
+
+Capture désactivée par défaut (PFOOT_SLOW_QUERY_CAPTURE). Les paramètres ne sont conservés que
+sous forme de types (`(<int>, <str>)`) : valeurs réelles seulement avec PFOOT_SLOW_QUERY_STORE_PARAMS
+(données personnelles possibles : e-mails, noms…).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import IntegrityError, connections
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from profootgn.instrumentation import normalize_sql
+
+_current_view = ContextVar("pfoot_slow_query_view", default=None)
+_local = threading.local()
+
+# Fichiers ignorés pour trouver le site d'appel (plomberie, pas du code métier)
+_SKIP_FILES = ("perf/slow_queries.py", "profootgn/instrumentation.py", "profootgn/metrics.py")
+
+
+def _threshold_ms() -> float:
+    return float(getattr(settings, "PFOOT_SLOW_QUERY_MS", 200))
+
+
+def _pending() -> list:
+    if not hasattr(_local, "pending"):
+        _local.pending = []
+    return _local.pending
+
+
+def _call_site() -> str:
+    """Première frame du code du projet (hors site-packages et plomberie) : 'matches/views.py:120 in live'."""
+    base = str(Path(settings.BASE_DIR).resolve())
+    for frame in reversed(traceback.extract_stack(limit=60)[:-2]):
+        fname = frame.filename
+        if not fname.startswith(base) or "site-packages" in fname:
+            continue
+        rel = fname[len(base):].lstrip("/\\").replace("\\", "/")
+        if rel.endswith(_SKIP_FILES):
+            continue
+        return f"{rel}:{frame.lineno} in {frame.name}"
+    return ""
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_local, "busy", False):
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        if ms >= _threshold_ms():
+            conn = context["connection"]
+            _pending().append({
+                "alias": conn.alias,
+                "sql": sql,
+                "params": None if many else params,
+                "ms": ms,
+                "view": _current_view.get() or "",
+                "call_site": _call_site(),
+            })
+            if _current_view.get() is None and not conn.in_atomic_block:
+                flush_pending()
+
+
+def install_wrapper(sender, connection, **kwargs):
+    """Handler connection_created : pose le wrapper (une seule fois par connexion)."""
+    if not getattr(settings, "PFOOT_SLOW_QUERY_CAPTURE", False):
+        return
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
+
+
+# ======================================
+# Écriture (hors mesure)
+# ======================================
+
+def _explain(conn, sql, params) -> str:
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return ""
+    prefix = "EXPLAIN QUERY PLAN " if conn.vendor == "sqlite" else "EXPLAIN "
+    try:
+        with conn.cursor() as cur:
+            cur.execute(prefix + sql, params)
+            cols = [c[0] for c in (cur.description or [])]
+            rows = cur.fetchall()
+    except Exception as e:
+        return f"(EXPLAIN impossible : {e})"
+    lines = [" | ".join(cols)] if cols else []
+    lines += [" | ".join("" if v is None else str(v) for v in row) for row in rows]
+    return "\n".join(lines)
+
+
+def _sample_params(params) -> str:
+    """Paramètres à stocker : valeurs réelles si PFOOT_SLOW_QUERY_STORE_PARAMS, sinon leurs types."""
+    if params is None or getattr(settings, "PFOOT_SLOW_QUERY_STORE_PARAMS", False):
+        return repr(params)[:2000]
+    if isinstance(params, dict):
+        redacted = {k: f"<{type(v).__name__}>" for k, v in params.items()}
+    else:
+        redacted = "(" + ", ".join(f"<{type(v).__name__}>" for v in params) + ")"
+    return str(redacted)[:2000]
+
+
+def flush_pending():
+    """Écrit le tampon du thread courant (appelé en fin de requête ou hors transaction)."""
+    from perf.models import SlowQuery
+
+    items = _pending()
+    if not items:
+        return
+    _local.pending = []
+    _local.busy = True
+    try:
+        for it in items:
+            conn = connections[it["alias"]]
+            norm = normalize_sql(it["sql"])
+            fp = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+            updates = {
+                "count": F("count") + 1,
+                "total_ms": F("total_ms") + it["ms"],
+                "max_ms": Greatest(F("max_ms"), it["ms"]),
+                "last_ms": it["ms"],
+                "sample_sql": it["sql"],
+                "sample_params": _sample_params(it["params"]),
+                "last_view": it["view"][:255],
+                "last_call_site": it["call_site"][:255],
+                "last_seen": timezone.now(),   # auto_now ignoré par QuerySet.update()
+            }
+            try:
+                if SlowQuery.objects.using(conn.alias).filter(fingerprint=fp).update(**updates):
+                    continue
+                SlowQuery.objects.using(conn.alias).create(
+                    fingerprint=fp, normalized_sql=norm, vendor=conn.vendor,
+                    explain=_explain(conn, it["sql"], it["params"]) if it["params"] is not None else "",
+                    count=1, total_ms=it["ms"], max_ms=it["ms"], last_ms=it["ms"],
+                    sample_sql=it["sql"], sample_params=_sample_params(it["params"]),
+                    last_view=it["view"][:255], last_call_site=it["call_site"][:255],
+                )
+            except IntegrityError:
+                # Créée entre-temps par un autre worker
+                SlowQuery.objects.using(conn.alias).filter(fingerprint=fp).update(**updates)
+            except Exception:
+                # Table absente (migrations non jouées), base indisponible… : ne jamais casser la requête
+                pass
+    finally:
+        _local.busy = False
+
+
+class SlowQueryMiddleware:
+    """Renseigne la vue en cours pour les requêtes lentes et écrit le tampon après l'envoi de la réponse."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PFOOT_SLOW_QUERY_CAPTURE", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_view.set("")
+        try:
+            response = self.get_response(request)
+        except Exception:
+            _current_view.reset(token)
+            flush_pending()
+            raise
+        _current_view.reset(token)
+        # Écriture (et EXPLAIN) à la fermeture de la réponse, même thread, après l'envoi au client :
+        # hors du temps de réponse de l'utilisateur
+        closers = getattr(response, "_resource_closers", None)
+        if closers is None:
+            flush_pending()
+        else:
+            closers.append(flush_pending)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        func = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None) or view_func
+        name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', '')}"
+        match = getattr(request, "resolver_match", None)
+        if match and match.view_name:
+            name = f"{name} ({match.view_name})"
+        _current_view.set(name)
+        return None
@@ -4,6 +4,7 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, redirect
 
 from clubs.models import Club
+from profootgn.text import fold_name
 from .models import Player
 
 
@@ -86,7 +87,7 @@ def quick_add_players_view(request):
         if club_id.isdigit():
             club = Club.objects.filter(pk=int(club_id)).first()
         if not club and club_name:
-            club = Club.objects.filter(name__iexact=club_name).first()
+            club = Club.objects.filter(name_norm=fold_name(club_name)).first()
 
         # créer / éditer
         if pid:
@@ -1,5 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
 
 class PlayersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'players'
+
+    def ready(self):
+        from clubs.models import Club
+        from profootgn.signals import bulk_write
+        from .models import Player
+        from .search_index import invalidate
+
+        # Index d'autocomplétion : joueurs et noms de clubs affichés dans les résultats
+        for model in (Player, Club):
+            post_save.connect(invalidate, sender=model, dispatch_uid=f"player_index_save_{model.__name__}")
+            post_delete.connect(invalidate, sender=model, dispatch_uid=f"player_index_delete_{model.__name__}")
+            bulk_write.connect(invalidate, sender=model, dispatch_uid=f"player_index_bulk_{model.__name__}")
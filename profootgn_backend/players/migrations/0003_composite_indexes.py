@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_staffmember'),
+        ('players', '0002_alter_player_position'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['club', 'number'], name='player_club_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['club', 'last_name', 'first_name'], name='player_club_name_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+from profootgn.text import backfill_name_keys
+
+# Figé ici : les modèles historiques n'ont pas l'attribut NAME_KEYS
+PLAYER_NAME_KEYS = {"name_norm": ("first_name", "last_name"), "last_name_norm": ("last_name",)}
+
+
+def forwards(apps, schema_editor):
+    backfill_name_keys(apps.get_model("players", "Player"), PLAYER_NAME_KEYS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_normalized_names'),
+        ('players', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='last_name_norm',
+            field=models.CharField(blank=True, default='', editable=False, max_length=80),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='name_norm',
+            field=models.CharField(blank=True, default='', editable=False, max_length=161),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['name_norm'], name='player_name_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['last_name_norm'], name='player_last_norm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['club', 'name_norm'], name='player_club_name_norm_idx'),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 
 from django.db import models
 from clubs.models import Club
+from profootgn.text import NormalizedNameMixin, NormalizedNameQuerySet, fold_name
 
 POSITIONS = [
     ('GK','Goalkeeper'),
@@ -9,7 +10,32 @@ POSITIONS = [
     ('FW','Forward'),
 ]
 
-class Player(models.Model):
+class PlayerQuerySet(NormalizedNameQuerySet):
+    def find_name(self, value):
+        """
+        Joueur par nom (casse et accents ignorés) : nom complet « prénom nom » d'abord,
+        sinon prénom seul ou nom seul. Premier dans l'ordre du modèle, ou None.
+        """
+        key = fold_name(value)
+        if not key:
+            return None
+        return (
+            self.filter(name_norm=key).first()
+            or self.filter(models.Q(last_name_norm=key) | models.Q(name_norm__startswith=f"{key} ")).first()
+        )
+
+    def name_prefix(self, value):
+        """Auto-complétion : préfixe du nom complet ou du nom de famille (index)."""
+        key = fold_name(value)
+        if not key:
+            return self
+        return self.filter(models.Q(name_norm__startswith=key) | models.Q(last_name_norm__startswith=key))
+
+
+class Player(NormalizedNameMixin, models.Model):
+    # Colonnes normalisées (voir profootgn/text.py) : "prénom nom" et "nom"
+    NAME_KEYS = {"name_norm": ("first_name", "last_name"), "last_name_norm": ("last_name",)}
+
     first_name = models.CharField(max_length=80)
     last_name = models.CharField(max_length=80)
     club = models.ForeignKey(Club, on_delete=models.SET_NULL, null=True, related_name='players')
@@ -18,9 +44,21 @@ class Player(models.Model):
     nationality = models.CharField(max_length=60, blank=True)
     birthdate = models.DateField(null=True, blank=True)
     photo = models.ImageField(upload_to='players/', blank=True, null=True)
+    name_norm = models.CharField(max_length=161, blank=True, default="", editable=False)
+    last_name_norm = models.CharField(max_length=80, blank=True, default="", editable=False)
+
+    objects = PlayerQuerySet.as_manager()
 
     class Meta:
         ordering = ['last_name','first_name']
+        # Effectif d'un club (par numéro ou par nom) et résolution des joueurs à l'import d'événements
+        indexes = [
+            models.Index(fields=['club', 'number'], name='player_club_number_idx'),
+            models.Index(fields=['club', 'last_name', 'first_name'], name='player_club_name_idx'),
+            models.Index(fields=['name_norm'], name='player_name_norm_idx'),
+            models.Index(fields=['last_name_norm'], name='player_last_norm_idx'),
+            models.Index(fields=['club', 'name_norm'], name='player_club_name_norm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -0,0 +1,174 @@
+# players/search_index.py
+"""
+Index mémoire d'autocomplétion des joueurs (`/api/players/search/`).
+
+Un index par process, construit en une requête à la première recherche puis reconstruit
+paresseusement quand le jeton de version partagé "players" change (profootgn/versions.py) :
+signaux save/delete et bulk_write (profootgn/signals.py) de Player et Club.
+
+Classement :
+  0. numéro de maillot exact (q numérique) ;
+  1. nom complet qui commence par q ;
+  2. chaque mot de q préfixe un mot du nom (« tra ib » -> Ibrahima Traoré) ;
+  3. approché : trigrammes communs (fautes de frappe, « traore » -> « traoure »).
+À rang égal : ordre du modèle (nom, prénom), puis id.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+
+from django.db import transaction
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+from profootgn.text import fold_name
+
+VERSION_NAME = "players"
+FUZZY_MIN_SCORE = 0.35   # similarité (Dice sur trigrammes) minimale d'un résultat approché
+FUZZY_MIN_QUERY = 3      # pas de recherche approchée sous 3 caractères
+
+
+def _trigrams(s: str) -> set[str]:
+    s = f"  {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class PlayerSearchIndex:
+    """Instantané immuable des joueurs ; voir `search()`."""
+
+    def __init__(self, rows, token=None):
+        self.token = token
+        # rows : (id, first_name, last_name, number, club_id, club_name, name_norm), ordre du modèle
+        self.rows = list(rows)
+        self._words = []          # [(mot, rang)] trié : préfixes par bisect
+        self._numbers = {}        # numéro -> [rang]
+        self._grams = {}          # trigramme -> [rang]
+        self._gram_count = []
+        for pos, (_pid, _f, _l, number, _c, _cn, norm) in enumerate(self.rows):
+            for word in set(norm.split()):
+                self._words.append((word, pos))
+            if number:
+                self._numbers.setdefault(int(number), []).append(pos)
+            grams = _trigrams(norm)
+            self._gram_count.append(len(grams))
+            for g in grams:
+                self._grams.setdefault(g, []).append(pos)
+        self._words.sort()
+
+    @classmethod
+    def build(cls, token=None):
+        from players.models import Player
+
+        rows = (
+            Player.objects.order_by("last_name", "first_name", "id")
+            .values_list("id", "first_name", "last_name", "number", "club_id", "club__name", "name_norm")
+        )
+        return cls(rows, token)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ---------------------------------------------------------------
+
+    def _word_prefix(self, prefix: str) -> set[int]:
+        out = set()
+        i = bisect_left(self._words, (prefix,))
+        while i < len(self._words) and self._words[i][0].startswith(prefix):
+            out.add(self._words[i][1])
+            i += 1
+        return out
+
+    def _fuzzy(self, q: str) -> dict[int, float]:
+        grams = _trigrams(q)
+        shared = {}
+        for g in grams:
+            for pos in self._grams.get(g, ()):
+                shared[pos] = shared.get(pos, 0) + 1
+        n = len(grams)
+        return {
+            pos: score
+            for pos, c in shared.items()
+            if (score := 2 * c / (n + self._gram_count[pos])) >= FUZZY_MIN_SCORE
+        }
+
+    def search(self, q, club_id=None, limit=20):
+        """[(rang, -similarité, position)] triés, au plus `limit` ; `club_id` restreint à un club."""
+        q = fold_name(q)
+        if limit <= 0:
+            return []
+        allowed = (lambda pos: self.rows[pos][4] == club_id) if club_id is not None else (lambda pos: True)
+        if not q:
+            # Picker ouvert sans saisie : premiers joueurs (du club) dans l'ordre du modèle
+            return [(4, 0.0, pos) for pos in range(len(self.rows)) if allowed(pos)][:limit]
+
+        ranked = {}
+
+        def offer(pos, rank, score=0.0):
+            if allowed(pos) and (pos not in ranked or ranked[pos][0] > rank):
+                ranked[pos] = (rank, -score)
+
+        if q.isdigit():
+            for pos in self._numbers.get(int(q), ()):
+                offer(pos, 0)
+
+        words = q.split()
+        candidates = None
+        for w in words:
+            hits = self._word_prefix(w)
+            candidates = hits if candidates is None else candidates & hits
+            if not candidates:
+                break
+        for pos in candidates or ():
+            offer(pos, 1 if self.rows[pos][6].startswith(q) else 2)
+
+        if len(q) >= FUZZY_MIN_QUERY and len(ranked) < limit:
+            for pos, score in self._fuzzy(q).items():
+                offer(pos, 3, score)
+
+        return sorted(((r, s, pos) for pos, (r, s) in ranked.items()))[:limit]
+
+    def results(self, q, club_id=None, limit=20):
+        out = []
+        for rank, _s, pos in self.search(q, club_id, limit):
+            pid, first, last, number, cid, cname, _norm = self.rows[pos]
+            out.append({
+                "id": pid,
+                "name": f"{first} {last}".strip() or f"Joueur #{pid}",
+                "number": number or None,
+                "club_id": cid,
+                "club_name": cname,
+                "match": ("number", "prefix", "words", "fuzzy", "all")[rank],
+            })
+        return out
+
+
+# ======================================
+# Index du process (reconstruction paresseuse)
+# ======================================
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index() -> PlayerSearchIndex:
+    """Index à jour : 1 lecture de cache par appel, 1 requête SQL après une modification."""
+    global _index
+    token = versions.current(VERSION_NAME)
+    idx = _index
+    hit = idx is not None and idx.token == token
+    record_cache("player_search_index", hit)
+    if hit:
+        return idx
+    with _lock:
+        if _index is None or _index.token != token:
+            _index = PlayerSearchIndex.build(token)
+        return _index
+
+
+def invalidate(**kwargs):
+    """
+    Receveur de signaux (et appel direct après écriture groupée). Le jeton change au commit :
+    un autre worker ne peut pas reconstruire l'index avec des données pas encore visibles.
+    """
+    transaction.on_commit(lambda: versions.bump(VERSION_NAME), using=kwargs.get("using"))
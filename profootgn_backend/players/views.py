@@ -1,9 +1,12 @@
 # players/views.py
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django.db.models import Q
 
 from .models import Player
 from .serializers import PlayerSerializer
+from stats import profile as player_profile
 
 
 class PlayerViewSet(viewsets.ModelViewSet):
@@ -13,9 +16,12 @@ class PlayerViewSet(viewsets.ModelViewSet):
       - ?club_id=<id>         → alias
       - ?club=<id1,id2,...>   → plusieurs clubs possibles
       - search, ordering      → inchangés
+    /api/players/{id}/profile/ → totaux, détail par journée, minutes des buts, derniers matchs (en cache)
     """
     queryset = Player.objects.select_related("club").all()
     serializer_class = PlayerSerializer
+    # IDs numériques seulement : /api/players/search/ (matches/urls.py) n'est plus masqué par le détail
+    lookup_value_regex = r"\d+"
 
     # Recherche / tri existants
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
@@ -35,3 +41,14 @@ class PlayerViewSet(viewsets.ModelViewSet):
                 qs = qs.filter(club_id__in=ids)
 
         return qs
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def profile(self, request, pk=None):
+        """Profil saison du joueur (stats/profile.py)."""
+        player = self.get_object()
+
+        def absolute(f):
+            return request.build_absolute_uri(f.url) if f else None
+
+        origin = f"{request.scheme}://{request.get_host()}"
+        return Response(player_profile.get_profile(player, absolute, origin))
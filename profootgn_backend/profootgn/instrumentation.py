@@ -0,0 +1,211 @@
+# profootgn/instrumentation.py
+"""
+Instrumentation SQL par requête (activée par PFOOT_PERF_INSTRUMENTATION=True).
+
+Pour chaque requête HTTP :
+  - nombre de requêtes SQL et temps DB cumulé (execute_wrapper sur toutes les connexions) ;
+  - temps de sérialisation DRF (Serializer.data de premier niveau) ;
+  - temps de rendu (response.render() : JSON DRF ou template) ;
+exposés dans l'en-tête `Server-Timing` (visible dans l'onglet Réseau du navigateur).
+
+Les requêtes lentes (durée ou nombre de requêtes SQL au-dessus des seuils) sont journalisées
+sur le logger "profootgn.perf" avec le SQL normalisé des pires instructions.
+
+Désactivée : le middleware lève MiddlewareNotUsed et sort de la chaîne (aucun surcoût).
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("profootgn.perf")
+
+_current = ContextVar("pfoot_perf_stats", default=None)
+
+
+# ======================================
+# SQL normalisé (empreinte)
+# ======================================
+
+_RE_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_RE_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_RE_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_RE_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Empreinte d'une requête : littéraux remplacés par ?, listes IN (...) repliées,
+    espaces compactés. Deux requêtes ne différant que par leurs paramètres ont la même empreinte.
+    """
+    s = _RE_STRING.sub("?", str(sql or ""))
+    s = _RE_NUMBER.sub("?", s)
+    s = s.replace("%s", "?")
+    s = _RE_IN_LIST.sub("IN (...)", s)
+    return _RE_SPACES.sub(" ", s).strip()
+
+
+# ======================================
+# Collecte par requête
+# ======================================
+
+class RequestStats:
+    """Compteurs d'une requête HTTP (durées en secondes)."""
+
+    __slots__ = ("queries", "db", "serialize", "render", "by_sql", "_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.by_sql = {}      # sql brut -> [nb, durée cumulée]
+        self._depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """execute_wrapper Django."""
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            dt = time.perf_counter() - t0
+            self.queries += 1
+            self.db += dt
+            slot = self.by_sql.get(sql)
+            if slot is None:
+                self.by_sql[sql] = [1, dt]
+            else:
+                slot[0] += 1
+                slot[1] += dt
+
+    def worst(self, n: int) -> list[dict]:
+        """Les n empreintes SQL les plus coûteuses (temps cumulé)."""
+        agg = {}
+        for sql, (count, dt) in self.by_sql.items():
+            fp = normalize_sql(sql)
+            slot = agg.setdefault(fp, [0, 0.0])
+            slot[0] += count
+            slot[1] += dt
+        rows = sorted(agg.items(), key=lambda kv: kv[1][1], reverse=True)[:n]
+        return [{"sql": fp, "count": c, "ms": round(dt * 1000, 2)} for fp, (c, dt) in rows]
+
+
+def current_stats() -> RequestStats | None:
+    """Statistiques de la requête en cours (None hors requête instrumentée)."""
+    return _current.get()
+
+
+# ======================================
+# Sérialisation DRF
+# ======================================
+
+_serializer_patched = False
+
+
+def _install_serializer_timer():
+    """Chronomètre BaseSerializer.data (installé une fois, seulement si l'instrumentation est active)."""
+    global _serializer_patched
+    if _serializer_patched:
+        return
+    try:
+        from rest_framework.serializers import BaseSerializer
+    except ImportError:
+        return
+
+    original = BaseSerializer.data
+
+    def data(self):
+        stats = _current.get()
+        if stats is None or stats._depth:
+            return original.fget(self)
+        stats._depth += 1
+        t0 = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            stats.serialize += time.perf_counter() - t0
+            stats._depth -= 1
+
+    BaseSerializer.data = property(data)
+    _serializer_patched = True
+
+
+# ======================================
+# Middleware
+# ======================================
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+class SQLInstrumentationMiddleware:
+    """À placer en tête de MIDDLEWARE pour que `total` couvre toute la chaîne."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PFOOT_PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "PFOOT_PERF_SLOW_REQUEST_MS", 500)
+        self.slow_queries = getattr(settings, "PFOOT_PERF_SLOW_QUERY_COUNT", 50)
+        self.top_sql = getattr(settings, "PFOOT_PERF_LOG_TOP_SQL", 5)
+        _install_serializer_timer()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        t0 = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - t0
+
+        timing = (
+            f'db;dur={_ms(stats.db)};desc="{stats.queries} queries", '
+            f"serialize;dur={_ms(stats.serialize)}, "
+            f"render;dur={_ms(stats.render)}, "
+            f"total;dur={_ms(total)}"
+        )
+        prev = response.get("Server-Timing")
+        response["Server-Timing"] = f"{prev}, {timing}" if prev else timing
+
+        if total * 1000 >= self.slow_ms or stats.queries >= self.slow_queries:
+            self._log_slow(request, response, stats, total)
+        return response
+
+    def process_template_response(self, request, response):
+        """Chronomètre le rendu (DRF Response / TemplateResponse) qui suit la vue."""
+        stats = _current.get()
+        if stats is None:
+            return response
+        render = response.render
+
+        def timed_render():
+            t0 = time.perf_counter()
+            try:
+                return render()
+            finally:
+                stats.render += time.perf_counter() - t0
+
+        response.render = timed_render
+        return response
+
+    def _log_slow(self, request, response, stats, total):
+        lines = [
+            f"{request.method} {request.get_full_path()} -> {response.status_code} "
+            f"en {_ms(total)} ms • {stats.queries} requête(s) SQL / {_ms(stats.db)} ms • "
+            f"sérialisation {_ms(stats.serialize)} ms • rendu {_ms(stats.render)} ms"
+        ]
+        for w in stats.worst(self.top_sql):
+            lines.append(f"    {w['ms']:>8} ms  x{w['count']:<4} {w['sql'][:500]}")
+        logger.warning("Requête lente : %s", "\n".join(lines))
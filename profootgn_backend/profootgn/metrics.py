@@ -0,0 +1,352 @@
+# profootgn/metrics.py
+"""
+Métriques au format Prometheus (`GET /metrics`, staff, jeton PFOOT_METRICS_TOKEN ou IP autorisée).
+
+Collecte :
+  - MetricsMiddleware : requêtes par route (view_name) / méthode / statut, histogramme de latence,
+    requêtes SQL et temps DB par route ;
+  - record_cache(name, hit) : à appeler par le code qui lit un cache applicatif (ratio de hits) ;
+  - stream_opened() / stream_closed() : connexions de flux en direct ouvertes (gauge).
+
+Agrégation multi-process (gunicorn, plusieurs workers) : chaque process garde ses compteurs en
+mémoire et les écrit périodiquement dans PFOOT_METRICS_DIR/<pid>.json (écriture atomique).
+`/metrics` additionne tous les fichiers ; les gauges des process morts sont ignorées et leurs
+compteurs fusionnés dans un seul fichier (DEAD_FILE), les fichiers <pid>.json morts supprimés.
+
+Accès : aucune IP autorisée par défaut. Derrière un reverse proxy, toutes les requêtes arrivent
+de 127.0.0.1 : utiliser PFOOT_METRICS_TOKEN (en-tête « Authorization: Bearer <jeton> »).
+"""
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import fcntl
+except ImportError:   # Windows : pas de fusion des fichiers morts
+    fcntl = None
+
+DEAD_FILE = "dead.json"        # compteurs cumulés des process terminés
+LOCK_FILE = ".compact.lock"
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "pfoot_http_requests_total": ("counter", "Requêtes HTTP par route, méthode et statut."),
+    "pfoot_http_request_duration_seconds": ("histogram", "Durée des requêtes HTTP par route."),
+    "pfoot_db_queries_total": ("counter", "Requêtes SQL exécutées, par route."),
+    "pfoot_db_duration_seconds_total": ("counter", "Temps passé en base, par route."),
+    "pfoot_cache_requests_total": ("counter", "Lectures de cache applicatif (result=hit|miss)."),
+    "pfoot_cache_hit_ratio": ("gauge", "Ratio de hits par cache applicatif."),
+    "pfoot_live_streams": ("gauge", "Connexions de flux en direct ouvertes."),
+}
+
+_lock = threading.Lock()
+_counters = {}     # (name, labels tuple) -> float
+_hists = {}        # (name, labels tuple) -> [buckets..., sum, count]
+_gauges = {}       # (name, labels tuple) -> float
+_last_flush = 0.0
+
+
+def metrics_dir() -> Path:
+    return Path(getattr(settings, "PFOOT_METRICS_DIR", Path(settings.BASE_DIR) / "var" / "metrics"))
+
+
+def _key(name, **labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# ======================================
+# API d'enregistrement
+# ======================================
+
+def inc(name, value=1.0, **labels):
+    k = _key(name, **labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0.0) + value
+
+
+def observe(name, seconds, **labels):
+    k = _key(name, **labels)
+    with _lock:
+        h = _hists.get(k)
+        if h is None:
+            h = _hists[k] = [0] * (len(BUCKETS) + 2)
+        for i, b in enumerate(BUCKETS):
+            if seconds <= b:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+
+def gauge_add(name, delta, **labels):
+    k = _key(name, **labels)
+    with _lock:
+        _gauges[k] = _gauges.get(k, 0.0) + delta
+    flush(force=True)
+
+
+def record_cache(name: str, hit: bool):
+    """Lecture d'un cache applicatif : alimente pfoot_cache_requests_total et le ratio de hits."""
+    inc("pfoot_cache_requests_total", cache=name, result="hit" if hit else "miss")
+
+
+def stream_opened(kind: str = "live"):
+    gauge_add("pfoot_live_streams", 1, kind=kind)
+
+
+def stream_closed(kind: str = "live"):
+    gauge_add("pfoot_live_streams", -1, kind=kind)
+
+
+# ======================================
+# Stockage partagé (un fichier par process)
+# ======================================
+
+def _snapshot():
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "counters": [[n, dict(l), v] for (n, l), v in _counters.items()],
+            "hists": [[n, dict(l), list(h)] for (n, l), h in _hists.items()],
+            "gauges": [[n, dict(l), v] for (n, l), v in _gauges.items()],
+        }
+
+
+def flush(force: bool = False):
+    """Écrit les métriques du process (au plus toutes les PFOOT_METRICS_FLUSH_SECONDS)."""
+    global _last_flush
+    now = time.monotonic()
+    if not force and now - _last_flush < getattr(settings, "PFOOT_METRICS_FLUSH_SECONDS", 5):
+        return
+    _last_flush = now
+    directory = metrics_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f".{os.getpid()}.json.tmp"
+        tmp.write_text(json.dumps(_snapshot()), encoding="utf-8")
+        os.replace(tmp, directory / f"{os.getpid()}.json")
+    except OSError:
+        pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _merge(data, counters, hists):
+    for n, l, v in data.get("counters", []):
+        k = _key(n, **l)
+        counters[k] = counters.get(k, 0.0) + v
+    for n, l, h in data.get("hists", []):
+        k = _key(n, **l)
+        cur = hists.setdefault(k, [0] * len(h))
+        for i, v in enumerate(h):
+            cur[i] += v
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def compact():
+    """
+    Fusionne les compteurs / histogrammes des process morts dans DEAD_FILE et supprime leurs
+    fichiers (verrou fichier : un seul worker à la fois, pas de double comptage).
+    """
+    if fcntl is None:
+        return
+    directory = metrics_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            dead = []
+            for path in directory.glob("*.json"):
+                if path.name != DEAD_FILE and path.stem.isdigit() and not _pid_alive(int(path.stem)):
+                    dead.append(path)
+            if not dead:
+                return
+            counters, hists = {}, {}
+            for path in [directory / DEAD_FILE, *dead]:
+                data = _read(path)
+                if data:
+                    _merge(data, counters, hists)
+            _write_atomic(directory / DEAD_FILE, {
+                "pid": 0,
+                "counters": [[n, dict(l), v] for (n, l), v in counters.items()],
+                "hists": [[n, dict(l), h] for (n, l), h in hists.items()],
+                "gauges": [],
+            })
+            for path in dead:
+                path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def collect():
+    """Somme de tous les process : (counters, hists, gauges) indexés par (name, labels)."""
+    flush(force=True)
+    compact()
+    counters, hists, gauges = {}, {}, {}
+    for path in metrics_dir().glob("*.json"):
+        data = _read(path)
+        if data is None:
+            continue
+        _merge(data, counters, hists)
+        pid = int(data.get("pid") or 0)
+        if pid and _pid_alive(pid):
+            for n, l, v in data.get("gauges", []):
+                k = _key(n, **l)
+                gauges[k] = gauges.get(k, 0.0) + v
+    return counters, hists, gauges
+
+
+# ======================================
+# Exposition texte Prometheus
+# ======================================
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+def _num(v):
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+def render_prometheus() -> str:
+    counters, hists, gauges = collect()
+
+    # Ratio de hits dérivé des compteurs de cache
+    totals = {}
+    for (n, l), v in counters.items():
+        if n == "pfoot_cache_requests_total":
+            d = dict(l)
+            t = totals.setdefault(d.get("cache"), [0.0, 0.0])
+            t[0 if d.get("result") == "hit" else 1] += v
+    for cache_name, (hit, miss) in totals.items():
+        gauges[_key("pfoot_cache_hit_ratio", cache=cache_name)] = round(hit / (hit + miss), 4) if hit + miss else 0.0
+
+    lines = []
+    by_name = {}
+    for store in (counters, gauges):
+        for (n, l), v in store.items():
+            by_name.setdefault(n, []).append((l, v))
+    for (n, l), h in hists.items():
+        by_name.setdefault(n, []).append((l, h))
+
+    for name in sorted(by_name):
+        kind, text = HELP.get(name, ("untyped", ""))
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, v in sorted(by_name[name], key=lambda x: x[0]):
+            if kind == "histogram":
+                for i, b in enumerate(BUCKETS):
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', b)])} {v[i]}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {v[-1]}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {v[-2]!r}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {v[-1]}")
+            else:
+                lines.append(f"{name}{_fmt_labels(labels)} {_num(v)}")
+    return "\n".join(lines) + "\n"
+
+
+def _client_ip(request) -> str:
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _token_ok(request) -> bool:
+    token = getattr(settings, "PFOOT_METRICS_TOKEN", "")
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if not token or not header.startswith("Bearer "):
+        return False
+    return hmac.compare_digest(header[len("Bearer "):].strip().encode(), token.encode())
+
+
+def metrics_view(request):
+    """GET /metrics : staff connecté, jeton PFOOT_METRICS_TOKEN ou IP listée dans PFOOT_METRICS_ALLOWED_IPS."""
+    user = getattr(request, "user", None)
+    allowed_ips = getattr(settings, "PFOOT_METRICS_ALLOWED_IPS", ())
+    if not ((user is not None and user.is_staff) or _token_ok(request) or _client_ip(request) in allowed_ips):
+        return HttpResponseForbidden("Accès réservé.")
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# ======================================
+# Middleware
+# ======================================
+
+class _DBCounter:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - t0
+
+
+class MetricsMiddleware:
+    """Compte chaque requête par route résolue (view_name) : cardinalité bornée."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PFOOT_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        db = _DBCounter()
+        t0 = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(db))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - t0
+
+        match = getattr(request, "resolver_match", None)
+        route = (match.view_name or match.route) if match else "<unresolved>"
+        if route == "metrics":
+            return response
+
+        inc("pfoot_http_requests_total", route=route, method=request.method, status=str(response.status_code))
+        observe("pfoot_http_request_duration_seconds", elapsed, route=route)
+        if db.count:
+            inc("pfoot_db_queries_total", db.count, route=route)
+            inc("pfoot_db_duration_seconds_total", db.seconds, route=route)
+        flush()
+        return response
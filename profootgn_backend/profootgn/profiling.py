@@ -0,0 +1,126 @@
+# profootgn/profiling.py
+"""
+Profilage à la demande d'une requête (réservé au staff).
+
+Déclenchement : paramètre `?_profile=...` ou en-tête `X-Profile: ...`
+    1 / on   -> réponse normale + fichier .prof écrit sur disque (en-tête X-Profile-File)
+    stats    -> résumé texte (40 fonctions les plus coûteuses, temps cumulé) au lieu de la réponse
+    prof     -> téléchargement du dump pstats (snakeviz, flameprof, `python -m pstats`…)
+
+Profileur déterministe cProfile autour de toute la suite de la chaîne (vue DRF, vue fonction,
+pages admin rapides, rendu compris). Les dumps vont dans PFOOT_PROFILE_DIR ; seuls les
+PFOOT_PROFILE_KEEP plus récents (et de moins de PFOOT_PROFILE_MAX_AGE_DAYS jours) sont conservés.
+
+Un seul profil à la fois par processus (cProfile ne supporte pas deux profileurs actifs) :
+une demande concurrente est servie normalement avec `X-Profile: busy`.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse
+
+TRIGGER_PARAM = "_profile"
+TRIGGER_HEADER = "HTTP_X_PROFILE"
+MODES = {"1": "on", "on": "on", "true": "on", "stats": "stats", "prof": "prof"}
+
+_lock = threading.Lock()
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PFOOT_PROFILE_DIR", Path(settings.BASE_DIR) / "var" / "profiles"))
+
+
+def _requested_mode(request):
+    raw = request.GET.get(TRIGGER_PARAM) or request.META.get(TRIGGER_HEADER) or ""
+    return MODES.get(str(raw).strip().lower())
+
+
+def _is_staff(request) -> bool:
+    """Session (admin) ou, pour l'API, jeton JWT : la vue n'a pas encore authentifié l'utilisateur."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return bool(user.is_staff)
+    if not request.META.get("HTTP_AUTHORIZATION"):
+        return False
+    try:
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        res = JWTAuthentication().authenticate(request)
+    except Exception:
+        return False
+    return bool(res and res[0].is_staff)
+
+
+def _dump_name(request) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-")[:80] or "root"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{request.method}-{slug}.prof"
+
+
+def prune_profiles(directory: Path, keep: int, max_age_days: int):
+    """Rétention : au plus `keep` fichiers, aucun plus vieux que `max_age_days` jours."""
+    files = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    limit = time.time() - max_age_days * 86400
+    for i, p in enumerate(files):
+        if i >= keep or p.stat().st_mtime < limit:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+
+def stats_text(path, limit: int = 40) -> str:
+    out = io.StringIO()
+    st = pstats.Stats(str(path), stream=out)
+    st.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+class RequestProfilerMiddleware:
+    """À placer après AuthenticationMiddleware (utilisateur de session disponible)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PFOOT_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.keep = getattr(settings, "PFOOT_PROFILE_KEEP", 50)
+        self.max_age_days = getattr(settings, "PFOOT_PROFILE_MAX_AGE_DAYS", 7)
+
+    def __call__(self, request):
+        mode = _requested_mode(request)
+        if mode is None or not _is_staff(request):
+            return self.get_response(request)
+
+        if not _lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response["X-Profile"] = "busy"
+            return response
+
+        profiler = cProfile.Profile()
+        t0 = time.perf_counter()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            _lock.release()
+        elapsed = time.perf_counter() - t0
+
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / _dump_name(request)
+        profiler.dump_stats(str(path))
+        prune_profiles(directory, self.keep, self.max_age_days)
+
+        if mode == "stats":
+            response = HttpResponse(stats_text(path), content_type="text/plain; charset=utf-8")
+        elif mode == "prof":
+            response = FileResponse(open(path, "rb"), as_attachment=True, filename=path.name)
+        response["X-Profile"] = f"{elapsed * 1000:.1f}ms"
+        response["X-Profile-File"] = path.name
+        return response
@@ -30,21 +30,49 @@ INSTALLED_APPS = [
     'news',
     'recruitment',
     'users',
+    'perf',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'profootgn.instrumentation.SQLInstrumentationMiddleware',  # inactif sauf PFOOT_PERF_INSTRUMENTATION
+    'profootgn.metrics.MetricsMiddleware',                     # /metrics (Prometheus)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'profootgn.profiling.RequestProfilerMiddleware',  # ?_profile=1 (staff uniquement)
+    'perf.slow_queries.SlowQueryMiddleware',          # requêtes SQL lentes (vue en cours + écriture)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'profootgn.urls'
 
+# Instrumentation SQL par requête (en-tête Server-Timing + journal des requêtes lentes)
+PFOOT_PERF_INSTRUMENTATION = os.getenv('PFOOT_PERF_INSTRUMENTATION', 'False') == 'True'
+PFOOT_PERF_SLOW_REQUEST_MS = int(os.getenv('PFOOT_PERF_SLOW_REQUEST_MS', '500'))
+PFOOT_PERF_SLOW_QUERY_COUNT = int(os.getenv('PFOOT_PERF_SLOW_QUERY_COUNT', '50'))
+PFOOT_PERF_LOG_TOP_SQL = 5
+
+# Profilage à la demande (?_profile=1|stats|prof ou en-tête X-Profile), staff uniquement
+# Désactivé par défaut (dumps cProfile écrits sur disque) : à activer par environnement
+PFOOT_PROFILER_ENABLED = os.getenv('PFOOT_PROFILER_ENABLED', 'False') == 'True'
+PFOOT_PROFILE_DIR = Path(os.getenv('PFOOT_PROFILE_DIR', BASE_DIR / 'var' / 'profiles'))
+PFOOT_PROFILE_KEEP = int(os.getenv('PFOOT_PROFILE_KEEP', '50'))
+PFOOT_PROFILE_MAX_AGE_DAYS = int(os.getenv('PFOOT_PROFILE_MAX_AGE_DAYS', '7'))
+
+# Métriques Prometheus (/metrics) : un fichier par worker, agrégés à la lecture
+PFOOT_METRICS_ENABLED = os.getenv('PFOOT_METRICS_ENABLED', 'True') == 'True'
+PFOOT_METRICS_DIR = Path(os.getenv('PFOOT_METRICS_DIR', BASE_DIR / 'var' / 'metrics'))
+PFOOT_METRICS_FLUSH_SECONDS = 5
+# Accès sans session staff : jeton (Authorization: Bearer …) ou IP listées (vide par défaut ;
+# derrière un reverse proxy, REMOTE_ADDR vaut 127.0.0.1 pour tout le monde)
+PFOOT_METRICS_TOKEN = os.getenv('PFOOT_METRICS_TOKEN', '')
+PFOOT_METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('PFOOT_METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -112,6 +140,61 @@ CORS_ALLOW_ALL_ORIGINS = False
 origins = os.getenv('ALLOWED_ORIGINS', 'http://localhost:5173,http://127.0.0.1:5173')
 CORS_ALLOWED_ORIGINS = [o.strip() for o in origins.split(',') if o.strip()]
 
+# Cache partagé entre workers (profils joueurs, vues d'ensemble clubs, marqueurs d'amorçage…).
+# Fichiers par défaut, pour le développement et un seul serveur : en production, Redis ou
+# Memcached via PFOOT_CACHE_BACKEND/PFOOT_CACHE_LOCATION (le cache fichier parcourt tout le
+# répertoire à chaque purge). MAX_ENTRIES (300 par défaut dans Django) ne vaut que pour les
+# backends fichier / mémoire locale.
+PFOOT_CACHE_BACKEND = os.getenv('PFOOT_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+_CULLED_BACKENDS = ('django.core.cache.backends.filebased.FileBasedCache',
+                    'django.core.cache.backends.locmem.LocMemCache')
+
+
+def _cache_options(backend, max_entries):
+    return {'MAX_ENTRIES': max_entries} if backend in _CULLED_BACKENDS else {}
+
+
+# Jetons de version (profootgn/versions.py) : alias séparé, que la purge du cache principal ne
+# touche pas (un jeton purgé invaliderait les index et caches de tous les workers).
+PFOOT_VERSIONS_CACHE_BACKEND = os.getenv('PFOOT_VERSIONS_CACHE_BACKEND', PFOOT_CACHE_BACKEND)
+CACHES = {
+    'default': {
+        'BACKEND': PFOOT_CACHE_BACKEND,
+        'LOCATION': os.getenv('PFOOT_CACHE_LOCATION', str(BASE_DIR / 'var' / 'cache')),
+        'OPTIONS': _cache_options(PFOOT_CACHE_BACKEND, int(os.getenv('PFOOT_CACHE_MAX_ENTRIES', '20000'))),
+    },
+    'versions': {
+        'BACKEND': PFOOT_VERSIONS_CACHE_BACKEND,
+        # Cache fichier : répertoire distinct (la purge de `default` vide son propre répertoire) ;
+        # Redis / Memcached : même serveur, préfixe de clé distinct
+        'LOCATION': os.getenv('PFOOT_VERSIONS_CACHE_LOCATION', str(BASE_DIR / 'var' / 'versions')
+                              if PFOOT_VERSIONS_CACHE_BACKEND.endswith('FileBasedCache')
+                              else os.getenv('PFOOT_CACHE_LOCATION', '')),
+        'KEY_PREFIX': 'pfoot-versions',
+        'TIMEOUT': None,
+        # Une clé par joueur plus quelques index : limite jamais atteinte, donc jamais purgé
+        'OPTIONS': _cache_options(PFOOT_VERSIONS_CACHE_BACKEND, 1_000_000),
+    },
+}
+
+# Requêtes SQL lentes (admin « Performances » + commande export_slow_queries), à activer par environnement
+PFOOT_SLOW_QUERY_CAPTURE = os.getenv('PFOOT_SLOW_QUERY_CAPTURE', 'False') == 'True'
+PFOOT_SLOW_QUERY_MS = float(os.getenv('PFOOT_SLOW_QUERY_MS', '200'))
+# Valeurs réelles des paramètres SQL (données personnelles possibles) ; sinon types seulement
+PFOOT_SLOW_QUERY_STORE_PARAMS = os.getenv('PFOOT_SLOW_QUERY_STORE_PARAMS', 'False') == 'True'
+
+# Vue d'ensemble des clubs (/api/clubs/{id}/overview/) : durée max en cache (invalidée par versions)
+PFOOT_CLUB_OVERVIEW_TTL = int(os.getenv('PFOOT_CLUB_OVERVIEW_TTL', '600'))
+
+# Discipline (stats/discipline.py) : matchs de suspension ; après modification, `rebuild_player_stats`
+PFOOT_DISCIPLINE_YELLOW_THRESHOLD = int(os.getenv('PFOOT_DISCIPLINE_YELLOW_THRESHOLD', '3'))   # jaunes cumulés
+PFOOT_DISCIPLINE_YELLOW_BAN = int(os.getenv('PFOOT_DISCIPLINE_YELLOW_BAN', '1'))
+PFOOT_DISCIPLINE_SECOND_YELLOW_BAN = int(os.getenv('PFOOT_DISCIPLINE_SECOND_YELLOW_BAN', '1'))
+PFOOT_DISCIPLINE_RED_BAN = int(os.getenv('PFOOT_DISCIPLINE_RED_BAN', '1'))
+
+# Classements : égalité de points départagée par les confrontations directes (stats/h2h.py)
+PFOOT_STANDINGS_H2H_TIEBREAK = os.getenv('PFOOT_STANDINGS_H2H_TIEBREAK', 'True') == 'True'
+
 from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=6),
@@ -143,7 +226,7 @@ JAZZMIN_SETTINGS = {
     ],
 
     "order_with_respect_to": [
-        "auth", "players", "clubs", "matches", "stats", "news", "recruitment", "users"
+        "auth", "players", "clubs", "matches", "stats", "news", "recruitment", "users", "perf"
     ],
 
     "icons": {
@@ -166,6 +249,8 @@ JAZZMIN_SETTINGS = {
         "recruitment.TrialRequest": "fas fa-clipboard-check",
         "users": "fas fa-id-badge",
         "users.Profile": "fas fa-id-card",
+        "perf": "fas fa-tachometer-alt",
+        "perf.SlowQuery": "fas fa-hourglass-half",
     },
 
     "show_ui_builder": False,
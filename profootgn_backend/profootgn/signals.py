@@ -0,0 +1,35 @@
+# profootgn/signals.py
+"""
+Signal `bulk_write` : écritures groupées qui contournent post_save / post_delete
+(bulk_create, bulk_update, QuerySet.update). Envoyé par BulkSignalQuerySet avec
+sender=<modèle> et using=<alias> ; les index mémoire s'y abonnent pour s'invalider.
+bulk_create / bulk_update passent aussi objs=<instances écrites> (update() : objs=None),
+pour les abonnés qui savent invalider finement (ex. agrégats par match).
+"""
+from django.db import models
+from django.dispatch import Signal
+
+bulk_write = Signal()
+
+
+class BulkSignalQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        bulk_write.send(sender=self.model, using=self.db, objs=created)
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        bulk_write.send(sender=self.model, using=self.db, objs=objs)
+        return rows
+
+    bulk_update.alters_data = True
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            bulk_write.send(sender=self.model, using=self.db, objs=None)
+        return rows
+
+    update.alters_data = True
@@ -0,0 +1,162 @@
+# profootgn/text.py
+"""
+Noms normalisés (insensibles à la casse et aux accents) persistés en base.
+
+Les modèles concernés déclarent `NAME_KEYS = {"<colonne>": ("<champ source>", ...)}` :
+la colonne reçoit la concaténation normalisée des champs sources ("Traoré  Ibrahima" -> "traore ibrahima").
+Elle est indexée : les résolutions exactes et les recherches par préfixe se font par `=` / `LIKE 'x%'`
+au lieu de `iexact` / `icontains` (pas d'index, et "Traoré" ≠ "Traore").
+
+Synchronisation :
+  - NormalizedNameMixin.save() recalcule les colonnes (et les ajoute à update_fields si besoin) ;
+  - NormalizedNameQuerySet couvre bulk_create / bulk_update / update() ;
+  - backfill_name_keys() (commande `backfill_name_keys`, migrations) pour les lignes existantes.
+
+tokenize_words() / query_words() : découpage en mots commun aux index de recherche.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+from django.db import transaction
+
+from profootgn.signals import BulkSignalQuerySet
+
+
+def fold_name(value) -> str:
+    """'  Traoré   N’DIAYE ' -> "traore n'diaye" (accents retirés, casse ignorée, espaces compactés)."""
+    s = unicodedata.normalize("NFKD", str(value or ""))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = s.replace("’", "'").replace("`", "'")
+    return " ".join(s.split()).casefold()
+
+
+_RE_WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_words(value) -> list[str]:
+    """Mots indexés : "N'Diaye Saint-Louis" -> n, diaye, ndiaye, saint, louis, saintlouis."""
+    out = []
+    for word in fold_name(value).split():
+        parts = _RE_WORD.findall(word)
+        out.extend(parts)
+        if len(parts) > 1:
+            out.append("".join(parts))
+    return out
+
+
+def query_words(value) -> list[str]:
+    """Mots d'une requête, ponctuation interne retirée : "n'dia" -> ndia (préfixe de ndiaye)."""
+    return [t for t in ("".join(_RE_WORD.findall(w)) for w in fold_name(value).split()) if t]
+
+
+def compute_name_keys(obj, spec) -> dict:
+    """{colonne: valeur normalisée} pour une instance selon `spec` (NAME_KEYS), tronquée à max_length."""
+    out = {}
+    for key, sources in spec.items():
+        value = fold_name(" ".join(str(getattr(obj, f, "") or "") for f in sources))
+        out[key] = value[: obj._meta.get_field(key).max_length]
+    return out
+
+
+def apply_name_keys(obj, spec) -> list[str]:
+    """Met à jour les colonnes normalisées de l'instance ; renvoie celles qui ont changé."""
+    changed = []
+    for key, value in compute_name_keys(obj, spec).items():
+        if getattr(obj, key, None) != value:
+            setattr(obj, key, value)
+            changed.append(key)
+    return changed
+
+
+def _sources(spec) -> set[str]:
+    return {f for sources in spec.values() for f in sources}
+
+
+def backfill_name_keys(model, spec=None, batch_size: int = 1000) -> int:
+    """
+    Recalcule les colonnes normalisées de toutes les lignes (par lots, bulk_update des seules
+    lignes modifiées). `model` peut être un modèle historique (migration) : passer alors `spec`.
+    Renvoie le nombre de lignes mises à jour.
+    """
+    spec = spec or model.NAME_KEYS
+    fields = ["pk", *sorted(_sources(spec)), *spec]
+    updated, last_pk = 0, None
+    while True:
+        qs = model._base_manager.order_by("pk").only(*fields)
+        if last_pk is not None:
+            qs = qs.filter(pk__gt=last_pk)
+        rows = list(qs[:batch_size])
+        if not rows:
+            return updated
+        dirty = [obj for obj in rows if apply_name_keys(obj, spec)]
+        if dirty:
+            model._base_manager.bulk_update(dirty, list(spec), batch_size=batch_size)
+            updated += len(dirty)
+        last_pk = rows[-1].pk
+
+
+def backfill_name_keys_for(model, pks, batch_size: int = 1000) -> int:
+    """Recalcule les colonnes normalisées d'un ensemble de lignes précis."""
+    spec = model.NAME_KEYS
+    pks = list(pks)
+    updated = 0
+    for i in range(0, len(pks), batch_size):
+        chunk = pks[i:i + batch_size]
+        rows = list(model._base_manager.filter(pk__in=chunk).only("pk", *_sources(spec), *spec))
+        dirty = [obj for obj in rows if apply_name_keys(obj, spec)]
+        if dirty:
+            model._base_manager.bulk_update(dirty, list(spec))
+            updated += len(dirty)
+    return updated
+
+
+class NormalizedNameQuerySet(BulkSignalQuerySet):
+    """Garde les colonnes NAME_KEYS à jour sur les écritures groupées (qui contournent save())."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            apply_name_keys(obj, self.model.NAME_KEYS)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        spec = self.model.NAME_KEYS
+        fields = list(fields)
+        if _sources(spec) & set(fields):
+            objs = list(objs)
+            for obj in objs:
+                apply_name_keys(obj, spec)
+            fields += [k for k in spec if k not in fields]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
+
+    def update(self, **kwargs):
+        spec = self.model.NAME_KEYS
+        if not _sources(spec) & set(kwargs):
+            return super().update(**kwargs)
+        # Valeurs calculées (F(), Concat…) : on relit les lignes touchées pour recalculer.
+        # Transaction : les abonnés à bulk_write (on_commit) voient les colonnes déjà recalculées.
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            if pks:
+                backfill_name_keys_for(self.model, pks)
+        return rows
+
+    update.alters_data = True
+
+
+class NormalizedNameMixin:
+    """À placer avant models.Model : recalcule les colonnes NAME_KEYS à chaque save()."""
+
+    NAME_KEYS: dict = {}
+
+    def save(self, *args, **kwargs):
+        changed = apply_name_keys(self, self.NAME_KEYS)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and changed:
+            kwargs["update_fields"] = set(update_fields) | set(changed)
+        super().save(*args, **kwargs)
@@ -5,12 +5,14 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
-from matches.admin_views import quick_add_match_view, quick_events, quick_events_api
+from matches.admin_views import quick_add_match_view, quick_events, quick_events_api, round_import_view
 from players.admin_views import quick_add_players_view
 from clubs.admin_views import quick_clubs, quick_roster, quick_clubs_api  # <-- ✅ on importe l'API admin
 
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from profootgn.metrics import metrics_view
+
 
 def root_ping(request):
     return JsonResponse({
@@ -23,6 +25,7 @@ def root_ping(request):
         "endpoints": [
             "/api/",
             "/api/stats/",
+            "/api/search/?q=",
             "/admin/clubs/quick/",
             "/admin/clubs/quick/<id>/",
             "/admin/clubs/quick/api/",        # <-- ✅ exposée dans le ping pour debug
@@ -32,17 +35,20 @@ def root_ping(request):
 
 urlpatterns = [
     path("", root_ping, name="root"),
+    path("metrics", metrics_view, name="metrics"),
 
     # Admin Django + vues admin custom
     path("admin/matches/quick/", admin.site.admin_view(quick_add_match_view), name="admin_quick_match"),
     path("admin/players/quick/", admin.site.admin_view(quick_add_players_view), name="admin_quick_players"),
     path("admin/events/quick/", admin.site.admin_view(quick_events), name="admin_quick_events"),
     path("admin/events/api/", admin.site.admin_view(quick_events_api), name="admin_quick_events_api"),
+    path("admin/matches/round-import/", admin.site.admin_view(round_import_view), name="admin_round_import"),
 
     # 🔹 Hubs clubs rapides
     path("admin/clubs/quick/", admin.site.admin_view(quick_clubs), name="quick_clubs"),
     path("admin/clubs/quick/<int:club_id>/", admin.site.admin_view(quick_roster), name="quick_roster"),
-    path("admin/clubs/quick/api/", admin.site.admin_view(quick_clubs_api), name="quick_clubs_api"),  # <-- ✅ nouvelle route
+    # cacheable=True : pas de never_cache (no-store) qui annulerait la revalidation ETag/304 de la vue
+    path("admin/clubs/quick/api/", admin.site.admin_view(quick_clubs_api, cacheable=True), name="quick_clubs_api"),  # <-- ✅ nouvelle route
 
     path("admin/livefootgn/", admin.site.admin_view(quick_add_match_view), name="admin_livefootgn"),
     path("admin/", admin.site.urls),
@@ -59,6 +65,7 @@ urlpatterns = [
     path("api/", include("news.urls")),
     path("api/", include("recruitment.urls")),
     path("api/", include("users.urls")),
+    path("api/", include("search.urls")),
 ]
 
 if settings.DEBUG:
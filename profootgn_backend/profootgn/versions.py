@@ -0,0 +1,44 @@
+# profootgn/versions.py
+"""
+Jetons de version partagés entre workers (alias de cache `versions`, `default` s'il n'existe pas :
+séparé pour que la purge du cache principal ne les supprime pas).
+
+Un index mémoire (autocomplétion joueurs, recherche…) mémorise le jeton lu au moment de sa
+construction et se reconstruit quand il change. `bump()` pose un jeton unique plutôt qu'un
+compteur : deux écritures concurrentes ne peuvent pas produire la même valeur (pas de
+`incr` atomique sur le cache fichier).
+"""
+from __future__ import annotations
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+_TTL = None  # pas d'expiration : un jeton perdu (cache vidé) déclenche simplement une reconstruction
+
+
+def _cache():
+    return caches["versions" if "versions" in settings.CACHES else "default"]
+
+
+def _key(name: str) -> str:
+    return f"pfoot:version:{name}"
+
+
+def current(name: str) -> str:
+    """Jeton courant ; en crée un si absent (premier accès, cache vidé)."""
+    cache = _cache()
+    token = cache.get(_key(name))
+    if token is None:
+        token = uuid.uuid4().hex
+        if not cache.add(_key(name), token, _TTL):
+            token = cache.get(_key(name)) or token
+    return token
+
+
+def bump(name: str) -> str:
+    """Invalide les index construits sur `name` dans tous les workers."""
+    token = uuid.uuid4().hex
+    _cache().set(_key(name), token, _TTL)
+    return token
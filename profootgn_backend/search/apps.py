@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+    verbose_name = "Recherche"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from profootgn.signals import bulk_write
+        from . import index
+
+        # Index de recherche globale : clubs, joueurs, staff, actualités
+        for model, _qs, _make in index._sources().values():
+            uid = model.__name__
+            post_save.connect(index.on_save, sender=model, dispatch_uid=f"search_save_{uid}")
+            post_delete.connect(index.on_delete, sender=model, dispatch_uid=f"search_delete_{uid}")
+            bulk_write.connect(index.on_bulk_write, sender=model, dispatch_uid=f"search_bulk_{uid}")
@@ -0,0 +1,312 @@
+# search/index.py
+"""
+Index inversé mémoire de la recherche globale (`/api/search/`) : clubs, joueurs, staff, actualités.
+
+Un document = (type, id) avec un titre, un sous-titre et des champs pondérés. Les mots sont
+normalisés comme les colonnes *_norm (profootgn/text.py) : "Traoré" et "traore" se rejoignent.
+
+Un index publié (`_index`) n'est plus jamais modifié : les lectures se font sans verrou.
+
+Mise à jour :
+  - save/delete d'un objet indexé : le worker qui écrit copie son index (dictionnaires
+    externes ; seuls les mots touchés sont recopiés), y ajoute/retire le seul document, publie
+    la copie et change le jeton partagé "search" au commit ;
+  - les autres workers voient le jeton changer et reconstruisent (4 requêtes) à la recherche suivante ;
+  - écritures groupées (signal bulk_write) et renommage d'un club (titres des joueurs, staff,
+    actualités) : reconstruction.
+
+Requête : tous les mots doivent correspondre (ET) ; le dernier mot est un préfixe (saisie en cours).
+Score = somme des poids des champs touchés, mot exact > préfixe, bonus si le titre commence par la requête.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+
+from django.db import transaction
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+from profootgn.text import fold_name, query_words, tokenize_words
+
+VERSION_NAME = "search"
+TYPES = ("club", "player", "staff", "news")
+
+TITLE, DETAIL = 3.0, 1.0   # poids des champs
+PREFIX_FACTOR = 0.6        # un mot préfixé compte moins qu'un mot exact
+TITLE_START_BONUS = 2.0
+
+# ======================================
+# Documents (une fonction par type)
+# ======================================
+
+def _club_doc(c):
+    return {
+        "title": c.name,
+        "subtitle": c.city or "",
+        "image": c.logo.url if c.logo else "",
+        "fields": ((TITLE, c.name), (TITLE, c.short_name), (DETAIL, c.city), (DETAIL, c.stadium)),
+    }
+
+
+def _player_doc(p):
+    name = f"{p.first_name} {p.last_name}".strip() or f"Joueur #{p.pk}"
+    club = p.club.name if p.club_id and p.club else ""
+    return {
+        "title": name,
+        "subtitle": club,
+        "image": p.photo.url if p.photo else "",
+        "club_id": p.club_id,
+        "fields": ((TITLE, name), (DETAIL, club), (DETAIL, p.nationality)),
+    }
+
+
+def _staff_doc(s):
+    club = s.club.name if s.club_id and s.club else ""
+    return {
+        "title": s.full_name,
+        "subtitle": f"{s.get_role_display()} • {club}" if club else s.get_role_display(),
+        "image": s.photo.url if s.photo else "",
+        "club_id": s.club_id,
+        "fields": ((TITLE, s.full_name), (DETAIL, s.get_role_display()), (DETAIL, club)),
+    }
+
+
+def _news_doc(n):
+    club = n.club.name if n.club_id and n.club else ""
+    return {
+        "title": n.title,
+        "subtitle": club,
+        "image": n.cover.url if n.cover else "",
+        "slug": n.slug,
+        "club_id": n.club_id,
+        "fields": ((TITLE, n.title), (DETAIL, club)),
+    }
+
+
+def _sources():
+    """type -> (modèle, queryset de construction, fabrique de document)."""
+    from clubs.models import Club, StaffMember
+    from news.models import NewsItem
+    from players.models import Player
+
+    return {
+        "club": (Club, Club.objects.all(), _club_doc),
+        "player": (Player, Player.objects.select_related("club"), _player_doc),
+        "staff": (StaffMember, StaffMember.objects.select_related("club"), _staff_doc),
+        "news": (NewsItem, NewsItem.objects.select_related("club").defer("content"), _news_doc),
+    }
+
+
+# ======================================
+# Index
+# ======================================
+
+class SearchIndex:
+    def __init__(self, token=None):
+        self.token = token
+        self.docs = {}         # (type, id) -> document (sans "fields")
+        self.postings = {}     # mot -> {(type, id): poids}
+        self._doc_words = {}   # (type, id) -> {mots} (retrait)
+        self._vocab = None     # liste triée des mots (préfixes), recalculée à la demande
+        self._shared = set()   # mots dont le dict de postings est partagé avec l'index copié
+
+    def copy(self, token=None):
+        """Copie modifiable (add/remove) sans toucher à cet index, lu par d'autres threads."""
+        idx = SearchIndex(token)
+        idx.docs = dict(self.docs)
+        idx.postings = dict(self.postings)
+        idx._doc_words = dict(self._doc_words)
+        idx._vocab = self._vocab
+        idx._shared = set(self.postings)
+        return idx
+
+    def _bucket(self, word):
+        """Postings de `word` modifiables (recopiés au premier accès s'ils sont partagés)."""
+        bucket = self.postings.get(word)
+        if bucket is not None and word in self._shared:
+            bucket = self.postings[word] = dict(bucket)
+            self._shared.discard(word)
+        return bucket
+
+    @classmethod
+    def build(cls, token=None):
+        idx = cls(token)
+        for kind, (_model, qs, make) in _sources().items():
+            for obj in qs.iterator(chunk_size=2000):
+                idx.add(kind, obj.pk, make(obj))
+        return idx
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, kind, pk, doc):
+        key = (kind, pk)
+        self.remove(kind, pk)
+        weights = {}
+        for weight, value in doc.pop("fields"):
+            for word in tokenize_words(value):
+                weights[word] = max(weights.get(word, 0.0), weight)
+        for word, weight in weights.items():
+            bucket = self._bucket(word)
+            if bucket is None:
+                bucket = self.postings[word] = {}
+                self._vocab = None
+            bucket[key] = weight
+        self._doc_words[key] = set(weights)
+        doc["title_norm"] = fold_name(doc["title"])
+        self.docs[key] = doc
+
+    def remove(self, kind, pk):
+        key = (kind, pk)
+        for word in self._doc_words.pop(key, ()):
+            bucket = self._bucket(word)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self.postings[word]
+                    self._vocab = None
+        self.docs.pop(key, None)
+
+    def _prefixed(self, prefix):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        vocab = self._vocab
+        i = bisect_left(vocab, prefix)
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            yield vocab[i]
+            i += 1
+
+    def _word_scores(self, word, prefix) -> dict:
+        scores = dict(self.postings.get(word, ()))
+        if prefix:
+            for w in self._prefixed(word):
+                if w == word:
+                    continue
+                for key, weight in self.postings[w].items():
+                    s = weight * PREFIX_FACTOR
+                    if s > scores.get(key, 0.0):
+                        scores[key] = s
+        return scores
+
+    def match(self, q, types=None) -> dict:
+        """{(type, id): score} des documents qui contiennent tous les mots de q."""
+        words = query_words(q)
+        if not words:
+            return {}
+        total = None
+        for i, word in enumerate(words):
+            scores = self._word_scores(word, prefix=(i == len(words) - 1))
+            if types:
+                scores = {k: v for k, v in scores.items() if k[0] in types}
+            if total is None:
+                total = scores
+            else:
+                total = {k: total[k] + v for k, v in scores.items() if k in total}
+            if not total:
+                return {}
+        start = " ".join(words)
+        for key in total:
+            if self.docs[key]["title_norm"].startswith(start):
+                total[key] += TITLE_START_BONUS
+        return total
+
+    def ids(self, kind, q) -> list:
+        """IDs d'un type correspondant à q (filtres des vues existantes : pk__in)."""
+        return [pk for (_k, pk) in self.match(q, types={kind})]
+
+    def search(self, q, types=None, limit=20):
+        scores = self.match(q, types)
+        counts = {}
+        for kind, _pk in scores:
+            counts[kind] = counts.get(kind, 0) + 1
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self.docs[kv[0]]["title_norm"], kv[0][1]))
+        results = []
+        for (kind, pk), score in ranked[:limit]:
+            doc = {k: v for k, v in self.docs[(kind, pk)].items() if k != "title_norm"}
+            results.append({"type": kind, "id": pk, "score": round(score, 2), **doc})
+        return results, counts
+
+
+# ======================================
+# Index du process
+# ======================================
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    global _index
+    token = versions.current(VERSION_NAME)
+    idx = _index
+    hit = idx is not None and idx.token == token
+    record_cache("search_index", hit)
+    if hit:
+        return idx
+    with _lock:
+        # Jeton relu : _commit() a pu publier une copie à jour pendant l'attente du verrou
+        token = versions.current(VERSION_NAME)
+        if _index is None or _index.token != token:
+            _index = SearchIndex.build(token)
+        return _index
+
+
+def _type_of(model):
+    for kind, (m, _qs, _make) in _sources().items():
+        if m is model:
+            return kind
+    return None
+
+
+def _commit(apply=None):
+    """
+    Au commit : applique `apply(index)` à une copie de l'index local s'il était à jour, publie la
+    copie et change le jeton. Sans `apply` (ou index local en retard), l'index local sera
+    reconstruit comme les autres. Les recherches en cours gardent l'ancien index.
+    """
+    global _index
+    with _lock:
+        before = versions.current(VERSION_NAME)
+        token = versions.bump(VERSION_NAME)
+        if apply is not None and _index is not None and _index.token == before:
+            idx = _index.copy(token)
+            apply(idx)
+            _index = idx
+
+
+def on_save(sender, instance, created=False, update_fields=None, **kwargs):
+    kind = _type_of(sender)
+    if kind is None:
+        return
+    if kind == "club" and not created:
+        # Le nom du club apparaît dans les joueurs, le staff et les actualités
+        transaction.on_commit(_commit, using=kwargs.get("using"))
+        return
+    model, qs, make = _sources()[kind]
+    pk = instance.pk
+
+    def apply(idx):
+        obj = qs.filter(pk=pk).first()
+        if obj is None:
+            idx.remove(kind, pk)
+        else:
+            idx.add(kind, pk, make(obj))
+
+    transaction.on_commit(lambda: _commit(apply), using=kwargs.get("using"))
+
+
+def on_delete(sender, instance, **kwargs):
+    kind = _type_of(sender)
+    if kind is None:
+        return
+    if kind == "club":
+        # Joueurs et actualités passent sans club (SET_NULL, sans signal) : reconstruction
+        transaction.on_commit(_commit, using=kwargs.get("using"))
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: _commit(lambda idx: idx.remove(kind, pk)), using=kwargs.get("using"))
+
+
+def on_bulk_write(sender, **kwargs):
+    transaction.on_commit(_commit, using=kwargs.get("using"))
@@ -0,0 +1,32 @@
+# search/views.py
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .index import TYPES, get_index
+
+
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+def global_search(request):
+    """
+    GET /api/search/?q=<texte>&type=club,player,news&limit=20
+    Retour: {"query", "results": [{type, id, title, subtitle, image, score, ...}], "counts": {type: n}}
+    Le staff n'est renvoyé qu'aux comptes staff (comme /api/staff/).
+    """
+    q = (request.query_params.get("q") or "").strip()
+    try:
+        limit = max(1, min(int(request.query_params.get("limit") or 20), 100))
+    except ValueError:
+        limit = 20
+
+    allowed = set(TYPES)
+    if not (request.user and request.user.is_staff):
+        allowed.discard("staff")
+    wanted = {t.strip() for t in (request.query_params.get("type") or "").split(",") if t.strip()}
+    types = (wanted & allowed) if wanted else allowed
+
+    if not q or not types:
+        return Response({"query": q, "results": [], "counts": {}})
+    results, counts = get_index().search(q, types=types, limit=limit)
+    return Response({"query": q, "results": results, "counts": counts})
@@ -0,0 +1,221 @@
+# stats/aggregates.py
+"""
+Agrégats joueur × match (PlayerMatchStat), source des profils joueurs (stats/profile.py).
+
+Unité de recalcul : le match. Quand les buts ou cartons d'un match changent (save/delete,
+bulk_create des imports), ses lignes sont supprimées puis recalculées en 3 requêtes groupées
+sur les index (match, …) de Goal / Card. Les joueurs touchés (avant et après) voient leur
+jeton de version "player:<id>" changer : leur profil en cache est invalidé.
+
+Les recalculs sont regroupés : les signaux d'une transaction s'accumulent, le premier
+callback on_commit traite tout le lot (un import qui remplace 5 buts = 1 recalcul du match).
+QuerySet.update() sur Goal / Card (sans instances) : reconstruction complète.
+Le même lot porte les joueurs dont la discipline est à recalculer (stats/discipline.py), les
+paires de clubs des confrontations directes (stats/h2h.py) et la forme des clubs (stats/form.py).
+"""
+from __future__ import annotations
+
+import threading
+
+from django.db import transaction
+
+from profootgn import versions
+
+BATCH_SIZE = 500   # matchs par lot de reconstruction
+OVERVIEW_VERSION = "club_overview"   # = clubs/overview.py GLOBAL_VERSION
+
+
+def player_version(player_id) -> str:
+    return f"player:{player_id}"
+
+
+def build_rows(goal_model, card_model, match_ids) -> dict:
+    """
+    {(player_id, match_id): {goals, assists, yellow_cards, red_cards, goal_minutes}} des matchs donnés.
+    Modèles en paramètre : utilisable avec les modèles historiques d'une migration.
+    """
+    rows = {}
+
+    def row(player_id, match_id):
+        key = (player_id, match_id)
+        if key not in rows:
+            rows[key] = {"goals": 0, "assists": 0, "yellow_cards": 0, "red_cards": 0, "goal_minutes": []}
+        return rows[key]
+
+    goals = goal_model.objects.filter(match_id__in=match_ids)
+    for match_id, player_id, minute in goals.filter(player__isnull=False).values_list("match_id", "player_id", "minute"):
+        r = row(player_id, match_id)
+        r["goals"] += 1
+        r["goal_minutes"].append(minute)
+    for match_id, player_id in goals.filter(assist_player__isnull=False).values_list("match_id", "assist_player_id"):
+        row(player_id, match_id)["assists"] += 1
+    cards = card_model.objects.filter(match_id__in=match_ids, player__isnull=False)
+    for match_id, player_id, kind in cards.values_list("match_id", "player_id", "type"):
+        row(player_id, match_id)["red_cards" if kind == "R" else "yellow_cards"] += 1
+
+    for r in rows.values():
+        r["goal_minutes"].sort()
+    return rows
+
+
+def write_rows(stat_model, match_ids, rows) -> set:
+    """Remplace les lignes des matchs donnés ; renvoie les joueurs touchés (avant et après)."""
+    qs = stat_model.objects.filter(match_id__in=match_ids)
+    touched = set(qs.values_list("player_id", flat=True))
+    qs.delete()
+    stat_model.objects.bulk_create(
+        [stat_model(player_id=p, match_id=m, **values) for (p, m), values in rows.items()],
+        batch_size=1000,
+    )
+    return touched | {p for p, _m in rows}
+
+
+def refresh_matches(match_ids) -> set:
+    """Recalcule les agrégats des matchs donnés et invalide les profils des joueurs touchés."""
+    from matches.models import Card, Goal
+
+    from .models import PlayerMatchStat
+
+    match_ids = sorted(set(match_ids))
+    touched = set()
+    for i in range(0, len(match_ids), BATCH_SIZE):
+        chunk = match_ids[i:i + BATCH_SIZE]
+        with transaction.atomic():
+            touched |= write_rows(PlayerMatchStat, chunk, build_rows(Goal, Card, chunk))
+    for player_id in touched:
+        versions.bump(player_version(player_id))
+    return touched
+
+
+def rebuild_all(stdout=None) -> int:
+    """
+    Reconstruit tous les agrégats puis la discipline (commande `rebuild_player_stats`) ;
+    renvoie le nombre de lignes d'agrégats.
+    """
+    from matches.models import Match
+
+    from . import discipline
+    from .models import PlayerMatchStat
+
+    ids = list(Match.objects.order_by("id").values_list("id", flat=True))
+    PlayerMatchStat.objects.exclude(match_id__in=Match.objects.values("id")).delete()
+    for i in range(0, len(ids), BATCH_SIZE):
+        refresh_matches(ids[i:i + BATCH_SIZE])
+        if stdout is not None:
+            stdout.write(f"  {min(i + BATCH_SIZE, len(ids))}/{len(ids)} match(s)")
+    suspensions = discipline.rebuild_all()
+    if stdout is not None:
+        stdout.write(f"  discipline : {suspensions} suspension(s)")
+    return PlayerMatchStat.objects.count()
+
+
+# ======================================
+# Recalculs différés (receveurs de signaux)
+# ======================================
+
+_pending = threading.local()
+# Lot en attente : nom -> type (ensemble d'identifiants, ou drapeau de reconstruction complète)
+_PENDING = {
+    "ids": set, "full": bool,                                 # agrégats (matchs)
+    "players": set, "discipline_full": bool,                  # stats/discipline.py
+    "pairs": set, "pairs_full": bool,                         # stats/h2h.py
+    "form_matches": set, "form_clubs": set, "form_full": bool,   # stats/form.py
+}
+
+
+def _take() -> dict:
+    taken = {name: getattr(_pending, name, kind()) for name, kind in _PENDING.items()}
+    for name, kind in _PENDING.items():
+        setattr(_pending, name, kind())
+    return taken
+
+
+def _flush():
+    from . import discipline, form, h2h
+
+    batch = _take()
+    if batch["full"]:
+        rebuild_all()
+    else:
+        if batch["ids"]:
+            refresh_matches(batch["ids"])
+        if batch["discipline_full"]:
+            discipline.rebuild_all()
+        elif batch["players"]:
+            discipline.refresh_players(batch["players"])
+    if batch["pairs_full"]:
+        h2h.rebuild_all()
+    elif batch["pairs"]:
+        h2h.refresh_pairs(batch["pairs"])
+    if batch["form_full"]:
+        form.rebuild_all()
+    elif batch["form_matches"] or batch["form_clubs"]:
+        form.apply_matches(batch["form_matches"], batch["form_clubs"])
+    if batch["pairs_full"] or batch["pairs"] or batch["form_full"] or batch["form_matches"] or batch["form_clubs"]:
+        # Forme et départages figurent dans la vue d'ensemble des clubs : jeton changé après leur écriture
+        versions.bump(OVERVIEW_VERSION)
+
+
+def schedule(match_ids=(), using=None, **batch):
+    """
+    Ajoute au lot en attente des matchs (agrégats) et les autres clés de _PENDING (ensembles
+    complétés, drapeaux cumulés), puis planifie un traitement au commit. Après un rollback, le
+    lot resté en attente est simplement recalculé au commit suivant (idempotent).
+    """
+    if not hasattr(_pending, "ids"):
+        _take()
+    batch["ids"] = match_ids
+    for name, value in batch.items():
+        current = getattr(_pending, name)
+        if isinstance(current, set):
+            current.update(v for v in value if v)
+        else:
+            setattr(_pending, name, current or bool(value))
+    transaction.on_commit(_flush, using=using)
+
+
+def remember_match(sender, instance, raw=False, **kwargs):
+    """pre_save (but, carton) : match et joueur d'origine, au cas où l'événement change de match / joueur."""
+    if raw or not instance.pk:
+        return
+    instance._stats_old_match_id, instance._stats_old_player_id = (
+        sender._base_manager.filter(pk=instance.pk).values_list("match_id", "player_id").first() or (None, None)
+    )
+
+
+def on_event_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    schedule({instance.match_id, getattr(instance, "_stats_old_match_id", None)}, using=kwargs.get("using"))
+
+
+def on_event_bulk(sender, objs=None, **kwargs):
+    if objs is None:
+        schedule(full=True, using=kwargs.get("using"))
+    else:
+        schedule({o.match_id for o in objs}, using=kwargs.get("using"))
+
+
+def on_match_saved(sender, instance, raw=False, **kwargs):
+    """
+    post_save (match) : score, statut, date : la chronologie des joueurs du match change (agrégats
+    inchangés). pre_delete (match) : joueurs lus avant la suppression en cascade de leurs lignes
+    PlayerMatchStat (au commit, refresh_matches ne les retrouverait plus).
+    """
+    if raw:
+        return
+    from .models import PlayerMatchStat
+
+    players = list(PlayerMatchStat.objects.filter(match_id=instance.pk).values_list("player_id", flat=True))
+    if players:
+        def bump():
+            for player_id in players:
+                versions.bump(player_version(player_id))
+
+        transaction.on_commit(bump, using=kwargs.get("using"))
+
+
+def on_player_saved(sender, instance, raw=False, **kwargs):
+    """Fiche du joueur (nom, photo, club) : son profil en cache est invalidé."""
+    if not raw:
+        transaction.on_commit(lambda: versions.bump(player_version(instance.pk)), using=kwargs.get("using"))
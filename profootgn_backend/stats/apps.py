@@ -1,5 +1,44 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
 
 class StatsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stats'
+
+    def ready(self):
+        from matches.models import Card, Goal, Match
+        from players.models import Player
+        from profootgn.signals import bulk_write
+        from . import aggregates, discipline, form, h2h
+
+        # Agrégats joueur × match (stats/aggregates.py) : recalcul par match au commit
+        for model in (Goal, Card):
+            uid = model.__name__
+            pre_save.connect(aggregates.remember_match, sender=model, dispatch_uid=f"stats_pre_{uid}")
+            post_save.connect(aggregates.on_event_change, sender=model, dispatch_uid=f"stats_save_{uid}")
+            post_delete.connect(aggregates.on_event_change, sender=model, dispatch_uid=f"stats_delete_{uid}")
+            bulk_write.connect(aggregates.on_event_bulk, sender=model, dispatch_uid=f"stats_bulk_{uid}")
+        post_save.connect(aggregates.on_match_saved, sender=Match, dispatch_uid="stats_save_Match")
+        pre_delete.connect(aggregates.on_match_saved, sender=Match, dispatch_uid="stats_delete_Match")
+        post_save.connect(aggregates.on_player_saved, sender=Player, dispatch_uid="stats_save_Player")
+
+        # Discipline (stats/discipline.py) : recalcul par joueur, dans le même lot au commit
+        post_save.connect(discipline.on_card_change, sender=Card, dispatch_uid="discipline_save_Card")
+        post_delete.connect(discipline.on_card_change, sender=Card, dispatch_uid="discipline_delete_Card")
+        bulk_write.connect(discipline.on_card_bulk, sender=Card, dispatch_uid="discipline_bulk_Card")
+        post_save.connect(discipline.on_match_change, sender=Match, dispatch_uid="discipline_save_Match")
+        pre_delete.connect(discipline.on_match_change, sender=Match, dispatch_uid="discipline_delete_Match")
+        bulk_write.connect(discipline.on_match_bulk, sender=Match, dispatch_uid="discipline_bulk_Match")
+        post_save.connect(discipline.on_player_saved, sender=Player, dispatch_uid="discipline_save_Player")
+
+        # Confrontations directes (stats/h2h.py) : recalcul de la paire de clubs au commit
+        post_save.connect(h2h.on_match_change, sender=Match, dispatch_uid="h2h_save_Match")
+        post_delete.connect(h2h.on_match_change, sender=Match, dispatch_uid="h2h_delete_Match")
+        bulk_write.connect(h2h.on_match_bulk, sender=Match, dispatch_uid="h2h_bulk_Match")
+
+        # Forme et séries des clubs (stats/form.py) : ajout au commit quand un match se termine
+        pre_save.connect(form.remember_state, sender=Match, dispatch_uid="form_pre_Match")
+        post_save.connect(form.on_match_saved, sender=Match, dispatch_uid="form_save_Match")
+        post_delete.connect(form.on_match_deleted, sender=Match, dispatch_uid="form_delete_Match")
+        bulk_write.connect(form.on_match_bulk, sender=Match, dispatch_uid="form_bulk_Match")
@@ -0,0 +1,360 @@
+# stats/discipline.py
+"""
+Discipline : cumul des cartons jaunes et suspensions (`/api/stats/discipline/`,
+`/api/matches/{id}/unavailable/`).
+
+Unité de recalcul : le joueur. Ses cartons (index player de Card) sont rejoués dans l'ordre
+chronologique des matchs, selon les règles PFOOT_DISCIPLINE_* (settings) :
+  - deux jaunes dans un même match : expulsion, SECOND_YELLOW_BAN match(s) ; ces jaunes
+    n'entrent pas dans le cumul. Un rouge saisi en plus dans ce match (Card n'a que J / R : les
+    imports notent souvent l'expulsion J, J, R) est celui du deuxième jaune : une seule suspension ;
+  - un rouge (sans deux jaunes dans le match) : RED_BAN match(s) ;
+  - tous les YELLOW_THRESHOLD jaunes cumulés : YELLOW_BAN match(s), puis le cumul repart de zéro.
+Une suspension est purgée sur les matchs suivants du club du carton (hors reportés, annulés,
+suspendus), à la suite des suspensions précédentes du joueur dans ce club. Ces matchs sont
+enregistrés (Suspension.matches) : les indisponibles d'un match et la liste des suspendus sont
+des lectures d'index, sans parcours des cartons.
+
+Recalcul par lots de joueurs en un nombre fixe de requêtes, au commit, dans le même lot différé
+que stats/aggregates.py :
+  - carton créé / modifié / supprimé : son joueur (et l'ancien si le carton change de joueur) ;
+  - match créé / modifié / supprimé : joueurs sanctionnés dans ce match, suspensions qui le
+    couvrent et suspensions en cours des clubs ;
+  - QuerySet.update() sur Card / Match : tous les joueurs.
+Changer les règles demande `rebuild_player_stats`.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+PLAYABLE = ("SCHEDULED", "LIVE", "HT", "PAUSED", "FT", "FINISHED")   # matchs qui purgent une suspension
+FINISHED = ("FT", "FINISHED")
+BATCH_SIZE = 500   # joueurs par lot de recalcul
+
+# Motifs (Suspension.reason) ; ici pour le rejeu sans modèle (migrations)
+YELLOWS, SECOND_YELLOW, RED = "YELLOWS", "SECOND_YELLOW", "RED"
+
+
+def rules() -> dict:
+    return {
+        "yellow_threshold": max(1, int(getattr(settings, "PFOOT_DISCIPLINE_YELLOW_THRESHOLD", 3))),
+        "yellow_ban": int(getattr(settings, "PFOOT_DISCIPLINE_YELLOW_BAN", 1)),
+        "second_yellow_ban": int(getattr(settings, "PFOOT_DISCIPLINE_SECOND_YELLOW_BAN", 1)),
+        "red_ban": int(getattr(settings, "PFOOT_DISCIPLINE_RED_BAN", 1)),
+    }
+
+
+# ======================================
+# Rejeu des cartons (sans base)
+# ======================================
+
+def replay(cards, rules) -> tuple[dict, list]:
+    """
+    cards : [(match_id, club_id, type, datetime)] d'un joueur, triés chronologiquement.
+    Renvoie (compteurs, suspensions) ; suspension = {match_id, club_id, datetime, reason, length}.
+    """
+    per_match = {}
+    for match_id, club_id, kind, dt in cards:
+        e = per_match.setdefault(match_id, {"club_id": club_id, "datetime": dt, "Y": 0, "R": 0})
+        e["R" if kind == "R" else "Y"] += 1
+
+    totals = {"yellow_cards": 0, "red_cards": 0, "yellow_count": 0}
+    bans = []
+    for match_id, e in per_match.items():
+        totals["yellow_cards"] += e["Y"]
+        totals["red_cards"] += e["R"]
+
+        def ban(reason, length):
+            if length > 0:
+                bans.append({"match_id": match_id, "club_id": e["club_id"], "datetime": e["datetime"],
+                             "reason": reason, "length": length})
+
+        if e["Y"] >= 2:
+            ban(SECOND_YELLOW, rules["second_yellow_ban"])
+        elif e["Y"] == 1:
+            totals["yellow_count"] += 1
+            if totals["yellow_count"] >= rules["yellow_threshold"]:
+                totals["yellow_count"] = 0
+                ban(YELLOWS, rules["yellow_ban"])
+        if e["R"] and e["Y"] < 2:
+            ban(RED, rules["red_ban"])
+    return totals, bans
+
+
+def assign(bans, schedules) -> None:
+    """
+    Complète chaque suspension : "matches" (ids couverts), "served", "active".
+    schedules : {club_id: [(datetime, id, status)]} triés, matchs jouables du club.
+    """
+    next_free = {}   # club -> position du premier match non couvert par les suspensions précédentes
+    keys = {club_id: [(dt, pk) for dt, pk, _s in sched] for club_id, sched in schedules.items()}
+    for b in bans:
+        sched = schedules.get(b["club_id"], [])
+        start = max(bisect_right(keys.get(b["club_id"], []), (b["datetime"], b["match_id"])), next_free.get(b["club_id"], 0))
+        covered = sched[start:start + b["length"]]
+        next_free[b["club_id"]] = start + len(covered)
+        b["matches"] = [pk for _dt, pk, _s in covered]
+        b["served"] = sum(1 for *_x, status in covered if status in FINISHED)
+        b["active"] = b["served"] < b["length"]
+
+
+# ======================================
+# Recalcul (base)
+# ======================================
+
+def _schedules(Match, since) -> dict:
+    """
+    {club_id: [(datetime, id, status)]} des matchs jouables après `since[club_id]` : une requête
+    pour tous les clubs (depuis la plus ancienne date), répartie par club ensuite.
+    """
+    out = {club_id: [] for club_id in since}
+    if not since:
+        return out
+    rows = Match.objects.filter(
+        Q(home_club_id__in=since) | Q(away_club_id__in=since),
+        datetime__gte=min(since.values()), status__in=PLAYABLE,
+    ).values_list("datetime", "id", "status", "home_club_id", "away_club_id")
+    for dt, pk, status, home, away in rows:
+        for club_id in {home, away}:
+            if club_id in since and dt >= since[club_id]:
+                out[club_id].append((dt, pk, status))
+    for sched in out.values():
+        sched.sort()
+    return out
+
+
+def refresh_players(player_ids, apps=global_apps) -> int:
+    """
+    Recalcule compteurs et suspensions des joueurs donnés ; renvoie le nombre de suspensions.
+    `apps` : registre des modèles (celui d'une migration pour les modèles historiques).
+    """
+    Card, Match = apps.get_model("matches", "Card"), apps.get_model("matches", "Match")
+    Player = apps.get_model("players", "Player")
+    PlayerDiscipline, Suspension = apps.get_model("stats", "PlayerDiscipline"), apps.get_model("stats", "Suspension")
+
+    player_ids = sorted({p for p in player_ids if p})
+    conf, created = rules(), 0
+    for i in range(0, len(player_ids), BATCH_SIZE):
+        chunk = player_ids[i:i + BATCH_SIZE]
+        clubs = dict(Player.objects.filter(id__in=chunk).values_list("id", "club_id"))
+        cards = {}
+        qs = (
+            Card.objects.filter(player_id__in=clubs)
+            .order_by("player_id", "match__datetime", "match_id", "minute", "id")
+            .values_list("player_id", "match_id", "club_id", "type", "match__datetime")
+        )
+        for player_id, *card in qs:
+            cards.setdefault(player_id, []).append(card)
+
+        results = {p: replay(c, conf) for p, c in cards.items()}
+        since = {}
+        for _totals, bans in results.values():
+            for b in bans:
+                if b["club_id"] not in since or b["datetime"] < since[b["club_id"]]:
+                    since[b["club_id"]] = b["datetime"]
+        schedules = _schedules(Match, since)
+        for _totals, bans in results.values():
+            assign(bans, schedules)
+
+        with transaction.atomic():
+            Suspension.objects.filter(player_id__in=chunk).delete()
+            PlayerDiscipline.objects.filter(player_id__in=chunk).delete()
+            Suspension.objects.bulk_create(
+                [
+                    Suspension(player_id=p, club_id=b["club_id"], match_id=b["match_id"], reason=b["reason"],
+                               length=b["length"], served=b["served"], active=b["active"])
+                    for p, (_t, bans) in results.items() for b in bans
+                ],
+                batch_size=1000,
+            )
+            # bulk_create ne renvoie pas les clés sous MySQL : relecture par la contrainte unique
+            ids = {
+                (p, m, r): pk
+                for pk, p, m, r in Suspension.objects.filter(player_id__in=chunk)
+                .values_list("id", "player_id", "match_id", "reason")
+            }
+            through = Suspension.matches.through
+            through.objects.bulk_create(
+                [
+                    through(suspension_id=ids[(p, b["match_id"], b["reason"])], match_id=m)
+                    for p, (_t, bans) in results.items() for b in bans for m in b["matches"]
+                ],
+                batch_size=1000,
+            )
+            PlayerDiscipline.objects.bulk_create(
+                [
+                    PlayerDiscipline(
+                        player_id=p, club_id=clubs.get(p), **totals,
+                        suspended_matches=sum(b["length"] - b["served"] for b in bans if b["active"]),
+                    )
+                    for p, (totals, bans) in results.items()
+                ],
+                batch_size=1000,
+            )
+        created += len(ids)
+    return created
+
+
+def rebuild_all(apps=global_apps) -> int:
+    """Tous les joueurs ayant (eu) des cartons ; renvoie le nombre de suspensions."""
+    Card = apps.get_model("matches", "Card")
+    PlayerDiscipline, Suspension = apps.get_model("stats", "PlayerDiscipline"), apps.get_model("stats", "Suspension")
+
+    players = set(Card.objects.filter(player__isnull=False).values_list("player_id", flat=True).distinct())
+    players |= set(PlayerDiscipline.objects.values_list("player_id", flat=True))
+    players |= set(Suspension.objects.values_list("player_id", flat=True).distinct())
+    return refresh_players(players, apps)
+
+
+# ======================================
+# Lectures
+# ======================================
+
+def _player(p) -> dict:
+    return {"id": p.id, "full_name": f"{p.first_name} {p.last_name}".strip(), "number": p.number or None}
+
+
+def _suspension(s) -> dict:
+    return {
+        "id": s.id,
+        "reason": s.reason,
+        "reason_display": s.get_reason_display(),
+        "club": s.club_id,
+        "card_match": s.match_id,
+        "length": s.length,
+        "served": s.served,
+        "remaining": s.length - s.served,
+        "matches": sorted(m.id for m in s.matches.all()),
+    }
+
+
+def table(club_id=None, suspended_only=False) -> dict:
+    """Compteurs des joueurs (suspendus d'abord, puis les plus proches du seuil) : 3 requêtes."""
+    from django.db.models import Prefetch
+
+    from .models import PlayerDiscipline, Suspension
+
+    conf = rules()
+    qs = PlayerDiscipline.objects.select_related("player", "club").prefetch_related(
+        Prefetch("player__suspensions", queryset=Suspension.objects.filter(active=True)
+                 .prefetch_related("matches").order_by("match__datetime", "id"), to_attr="active_suspensions"),
+    )
+    if club_id:
+        qs = qs.filter(club_id=club_id)
+    if suspended_only:
+        qs = qs.filter(suspended_matches__gt=0)
+    qs = qs.order_by("-suspended_matches", "-yellow_count", "-red_cards", "-yellow_cards",
+                     "player__last_name", "player_id")
+    results = []
+    for d in qs:
+        results.append({
+            "player": _player(d.player),
+            "club": d.club_id,
+            "club_name": d.club.name if d.club_id else None,
+            "yellow_cards": d.yellow_cards,
+            "red_cards": d.red_cards,
+            "yellow_count": d.yellow_count,
+            "yellows_to_ban": conf["yellow_threshold"] - d.yellow_count,
+            "suspended_matches": d.suspended_matches,
+            "suspensions": [_suspension(s) for s in d.player.active_suspensions],
+        })
+    return {"rules": conf, "count": len(results), "results": results}
+
+
+def unavailable(match) -> dict:
+    """Joueurs suspendus pour ce match, par équipe : une lecture de la table de liaison."""
+    from .models import Suspension
+
+    sides = {match.home_club_id: [], match.away_club_id: []}
+    qs = (
+        Suspension.objects.filter(matches=match.pk)
+        .select_related("player")
+        .prefetch_related("matches")
+        .order_by("player__last_name", "player_id", "id")
+    )
+    for s in qs:
+        if s.club_id in sides:
+            sides[s.club_id].append({"player": _player(s.player), **_suspension(s)})
+    return {
+        "match": match.pk,
+        "home_club": match.home_club_id,
+        "away_club": match.away_club_id,
+        "home": sides[match.home_club_id],
+        "away": sides[match.away_club_id],
+    }
+
+
+# ======================================
+# Recalculs différés (receveurs de signaux)
+# ======================================
+
+def _schedule(players=(), full=False, using=None):
+    from . import aggregates
+
+    aggregates.schedule(players=players, discipline_full=full, using=using)
+
+
+def on_card_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _schedule({instance.player_id, getattr(instance, "_stats_old_player_id", None)}, using=kwargs.get("using"))
+
+
+def on_card_bulk(sender, objs=None, **kwargs):
+    if objs is None:
+        _schedule(full=True, using=kwargs.get("using"))
+    else:
+        _schedule({o.player_id for o in objs}, using=kwargs.get("using"))
+
+
+def _match_players(match_ids, club_ids) -> set:
+    from matches.models import Card
+
+    from .models import Suspension
+
+    players = set(Card.objects.filter(match_id__in=match_ids, player__isnull=False).values_list("player_id", flat=True))
+    players |= set(
+        Suspension.objects.filter(Q(club_id__in=club_ids, active=True) | Q(matches__in=match_ids))
+        .values_list("player_id", flat=True).distinct()
+    )
+    return players
+
+
+DATE_FIELDS = {"datetime", "status", "home_club", "away_club", "home_club_id", "away_club_id"}
+
+
+def on_match_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save / pre_delete (match) : date, statut ou clubs changent l'ordre et la purge des suspensions."""
+    if raw or (update_fields is not None and not DATE_FIELDS & set(update_fields)):
+        return
+    # Anciens clubs mémorisés par clubs/fixtures.py (pre_save) si le match change de club
+    clubs = {instance.home_club_id, instance.away_club_id, *getattr(instance, "_fixtures_old_clubs", ())}
+    players = _match_players([instance.pk], [c for c in clubs if c])
+    if players:
+        _schedule(players, using=kwargs.get("using"))
+
+
+def on_match_bulk(sender, objs=None, **kwargs):
+    if objs is None:
+        _schedule(full=True, using=kwargs.get("using"))
+        return
+    # bulk_create sous MySQL : pas de clés, les suspensions en cours des clubs suffisent
+    clubs = {c for o in objs for c in (o.home_club_id, o.away_club_id) if c}
+    players = _match_players([o.pk for o in objs if o.pk], clubs)
+    if players:
+        _schedule(players, using=kwargs.get("using"))
+
+
+def on_player_saved(sender, instance, raw=False, **kwargs):
+    """Le club du joueur (filtre ?club=) suit sa fiche ; une requête, sans recalcul."""
+    from .models import PlayerDiscipline
+
+    if not raw:
+        PlayerDiscipline.objects.filter(player_id=instance.pk).exclude(club_id=instance.club_id).update(
+            club_id=instance.club_id,
+        )
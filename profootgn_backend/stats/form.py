@@ -0,0 +1,222 @@
+# stats/form.py
+"""
+Forme des clubs (5 derniers résultats) et séries (victoires, invaincu, sans victoire, défaites,
+clean sheets), stockées par club (ClubForm) : les classements et la vue d'ensemble d'un club
+les lisent par jointure, sans requête supplémentaire.
+
+Un seul parcours ordonné (datetime, id) des matchs terminés alimente tous les clubs
+(`rebuild_all`, commande `rebuild_player_stats`). Ensuite, au commit (lot différé de
+stats/aggregates.py) :
+  - un match qui passe à terminé, plus récent que le dernier match compté du club :
+    ajout en O(1) (même fonction `apply` que le parcours complet) ;
+  - score / date / clubs d'un match déjà terminé, match terminé supprimé, match plus ancien
+    que le dernier compté, écritures groupées : recalcul des clubs concernés (leurs seuls
+    matchs, index (home_club, datetime) / (away_club, datetime)) ;
+  - QuerySet.update() sur Match : reconstruction complète.
+"""
+from __future__ import annotations
+
+from django.apps import apps as global_apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+FINISHED = ("FT", "FINISHED")
+FORM_SIZE = 5
+RESULTS_KEPT = 10   # = ClubForm.results.max_length
+FIELDS = ("id", "datetime", "home_club_id", "away_club_id", "home_score", "away_score")
+MATCH_FIELDS = {"status", "home_score", "away_score", "datetime",
+                "home_club", "away_club", "home_club_id", "away_club_id"}
+STATE_FIELDS = (
+    "results", "played", "clean_sheets", "win_streak", "unbeaten_streak", "winless_streak",
+    "losing_streak", "clean_sheet_streak", "best_win_streak", "best_unbeaten_streak",
+    "last_match_id", "last_datetime",
+)
+
+
+def blank() -> dict:
+    return {f: 0 for f in STATE_FIELDS} | {"results": "", "last_match_id": None, "last_datetime": None}
+
+
+def apply(state, goals_for, goals_against, match_id, dt) -> None:
+    """Ajoute un match terminé (le plus récent) à l'état d'un club."""
+    win, loss = goals_for > goals_against, goals_for < goals_against
+    state["results"] = ("W" if win else "L" if loss else "D") + state["results"][:RESULTS_KEPT - 1]
+    state["played"] += 1
+    state["win_streak"] = state["win_streak"] + 1 if win else 0
+    state["unbeaten_streak"] = 0 if loss else state["unbeaten_streak"] + 1
+    state["winless_streak"] = 0 if win else state["winless_streak"] + 1
+    state["losing_streak"] = state["losing_streak"] + 1 if loss else 0
+    clean = goals_against == 0
+    state["clean_sheets"] += int(clean)
+    state["clean_sheet_streak"] = state["clean_sheet_streak"] + 1 if clean else 0
+    state["best_win_streak"] = max(state["best_win_streak"], state["win_streak"])
+    state["best_unbeaten_streak"] = max(state["best_unbeaten_streak"], state["unbeaten_streak"])
+    state["last_match_id"], state["last_datetime"] = match_id, dt
+
+
+# ======================================
+# Calcul (base)
+# ======================================
+
+def rebuild_all(apps=global_apps) -> int:
+    """Tous les clubs en un parcours ordonné des matchs terminés ; renvoie le nombre de clubs."""
+    Match, ClubForm = apps.get_model("matches", "Match"), apps.get_model("stats", "ClubForm")
+
+    states = {}
+    rows = Match.objects.filter(status__in=FINISHED).order_by("datetime", "id").values_list(*FIELDS)
+    for mid, dt, home, away, hs, as_ in rows.iterator(chunk_size=5000):
+        hs, as_ = int(hs or 0), int(as_ or 0)
+        apply(states.setdefault(home, blank()), hs, as_, mid, dt)
+        apply(states.setdefault(away, blank()), as_, hs, mid, dt)
+    with transaction.atomic():
+        ClubForm.objects.all().delete()
+        ClubForm.objects.bulk_create([ClubForm(club_id=c, **state) for c, state in states.items()])
+    return len(states)
+
+
+def refresh_clubs(club_ids, apps=global_apps) -> None:
+    """Recalcule les clubs donnés à partir de leurs seuls matchs terminés (deux parcours d'index par club)."""
+    Club = apps.get_model("clubs", "Club")
+    Match, ClubForm = apps.get_model("matches", "Match"), apps.get_model("stats", "ClubForm")
+
+    existing = set(Club.objects.filter(id__in={c for c in club_ids if c}).values_list("id", flat=True))
+    for club_id in sorted(existing):
+        home = Match.objects.filter(home_club_id=club_id, status__in=FINISHED).values_list(*FIELDS)
+        away = Match.objects.filter(away_club_id=club_id, status__in=FINISHED).values_list(*FIELDS)
+        state = blank()
+        for mid, dt, h, _a, hs, as_ in sorted(home.order_by().union(away.order_by(), all=True),
+                                              key=lambda r: (r[1], r[0])):
+            hs, as_ = int(hs or 0), int(as_ or 0)
+            gf, ga = (hs, as_) if h == club_id else (as_, hs)
+            apply(state, gf, ga, mid, dt)
+        ClubForm.objects.update_or_create(club_id=club_id, defaults=state)
+
+
+def apply_matches(match_ids, club_ids=()) -> None:
+    """
+    Traitement au commit : matchs passés à terminé (match_ids) et clubs à recalculer (club_ids).
+    Ajout en O(1) quand le match est postérieur au dernier match compté, recalcul du club sinon.
+    """
+    from matches.models import Match
+
+    from .models import ClubForm
+
+    recompute = {c for c in club_ids if c}
+    rows = sorted(
+        Match.objects.filter(id__in=match_ids, status__in=FINISHED).values_list(*FIELDS),
+        key=lambda r: (r[1], r[0]),
+    )
+    clubs = {c for r in rows for c in (r[2], r[3])} - recompute
+    forms = {f.club_id: f for f in ClubForm.objects.filter(club_id__in=clubs)}
+    states = {}
+    for mid, dt, home, away, hs, as_ in rows:
+        hs, as_ = int(hs or 0), int(as_ or 0)
+        for club_id, gf, ga in ((home, hs, as_), (away, as_, hs)):
+            if club_id in recompute:
+                continue
+            state = states.get(club_id)
+            if state is None and club_id in forms:
+                state = states[club_id] = {name: getattr(forms[club_id], name) for name in STATE_FIELDS}
+            if state is None:
+                recompute.add(club_id)   # club sans état
+                continue
+            if state["last_datetime"] is not None and (dt, mid) <= (state["last_datetime"], state["last_match_id"]):
+                recompute.add(club_id)   # match antérieur au dernier compté : l'ordre change
+                states.pop(club_id)
+                continue
+            apply(state, gf, ga, mid, dt)
+    with transaction.atomic():
+        for club_id, state in states.items():
+            if club_id not in recompute:
+                ClubForm.objects.update_or_create(club_id=club_id, defaults=state)
+    if recompute:
+        refresh_clubs(recompute)
+
+
+# ======================================
+# Lectures (sans requête : jointure ou valeurs déjà chargées)
+# ======================================
+
+def summary(values) -> dict:
+    """values : dict des champs de ClubForm (ou None) -> bloc "forme" des réponses."""
+    v = values or blank()
+    results = v["results"] or ""
+    return {
+        "form": results[:FORM_SIZE],
+        "results": results,
+        "clean_sheets": v["clean_sheets"] or 0,
+        "streaks": {
+            "win": v["win_streak"] or 0,
+            "unbeaten": v["unbeaten_streak"] or 0,
+            "winless": v["winless_streak"] or 0,
+            "losing": v["losing_streak"] or 0,
+            "clean_sheet": v["clean_sheet_streak"] or 0,
+            "best_win": v["best_win_streak"] or 0,
+            "best_unbeaten": v["best_unbeaten_streak"] or 0,
+        },
+    }
+
+
+def club_summary(club) -> dict:
+    """Club chargé avec select_related("form_guide")."""
+    try:
+        f = club.form_guide
+    except ObjectDoesNotExist:
+        return summary(None)
+    return summary({name: getattr(f, name) for name in STATE_FIELDS})
+
+
+# Pour values() / values_list() sur Club : "form_guide__<champ>"
+VALUE_FIELDS = tuple(f"form_guide__{name}" for name in STATE_FIELDS)
+
+
+def values_summary(row) -> dict:
+    """row : dict contenant les clés VALUE_FIELDS (jointure gauche : None sans ligne ClubForm)."""
+    if row.get("form_guide__played") is None:
+        return summary(None)
+    return summary({name: row[f"form_guide__{name}"] for name in STATE_FIELDS})
+
+
+# ======================================
+# Receveurs de signaux
+# ======================================
+
+def remember_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """pre_save (match) : statut et clubs avant modification (un match déjà compté impose un recalcul)."""
+    if raw or not instance.pk or (update_fields is not None and not MATCH_FIELDS & set(update_fields)):
+        return
+    instance._form_old = sender._base_manager.filter(pk=instance.pk).values_list(
+        "status", "home_club_id", "away_club_id",
+    ).first()
+
+
+def on_match_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    from . import aggregates
+
+    if raw or (update_fields is not None and not MATCH_FIELDS & set(update_fields)):
+        return
+    old = getattr(instance, "_form_old", None)
+    if old and old[0] in FINISHED:
+        # Déjà compté : score, date ou clubs corrigés -> recalcul (anciens et nouveaux clubs)
+        clubs = {old[1], old[2], instance.home_club_id, instance.away_club_id}
+        aggregates.schedule(form_clubs=clubs, using=kwargs.get("using"))
+    elif instance.status in FINISHED:
+        aggregates.schedule(form_matches={instance.pk}, using=kwargs.get("using"))
+
+
+def on_match_deleted(sender, instance, **kwargs):
+    from . import aggregates
+
+    if instance.status in FINISHED:
+        aggregates.schedule(form_clubs={instance.home_club_id, instance.away_club_id}, using=kwargs.get("using"))
+
+
+def on_match_bulk(sender, objs=None, **kwargs):
+    from . import aggregates
+
+    if objs is None:
+        aggregates.schedule(form_full=True, using=kwargs.get("using"))
+    else:
+        # États précédents inconnus : recalcul des clubs touchés
+        clubs = {c for o in objs for c in (o.home_club_id, o.away_club_id)}
+        aggregates.schedule(form_clubs=clubs, using=kwargs.get("using"))
@@ -0,0 +1,221 @@
+# stats/h2h.py
+"""
+Confrontations directes (`/api/matches/{id}/h2h/`, `/api/clubs/{a}/h2h/{b}/`) et départage
+des égalités de points au classement.
+
+Une ligne ClubPairRecord par paire non ordonnée (club_a < club_b) : victoires / nuls / défaites,
+buts et LAST_MEETINGS dernières rencontres, matchs terminés seulement. Lecture = une ligne par
+la contrainte unique (club_a, club_b), orientée au moment de la lecture.
+
+Recalcul de la paire au commit (lot différé de stats/aggregates.py) : match créé, modifié
+(statut, score, date, clubs ; l'ancienne paire aussi si les clubs changent) ou supprimé.
+QuerySet.update() sur Match : reconstruction complète, en un parcours des matchs terminés.
+"""
+from __future__ import annotations
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
+
+FINISHED = ("FT", "FINISHED")
+LAST_MEETINGS = 10
+BATCH_SIZE = 200   # paires par requête de recalcul
+FIELDS = ("id", "datetime", "home_club_id", "away_club_id", "home_score", "away_score")
+MATCH_FIELDS = {"status", "home_score", "away_score", "datetime",
+                "home_club", "away_club", "home_club_id", "away_club_id"}
+
+
+def pair_key(a, b) -> tuple:
+    return (a, b) if a < b else (b, a)
+
+
+# ======================================
+# Construction
+# ======================================
+
+def _records(rows) -> dict:
+    """
+    rows : [(id, datetime, home, away, home_score, away_score)] plus récents d'abord.
+    Renvoie {(club_a, club_b): champs de ClubPairRecord}.
+    """
+    out = {}
+    for mid, dt, home, away, hs, as_ in rows:
+        key = pair_key(home, away)
+        r = out.get(key)
+        if r is None:
+            r = out[key] = {"played": 0, "a_wins": 0, "draws": 0, "b_wins": 0, "a_goals": 0, "b_goals": 0,
+                            "last_meetings": []}
+        hs, as_ = int(hs or 0), int(as_ or 0)
+        a_goals, b_goals = (hs, as_) if home == key[0] else (as_, hs)
+        r["played"] += 1
+        r["a_goals"] += a_goals
+        r["b_goals"] += b_goals
+        r["a_wins" if a_goals > b_goals else "b_wins" if a_goals < b_goals else "draws"] += 1
+        if len(r["last_meetings"]) < LAST_MEETINGS:
+            r["last_meetings"].append({
+                "id": mid, "datetime": dt.isoformat() if dt else None,
+                "home_club": home, "away_club": away, "home_score": hs, "away_score": as_,
+            })
+    return out
+
+
+def _write(PairRecord, keys, records) -> None:
+    if keys is None:
+        PairRecord.objects.all().delete()
+    else:
+        cond = Q()
+        for a, b in keys:
+            cond |= Q(club_a_id=a, club_b_id=b)
+        PairRecord.objects.filter(cond).delete()
+    PairRecord.objects.bulk_create(
+        [PairRecord(club_a_id=a, club_b_id=b, **values) for (a, b), values in records.items()],
+        batch_size=1000,
+    )
+
+
+def refresh_pairs(pairs, apps=global_apps) -> None:
+    """Recalcule les paires données : une requête (OR des deux sens, index (home_club, datetime)) par lot."""
+    Match, PairRecord = apps.get_model("matches", "Match"), apps.get_model("stats", "ClubPairRecord")
+
+    keys = sorted({pair_key(a, b) for a, b in pairs if a and b and a != b})
+    for i in range(0, len(keys), BATCH_SIZE):
+        chunk = keys[i:i + BATCH_SIZE]
+        cond = Q()
+        for a, b in chunk:
+            cond |= Q(home_club_id=a, away_club_id=b) | Q(home_club_id=b, away_club_id=a)
+        rows = Match.objects.filter(cond, status__in=FINISHED).order_by("-datetime", "-id").values_list(*FIELDS)
+        with transaction.atomic():
+            _write(PairRecord, chunk, _records(rows))
+
+
+def rebuild_all(apps=global_apps) -> int:
+    """Toutes les paires en un parcours des matchs terminés ; renvoie le nombre de paires."""
+    Match, PairRecord = apps.get_model("matches", "Match"), apps.get_model("stats", "ClubPairRecord")
+
+    rows = Match.objects.filter(status__in=FINISHED).order_by("-datetime", "-id").values_list(*FIELDS)
+    records = _records(rows.iterator(chunk_size=5000))
+    with transaction.atomic():
+        _write(PairRecord, None, records)
+    return len(records)
+
+
+# ======================================
+# Lectures
+# ======================================
+
+def record(club_id, other_id) -> dict:
+    """Bilan vu de `club_id` face à `other_id` : une requête (deux si les clubs ne se sont jamais affrontés)."""
+    from clubs.models import Club
+
+    from .models import ClubPairRecord
+
+    a, b = pair_key(club_id, other_id)
+    rec = ClubPairRecord.objects.select_related("club_a", "club_b").filter(club_a_id=a, club_b_id=b).first()
+    if rec is not None:
+        clubs = {rec.club_a_id: rec.club_a, rec.club_b_id: rec.club_b}
+    else:
+        clubs = Club.objects.only("id", "name").in_bulk([a, b])
+        if len(clubs) < 2:
+            raise Http404("Club introuvable.")
+
+    played = draws = wins = losses = gf = ga = 0
+    last = []
+    if rec is not None:
+        played, draws, last = rec.played, rec.draws, rec.last_meetings
+        if club_id == a:
+            wins, losses, gf, ga = rec.a_wins, rec.b_wins, rec.a_goals, rec.b_goals
+        else:
+            wins, losses, gf, ga = rec.b_wins, rec.a_wins, rec.b_goals, rec.a_goals
+    meetings = []
+    for m in last:
+        home = m["home_club"] == club_id
+        mf, ma = (m["home_score"], m["away_score"]) if home else (m["away_score"], m["home_score"])
+        meetings.append({**m, "result": "W" if mf > ma else "L" if mf < ma else "D"})
+    return {
+        "club": {"id": club_id, "name": clubs[club_id].name},
+        "opponent": {"id": other_id, "name": clubs[other_id].name},
+        "played": played,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "goals_for": gf,
+        "goals_against": ga,
+        "last_meetings": meetings,
+    }
+
+
+# ======================================
+# Départage du classement
+# ======================================
+
+def sort_standings(rows) -> list:
+    """
+    rows : lignes déjà triées (points, diff, BM, nom) avec club_id / points.
+    Si PFOOT_STANDINGS_H2H_TIEBREAK, chaque groupe de clubs à égalité de points est départagé
+    par le mini-classement de leurs confrontations (points, diff, buts), l'ordre initial
+    départageant le reste. Une requête, seulement s'il y a des égalités.
+    """
+    from .models import ClubPairRecord
+
+    if not getattr(settings, "PFOOT_STANDINGS_H2H_TIEBREAK", True):
+        return rows
+    groups, tied = [], set()
+    for row in rows:
+        if groups and groups[-1][0]["points"] == row["points"]:
+            groups[-1].append(row)
+        else:
+            groups.append([row])
+    for group in groups:
+        if len(group) > 1:
+            tied.update(r["club_id"] for r in group)
+    if not tied:
+        return rows
+
+    pairs = {
+        (rec.club_a_id, rec.club_b_id): rec
+        for rec in ClubPairRecord.objects.filter(club_a_id__in=tied, club_b_id__in=tied)
+        .only("club_a_id", "club_b_id", "a_wins", "draws", "b_wins", "a_goals", "b_goals")
+    }
+    out = []
+    for group in groups:
+        if len(group) > 1:
+            mini = {r["club_id"]: [0, 0, 0] for r in group}   # points, diff, buts
+            for (a, b), rec in pairs.items():
+                if a in mini and b in mini:
+                    mini[a][0] += 3 * rec.a_wins + rec.draws
+                    mini[b][0] += 3 * rec.b_wins + rec.draws
+                    mini[a][1] += rec.a_goals - rec.b_goals
+                    mini[b][1] += rec.b_goals - rec.a_goals
+                    mini[a][2] += rec.a_goals
+                    mini[b][2] += rec.b_goals
+            group = sorted(group, key=lambda r: [-v for v in mini[r["club_id"]]])
+        out.extend(group)
+    return out
+
+
+# ======================================
+# Recalculs différés (receveurs de signaux)
+# ======================================
+
+def on_match_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save / post_delete (match) ; anciens clubs mémorisés par clubs/fixtures.py (pre_save)."""
+    from . import aggregates
+
+    if raw or (update_fields is not None and not MATCH_FIELDS & set(update_fields)):
+        return
+    pairs = {(instance.home_club_id, instance.away_club_id)}
+    old = getattr(instance, "_fixtures_old_clubs", ())
+    if len(old) == 2:
+        pairs.add(tuple(old))
+    aggregates.schedule(pairs=pairs, using=kwargs.get("using"))
+
+
+def on_match_bulk(sender, objs=None, **kwargs):
+    from . import aggregates
+
+    if objs is None:
+        aggregates.schedule(pairs_full=True, using=kwargs.get("using"))
+    else:
+        aggregates.schedule(pairs={(o.home_club_id, o.away_club_id) for o in objs}, using=kwargs.get("using"))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from stats import form, h2h
+from stats.aggregates import rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruit les agrégats joueur × match (profils joueurs), la discipline, les confrontations "
+        "directes et la forme des clubs à partir des buts, cartons et matchs."
+    )
+
+    def handle(self, *args, **opts):
+        t0 = time.perf_counter()
+        rows = rebuild_all(stdout=self.stdout if opts["verbosity"] > 1 else None)
+        pairs = h2h.rebuild_all()
+        clubs = form.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {rows} ligne(s) d'agrégats, {pairs} paire(s) de clubs, forme de {clubs} club(s) "
+            f"en {time.perf_counter() - t0:.1f}s"
+        ))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from stats.aggregates import BATCH_SIZE, build_rows, write_rows
+
+
+def build_existing(apps, schema_editor):
+    Goal = apps.get_model("matches", "Goal")
+    Card = apps.get_model("matches", "Card")
+    Match = apps.get_model("matches", "Match")
+    PlayerMatchStat = apps.get_model("stats", "PlayerMatchStat")
+    ids = list(Match.objects.order_by("id").values_list("id", flat=True))
+    for i in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[i:i + BATCH_SIZE]
+        write_rows(PlayerMatchStat, chunk, build_rows(Goal, Card, chunk))
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('matches', '0006_composite_indexes'),
+        ('players', '0004_normalized_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerMatchStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('goals', models.PositiveSmallIntegerField(default=0)),
+                ('assists', models.PositiveSmallIntegerField(default=0)),
+                ('yellow_cards', models.PositiveSmallIntegerField(default=0)),
+                ('red_cards', models.PositiveSmallIntegerField(default=0)),
+                ('goal_minutes', models.JSONField(blank=True, default=list)),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='matches.match')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_stats', to='players.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('player', 'match'), name='player_match_stat_uniq')],
+            },
+        ),
+        migrations.RunPython(build_existing, migrations.RunPython.noop),
+    ]
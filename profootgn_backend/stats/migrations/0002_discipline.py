@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from stats.discipline import rebuild_all
+
+
+def build_existing(apps, schema_editor):
+    rebuild_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_normalized_names'),
+        ('matches', '0006_composite_indexes'),
+        ('players', '0004_normalized_names'),
+        ('stats', '0001_player_match_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerDiscipline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('yellow_cards', models.PositiveIntegerField(default=0)),
+                ('red_cards', models.PositiveIntegerField(default=0)),
+                ('yellow_count', models.PositiveSmallIntegerField(default=0)),
+                ('suspended_matches', models.PositiveSmallIntegerField(default=0)),
+                ('club', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='clubs.club')),
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='discipline', to='players.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['suspended_matches'], name='discipline_suspended_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Suspension',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('YELLOWS', 'Cumul de cartons jaunes'), ('SECOND_YELLOW', 'Deux jaunes dans le match'), ('RED', 'Carton rouge')], max_length=16)),
+                ('length', models.PositiveSmallIntegerField(default=1)),
+                ('served', models.PositiveSmallIntegerField(default=0)),
+                ('active', models.BooleanField(default=True)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clubs.club')),
+                ('match', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suspensions_given', to='matches.match')),
+                ('matches', models.ManyToManyField(blank=True, related_name='suspensions', to='matches.match')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='suspensions', to='players.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['club', 'active'], name='suspension_club_active_idx')],
+                'constraints': [models.UniqueConstraint(fields=('player', 'match', 'reason'), name='suspension_player_match_reason_uniq')],
+            },
+        ),
+        migrations.RunPython(build_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from stats.h2h import rebuild_all
+
+
+def build_existing(apps, schema_editor):
+    rebuild_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_normalized_names'),
+        ('stats', '0002_discipline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubPairRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('a_wins', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('b_wins', models.PositiveIntegerField(default=0)),
+                ('a_goals', models.PositiveIntegerField(default=0)),
+                ('b_goals', models.PositiveIntegerField(default=0)),
+                ('last_meetings', models.JSONField(blank=True, default=list)),
+                ('club_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clubs.club')),
+                ('club_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='clubs.club')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('club_a', 'club_b'), name='club_pair_record_uniq'), models.CheckConstraint(condition=models.Q(('club_a__lt', models.F('club_b'))), name='club_pair_record_ordered')],
+            },
+        ),
+        migrations.RunPython(build_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from stats.form import rebuild_all
+
+
+def build_existing(apps, schema_editor):
+    rebuild_all(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_normalized_names'),
+        ('matches', '0006_composite_indexes'),
+        ('stats', '0003_club_pair_records'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubForm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('results', models.CharField(blank=True, default='', max_length=10)),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('clean_sheets', models.PositiveIntegerField(default=0)),
+                ('win_streak', models.PositiveIntegerField(default=0)),
+                ('unbeaten_streak', models.PositiveIntegerField(default=0)),
+                ('winless_streak', models.PositiveIntegerField(default=0)),
+                ('losing_streak', models.PositiveIntegerField(default=0)),
+                ('clean_sheet_streak', models.PositiveIntegerField(default=0)),
+                ('best_win_streak', models.PositiveIntegerField(default=0)),
+                ('best_unbeaten_streak', models.PositiveIntegerField(default=0)),
+                ('last_datetime', models.DateTimeField(blank=True, null=True)),
+                ('club', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='form_guide', to='clubs.club')),
+                ('last_match', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='matches.match')),
+            ],
+        ),
+        migrations.RunPython(build_existing, migrations.RunPython.noop),
+    ]
@@ -1 +1,122 @@
 from django.db import models
+
+
+class PlayerMatchStat(models.Model):
+    """
+    Agrégat des événements d'un joueur dans un match (buts, passes décisives, cartons, minutes
+    des buts). Maintenu par stats/aggregates.py (recalcul par match sur les signaux Goal / Card),
+    reconstruit par la commande `rebuild_player_stats`.
+    """
+    player = models.ForeignKey('players.Player', on_delete=models.CASCADE, related_name='match_stats')
+    match = models.ForeignKey('matches.Match', on_delete=models.CASCADE, related_name='player_stats')
+    goals = models.PositiveSmallIntegerField(default=0)
+    assists = models.PositiveSmallIntegerField(default=0)
+    yellow_cards = models.PositiveSmallIntegerField(default=0)
+    red_cards = models.PositiveSmallIntegerField(default=0)
+    goal_minutes = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['player', 'match'], name='player_match_stat_uniq')]
+
+    def __str__(self):
+        return f"{self.player_id} @ {self.match_id} : {self.goals} but(s), {self.assists} passe(s)"
+
+
+class PlayerDiscipline(models.Model):
+    """
+    Compteurs disciplinaires d'un joueur (une ligne par joueur ayant au moins un carton).
+    Maintenu par stats/discipline.py, reconstruit par la commande `rebuild_player_stats`.
+    """
+    player = models.OneToOneField('players.Player', on_delete=models.CASCADE, related_name='discipline')
+    club = models.ForeignKey('clubs.Club', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    yellow_cards = models.PositiveIntegerField(default=0)
+    red_cards = models.PositiveIntegerField(default=0)
+    yellow_count = models.PositiveSmallIntegerField(default=0)       # cumul en cours (avant la prochaine suspension)
+    suspended_matches = models.PositiveSmallIntegerField(default=0)  # matchs restant à purger
+
+    class Meta:
+        indexes = [models.Index(fields=['suspended_matches'], name='discipline_suspended_idx')]
+
+    def __str__(self):
+        return f"{self.player_id} : {self.yellow_cards} J / {self.red_cards} R, {self.suspended_matches} match(s) à purger"
+
+
+class Suspension(models.Model):
+    """
+    Suspension née des cartons d'un match (`match`), purgée sur les matchs suivants du club
+    (`matches`, dans l'ordre chronologique). Voir stats/discipline.py.
+    """
+    YELLOWS, SECOND_YELLOW, RED = 'YELLOWS', 'SECOND_YELLOW', 'RED'   # = stats/discipline.py
+    REASONS = [
+        (YELLOWS, 'Cumul de cartons jaunes'),
+        (SECOND_YELLOW, 'Deux jaunes dans le match'),
+        (RED, 'Carton rouge'),
+    ]
+
+    player = models.ForeignKey('players.Player', on_delete=models.CASCADE, related_name='suspensions')
+    club = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, related_name='+')
+    match = models.ForeignKey('matches.Match', on_delete=models.CASCADE, related_name='suspensions_given')
+    reason = models.CharField(max_length=16, choices=REASONS)
+    length = models.PositiveSmallIntegerField(default=1)   # matchs de suspension
+    served = models.PositiveSmallIntegerField(default=0)   # matchs couverts déjà terminés
+    active = models.BooleanField(default=True)
+    matches = models.ManyToManyField('matches.Match', related_name='suspensions', blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'match', 'reason'], name='suspension_player_match_reason_uniq'),
+        ]
+        indexes = [models.Index(fields=['club', 'active'], name='suspension_club_active_idx')]
+
+    def __str__(self):
+        return f"{self.player_id} : {self.get_reason_display()} ({self.served}/{self.length})"
+
+
+class ClubPairRecord(models.Model):
+    """
+    Bilan des confrontations (matchs terminés) entre deux clubs, paire non ordonnée :
+    club_a.id < club_b.id. Maintenu par stats/h2h.py.
+    """
+    club_a = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, related_name='+')
+    club_b = models.ForeignKey('clubs.Club', on_delete=models.CASCADE, related_name='+')
+    played = models.PositiveIntegerField(default=0)
+    a_wins = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    b_wins = models.PositiveIntegerField(default=0)
+    a_goals = models.PositiveIntegerField(default=0)
+    b_goals = models.PositiveIntegerField(default=0)
+    # [{id, datetime, home_club, away_club, home_score, away_score}], plus récents d'abord
+    last_meetings = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['club_a', 'club_b'], name='club_pair_record_uniq'),
+            models.CheckConstraint(condition=models.Q(club_a__lt=models.F('club_b')), name='club_pair_record_ordered'),
+        ]
+
+    def __str__(self):
+        return f"{self.club_a_id} - {self.club_b_id} : {self.a_wins}/{self.draws}/{self.b_wins}"
+
+
+class ClubForm(models.Model):
+    """
+    Forme et séries d'un club sur ses matchs terminés (une ligne par club ayant joué).
+    Maintenu par stats/form.py : ajout en O(1) quand un match se termine, recalcul du club sinon.
+    """
+    club = models.OneToOneField('clubs.Club', on_delete=models.CASCADE, related_name='form_guide')
+    results = models.CharField(max_length=10, blank=True, default='')   # W/D/L, plus récent d'abord
+    played = models.PositiveIntegerField(default=0)
+    clean_sheets = models.PositiveIntegerField(default=0)
+    win_streak = models.PositiveIntegerField(default=0)
+    unbeaten_streak = models.PositiveIntegerField(default=0)
+    winless_streak = models.PositiveIntegerField(default=0)
+    losing_streak = models.PositiveIntegerField(default=0)
+    clean_sheet_streak = models.PositiveIntegerField(default=0)
+    best_win_streak = models.PositiveIntegerField(default=0)
+    best_unbeaten_streak = models.PositiveIntegerField(default=0)
+    # Dernier match compté : un match terminé plus récent s'ajoute sans relire l'historique
+    last_match = models.ForeignKey('matches.Match', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_datetime = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.club_id} : {self.results[:5]}"
@@ -0,0 +1,152 @@
+# stats/profile.py
+"""
+Profil saison d'un joueur (`/api/players/{id}/profile/`) : totaux, détail par journée,
+répartition des minutes de buts et chronologie des derniers matchs.
+
+Requêtes (hors cache) : agrégats PlayerMatchStat du joueur joints au match et à la journée
+(index unique (player, match)), puis une requête d'événements (UNION ALL buts / passes /
+cartons) limitée aux RECENT_MATCHES derniers matchs, par l'index (match, minute, id).
+Aucun parcours complet de Goal / Card.
+
+Cache par joueur et par origine (URL de la photo), clé = jeton "player:<id>" (stats/aggregates.py),
+changé quand les événements du joueur, un de ses matchs ou sa fiche changent, et jeton "clubs".
+"""
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.db.models import CharField, F, Value
+
+from profootgn import versions
+from profootgn.metrics import record_cache
+
+from .aggregates import player_version
+
+RECENT_MATCHES = 10
+PROFILE_TTL = 24 * 3600
+MINUTE_BUCKETS = ((1, 15), (16, 30), (31, 45), (46, 60), (61, 75), (76, 90))
+
+
+def _bucket(minute) -> str:
+    for lo, hi in MINUTE_BUCKETS:
+        if minute <= hi:
+            return f"{lo}-{hi}"
+    return "90+"
+
+
+def _recent_events(player_id, match_ids) -> dict:
+    """{match_id: [événements triés par minute]} : une requête UNION ALL."""
+    from matches.models import Card, Goal
+
+    if not match_ids:
+        return {}
+    fields = ("match_id", "minute", "kind", "card")
+    goals = (
+        Goal.objects.filter(match_id__in=match_ids, player_id=player_id)
+        .annotate(kind=Value("goal", output_field=CharField()), card=Value("", output_field=CharField()))
+        .values_list(*fields)
+    )
+    assists = (
+        Goal.objects.filter(match_id__in=match_ids, assist_player_id=player_id)
+        .annotate(kind=Value("assist", output_field=CharField()), card=Value("", output_field=CharField()))
+        .values_list(*fields)
+    )
+    cards = (
+        Card.objects.filter(match_id__in=match_ids, player_id=player_id)
+        .annotate(kind=Value("card", output_field=CharField()), card=F("type"))
+        .values_list(*fields)
+    )
+    out = {}
+    for match_id, minute, kind, card in goals.union(assists, cards, all=True):
+        event = {"type": kind, "minute": minute}
+        if kind == "card":
+            event["card"] = card
+        out.setdefault(match_id, []).append(event)
+    for events in out.values():
+        events.sort(key=lambda e: (e["minute"], e["type"]))
+    return out
+
+
+def build(player, absolute) -> dict:
+    from .models import PlayerMatchStat
+
+    fields = (
+        "match_id", "goals", "assists", "yellow_cards", "red_cards", "goal_minutes",
+        "match__round_id", "match__round__name", "match__round__number",
+        "match__datetime", "match__status", "match__home_club_id", "match__home_club__name",
+        "match__away_club_id", "match__away_club__name", "match__home_score", "match__away_score",
+    )
+    stats = list(
+        PlayerMatchStat.objects.filter(player_id=player.id)
+        .order_by("-match__datetime", "-match_id")
+        .values_list(*fields)
+    )
+
+    keys = ("goals", "assists", "yellow_cards", "red_cards")
+    totals = {"matches": len(stats), **{k: 0 for k in keys}}
+    minutes = {f"{lo}-{hi}": 0 for lo, hi in MINUTE_BUCKETS}
+    minutes["90+"] = 0
+    rounds = {}
+    for _mid, *counts, goal_minutes, rid, rname, rnumber in (row[:9] for row in stats):
+        if rid not in rounds:
+            rounds[rid] = {
+                "round_id": rid, "round_name": rname, "round_number": rnumber,
+                "matches": 0, **{k: 0 for k in keys},
+            }
+        r = rounds[rid]
+        r["matches"] += 1
+        for k, value in zip(keys, counts):
+            r[k] += value
+            totals[k] += value
+        for minute in goal_minutes or ():
+            minutes[_bucket(int(minute))] += 1
+    totals["goal_minutes"] = minutes
+
+    recent = stats[:RECENT_MATCHES]
+    events = _recent_events(player.id, [row[0] for row in recent])
+    timeline = []
+    for mid, *_c, _gm, _rid, rname, _rn, dt, status, home, home_name, away, away_name, hs, as_ in recent:
+        timeline.append({
+            "match": {
+                "id": mid,
+                "datetime": dt.isoformat() if dt else None,
+                "status": status,
+                "round": rname,
+                "home_club": home, "home_club_name": home_name,
+                "away_club": away, "away_club_name": away_name,
+                "home_score": hs, "away_score": as_,
+            },
+            "events": events.get(mid, []),
+        })
+
+    club = player.club if player.club_id else None
+    return {
+        "player": {
+            "id": player.id,
+            "first_name": player.first_name,
+            "last_name": player.last_name,
+            "full_name": f"{player.first_name} {player.last_name}".strip(),
+            "number": player.number or None,
+            "position": player.position or "",
+            "nationality": player.nationality,
+            "birthdate": player.birthdate.isoformat() if player.birthdate else None,
+            "photo": absolute(player.photo),
+            "club": club.id if club else None,
+            "club_name": club.name if club else None,
+        },
+        "totals": totals,
+        "rounds": sorted(rounds.values(), key=lambda r: (r["round_number"] is None, r["round_number"] or 0)),
+        "recent": timeline,
+    }
+
+
+def get_profile(player, absolute, origin) -> dict:
+    # Jeton "clubs" (clubs/picker_index.py) : noms des clubs affichés dans la chronologie
+    key = "pfoot:player_profile:{}:{}:{}:{}".format(
+        player.id, versions.current(player_version(player.id)), versions.current("clubs"), origin,
+    )
+    data = cache.get(key)
+    record_cache("player_profile", data is not None)
+    if data is None:
+        data = build(player, absolute)
+        cache.set(key, data, PROFILE_TTL)
+    return data
@@ -1,8 +1,9 @@
 # stats/urls.py
 from django.urls import path
-from .views import StandingsView, TopScorersView
+from .views import DisciplineView, StandingsView, TopScorersView
 
 urlpatterns = [
     path('standings/', StandingsView.as_view(), name='stats-standings'),
     path('topscorers/', TopScorersView.as_view(), name='stats-topscorers'),
+    path('discipline/', DisciplineView.as_view(), name='stats-discipline'),
 ]
@@ -10,6 +10,8 @@ from clubs.models import Club
 from matches.models import Match, Goal
 from players.models import Player
 
+from . import discipline, form, h2h
+
 
 FINISHED_STATUSES = {"FT", "FINISHED"}
 LIVE_STATUSES = {"LIVE", "HT", "PAUSED"}   # ajoute "SUSPENDED" si besoin
@@ -42,15 +44,16 @@ def _club_logo_url(club, request):
 class StandingsView(APIView):
     """
     GET /api/stats/standings/?include_live=1
-    -> tableau trié (points, diff, BM) avec logo & méta club
+    -> tableau trié (points, confrontations directes si égalité, diff, BM) avec logo & méta club,
+       forme (5 derniers), séries et clean sheets (stats/form.py, même requête que les clubs)
     """
     permission_classes = [AllowAny]
 
     def get(self, request):
         include_live = str(request.query_params.get("include_live", "")).lower() in {"1", "true", "yes", "y"}
 
-        # base: une ligne par club
-        clubs = Club.objects.all()
+        # base: une ligne par club (+ forme / séries par jointure)
+        clubs = Club.objects.select_related("form_guide")
         table = {
             c.id: {
                 "club_id": c.id,
@@ -64,6 +67,7 @@ class StandingsView(APIView):
                 "goals_against": 0,
                 "goal_diff": 0,
                 "points": 0,
+                **form.club_summary(c),
             }
             for c in clubs
         }
@@ -125,6 +129,7 @@ class StandingsView(APIView):
             rows.append(r)
 
         rows.sort(key=lambda r: (-r["points"], -r["goal_diff"], -r["goals_for"], r["club_name"]))
+        rows = h2h.sort_standings(rows)
         for i, r in enumerate(rows, start=1):
             r["position"] = i
         return Response(rows)
@@ -184,3 +189,17 @@ class TopScorersView(APIView):
             })
 
         return Response(rows)
+
+
+class DisciplineView(APIView):
+    """
+    GET /api/stats/discipline/?club=<id>&suspended=1
+    -> {rules, count, results: [{player, club, yellow_cards, red_cards, yellow_count,
+        yellows_to_ban, suspended_matches, suspensions}]} (compteurs maintenus par stats/discipline.py)
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        raw = str(request.query_params.get("club") or request.query_params.get("club_id") or "").strip()
+        suspended = str(request.query_params.get("suspended", "")).lower() in {"1", "true", "yes", "y"}
+        return Response(discipline.table(int(raw) if raw.isdigit() else None, suspended))